@@ -13,9 +13,14 @@ if __name__ == "__main__":
     start_statcrew_watchers()
     start_virtius_watchers()
     start_cloud_relay()
-    app.run(
-        host=CONFIG.flask_host,
-        port=CONFIG.flask_port,
-        debug=CONFIG.flask_debug,
-        threaded=True,
-    )
+    if CONFIG.async_server:
+        from website.async_server import run as run_async_server
+
+        run_async_server(app, CONFIG.flask_host, CONFIG.flask_port)
+    else:
+        app.run(
+            host=CONFIG.flask_host,
+            port=CONFIG.flask_port,
+            debug=CONFIG.flask_debug,
+            threaded=True,
+        )
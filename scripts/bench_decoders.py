@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""Microbenchmark: packets/sec per sport through identify_and_parse.
+
+Generates random but well-formed frames for every sport layout and times
+``identify_and_parse`` over them.
+
+Usage:
+  python scripts/bench_decoders.py [--packets 200000]
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from website.protocol import (  # noqa: E402
+    BASE_LEN,
+    BBALL_LEN,
+    CR,
+    FH_LEN,
+    LAX_LEN,
+    SOFT_LEN,
+    STX,
+    TP_BBALL_BASE_SOFT,
+    TP_FOOTBALL,
+    TP_LACROSSE_FH,
+    TP_SOCCER,
+    TP_VOLLEYBALL,
+    TP_WRESTLING,
+    identify_and_parse,
+)
+
+SHAPES = {
+    "Basketball": (TP_BBALL_BASE_SOFT, BBALL_LEN),
+    "Baseball": (TP_BBALL_BASE_SOFT, BASE_LEN),
+    "Softball": (TP_BBALL_BASE_SOFT, SOFT_LEN),
+    "Football": (TP_FOOTBALL, 24),
+    "Volleyball": (TP_VOLLEYBALL, 42),
+    "Soccer": (TP_SOCCER, 30),
+    "Lacrosse": (TP_LACROSSE_FH, LAX_LEN),
+    "Hockey": (TP_LACROSSE_FH, FH_LEN),
+    "Wrestling": (TP_WRESTLING, 42),
+}
+
+
+def make_frames(packet_type: int, length: int, count: int, rng: random.Random) -> list[bytes]:
+    digits = b"0123456789:"
+    return [
+        bytes([STX, packet_type])
+        + bytes(rng.choice(digits) | rng.choice((0, 0x80)) for _ in range(length - 3))
+        + bytes([CR])
+        for _ in range(count)
+    ]
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--packets", type=int, default=200_000, help="packets per sport")
+    args = ap.parse_args()
+
+    rng = random.Random(11)
+    total = 0.0
+    for sport, (packet_type, length) in SHAPES.items():
+        frames = make_frames(packet_type, length, 1000, rng)
+        repeats = max(1, args.packets // len(frames))
+        start = time.perf_counter()
+        for _ in range(repeats):
+            for frame in frames:
+                identify_and_parse(frame)
+        elapsed = time.perf_counter() - start
+        rate = repeats * len(frames) / elapsed
+        total += rate
+        print(f"{sport:<11} {rate:12,.0f} packets/s")
+    print(f"{'mean':<11} {total / len(SHAPES):12,.0f} packets/s")
+
+
+if __name__ == "__main__":
+    main()
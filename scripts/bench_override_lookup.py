@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""Benchmark: sport-override lookup per packet, lock + scan vs. index.
+
+Configures --sources TCP data sources (every fourth with a Lacrosse ->
+Gymnastics override) and resolves the override of a packet from a random
+source, the way ``handle_serial_packet`` does for every decoded frame:
+
+  scan    the old lookup: take data_sources_lock, walk the list
+  index   ingestion._get_source_override, a lock-free dict lookup
+
+Each is run from 1 and from --threads threads at once; the script prints
+aggregate lookups/sec.
+
+Usage:
+  python scripts/bench_override_lookup.py [--sources 100] [--threads 4] [--seconds 2]
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import random
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from website import ingestion  # noqa: E402
+
+
+def scan_lookup(source_id, sport):
+    """The pre-index lookup."""
+    if not source_id or not sport:
+        return None
+    with ingestion.data_sources_lock:
+        for source in ingestion.data_sources:
+            if source.get("id") == source_id:
+                overrides = source.get("sport_overrides", {})
+                return overrides.get(sport)
+    return None
+
+
+def configure(count: int) -> list[str]:
+    with ingestion.data_sources_lock:
+        ingestion.data_sources[:] = [
+            {
+                "id": f"tcp:10.0.{n // 250}.{n % 250}:4001",
+                "name": f"Venue {n}",
+                "host": f"10.0.{n // 250}.{n % 250}",
+                "port": 4001,
+                "enabled": True,
+                "sport_overrides": {"Lacrosse": "Gymnastics"} if n % 4 == 0 else {},
+            }
+            for n in range(count)
+        ]
+    ingestion.data_sources_changed()
+    return [source["id"] for source in ingestion.data_sources]
+
+
+def run(lookup, ids: list[str], threads: int, seconds: float) -> float:
+    stop = threading.Event()
+    counts = [0] * threads
+
+    def worker(slot):
+        rng = random.Random(slot)
+        picks = [rng.choice(ids) for _ in range(1024)]
+        done = 0
+        while not stop.is_set():
+            for source_id in picks:
+                lookup(source_id, "Lacrosse")
+            done += len(picks)
+        counts[slot] = done
+
+    workers = [threading.Thread(target=worker, args=(i,)) for i in range(threads)]
+    for t in workers:
+        t.start()
+    time.sleep(seconds)
+    stop.set()
+    for t in workers:
+        t.join()
+    return sum(counts) / seconds
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--sources", type=int, default=100)
+    ap.add_argument("--threads", type=int, default=4)
+    ap.add_argument("--seconds", type=float, default=2.0)
+    args = ap.parse_args()
+
+    ids = configure(args.sources)
+    print(f"{args.sources} configured sources")
+    for threads in (1, args.threads):
+        for name, lookup in (("scan", scan_lookup), ("index", ingestion._get_source_override)):
+            rate = run(lookup, ids, threads, args.seconds)
+            print(f"  {name:<6} {threads} thread(s)  {rate:12,.0f} lookups/s")
+
+
+if __name__ == "__main__":
+    main()
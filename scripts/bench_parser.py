@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""Throughput benchmark: PacketStreamParser vs BulkPacketStreamParser.
+
+Builds a synthetic OES stream (a mix of basketball, football, volleyball,
+lacrosse and softball frames with occasional line noise), feeds it to both
+parsers in TCP-sized chunks and reports MB/s and frames/s.
+
+Usage:
+  python scripts/bench_parser.py [--mb 8] [--chunk 4096]
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from website.protocol import (  # noqa: E402
+    BBALL_LEN,
+    CR,
+    LAX_LEN,
+    SOFT_LEN,
+    STX,
+    TP_BBALL_BASE_SOFT,
+    TP_FOOTBALL,
+    TP_LACROSSE_FH,
+    TP_VOLLEYBALL,
+    BulkPacketStreamParser,
+    PacketStreamParser,
+)
+
+FRAME_SHAPES = (
+    (TP_BBALL_BASE_SOFT, BBALL_LEN),
+    (TP_BBALL_BASE_SOFT, SOFT_LEN),
+    (TP_FOOTBALL, 24),
+    (TP_VOLLEYBALL, 42),
+    (TP_LACROSSE_FH, LAX_LEN),
+)
+
+
+def build_stream(size_bytes: int, seed: int = 7) -> bytes:
+    rng = random.Random(seed)
+    out = bytearray()
+    while len(out) < size_bytes:
+        packet_type, length = rng.choice(FRAME_SHAPES)
+        body = bytes(rng.randint(0x30, 0xB9) for _ in range(length - 3))
+        out += bytes([STX, packet_type]) + body + bytes([CR])
+        if rng.random() < 0.01:
+            out += bytes([0x00, 0xFF, 0x10])
+    return bytes(out)
+
+
+def run(parser_cls, stream: bytes, chunk: int) -> tuple[float, int]:
+    parser = parser_cls()
+    frames = 0
+    start = time.perf_counter()
+    for offset in range(0, len(stream), chunk):
+        frames += len(parser.feed_bytes(stream[offset:offset + chunk]))
+    return time.perf_counter() - start, frames
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--mb", type=float, default=8.0, help="stream size in MB")
+    ap.add_argument("--chunk", type=int, default=4096, help="bytes per feed_bytes call")
+    args = ap.parse_args()
+
+    stream = build_stream(int(args.mb * 1024 * 1024))
+    mb = len(stream) / (1024 * 1024)
+    print(f"stream: {mb:.1f} MB, chunk: {args.chunk} bytes")
+
+    results = {}
+    for parser_cls in (PacketStreamParser, BulkPacketStreamParser):
+        elapsed, frames = run(parser_cls, stream, args.chunk)
+        results[parser_cls.__name__] = elapsed
+        print(
+            f"{parser_cls.__name__:<24} {elapsed:7.3f}s  "
+            f"{mb / elapsed:8.1f} MB/s  {frames / elapsed:12,.0f} frames/s  ({frames} frames)"
+        )
+
+    speedup = results["PacketStreamParser"] / results["BulkPacketStreamParser"]
+    print(f"speedup: {speedup:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
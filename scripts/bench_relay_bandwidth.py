@@ -0,0 +1,294 @@
+#!/usr/bin/env python3
+"""Benchmark: cloud relay bytes and messages on the wire by edge capability.
+
+Replays a game through ``CloudRelay`` with a fake ``ws_factory`` whose
+socket plays the edge.  The game is --minutes of basketball as an OES
+controller sends it (ten frames a second through ``handle_serial_packet``;
+pass --recording to replay a raw serial capture instead) while a
+StatCrew feed republishes examples/baseballDataStats.xml every
+--statcrew-every seconds with a few stats bumped.
+
+After every frame the relay queues whatever the change feed announced, as
+its pump would, and the queue is flushed as its writer would on a fast
+uplink.  Four edges:
+
+  v1              never answers ``hello``: full frames, as before
+  v2              answers ``hello`` at version 2, acknowledges every frame
+  v2+batch        ...and accepts one ``batch`` message per resample
+  v2+batch+zlib   ...and a zlib stream (CLOUD_RELAY_COMPRESS)
+
+For each the script prints WebSocket messages (one ``send`` call, and
+normally one send syscall, each), messages per game second and bytes on
+the wire including WebSocket framing, then bytes per frame type for v1
+and v2.  It checks that the state the v2 edges rebuild matches the
+stores.
+
+Usage:
+  python scripts/bench_relay_bandwidth.py [--minutes 20] [--statcrew-every 15] [--recording capture.bin]
+"""
+from __future__ import annotations
+
+import argparse
+import copy
+import json
+import os
+import sys
+import time
+import zlib
+from collections import Counter
+from dataclasses import replace
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from website import cloud_relay, ingestion, statcrew  # noqa: E402
+from website.change_feed import store_changes  # noqa: E402
+from website.config import CONFIG  # noqa: E402
+from website.protocol import BBALL_LEN, CR, STX, TP_BBALL_BASE_SOFT, BulkPacketStreamParser  # noqa: E402
+from website.relay_delta import apply_delta  # noqa: E402
+from website.snapshot import Snapshot  # noqa: E402
+
+ROOT = os.path.join(os.path.dirname(__file__), "..")
+SOURCE = "serial:/dev/ttyUSB0"
+FIELDS = {"sport": "state", "clock": "clock"}
+
+
+EDGES = {
+    "v1": (1, []),
+    "v2": (2, []),
+    "v2+batch": (2, ["batch"]),
+    "v2+batch+zlib": (2, ["batch", "zlib"]),
+}
+
+
+def ws_framing(size: int) -> int:
+    """Header bytes of a masked client-to-server WebSocket message."""
+    return 6 if size < 126 else 8 if size < 65536 else 14
+
+
+class FakeEdge:
+    """Counts what the relay sends; a v2 edge also answers and acks."""
+
+    def __init__(self, version, features):
+        self.version = version
+        self.features = features
+        self.messages = 0
+        self.wire_bytes = 0
+        self.bytes = Counter()  # uncompressed JSON per frame type
+        self.frames = Counter()
+        self.replies = []
+        self.state = {}
+        self.inflate = zlib.decompressobj()
+
+    def send(self, raw):
+        self.receive(raw, len(raw.encode()))
+
+    def send_binary(self, data):
+        self.receive(self.inflate.decompress(data).decode(), len(data))
+
+    def receive(self, raw, size):
+        self.messages += 1
+        self.wire_bytes += size + ws_framing(size)
+        message = json.loads(raw)
+        for frame in message["frames"] if message["type"] == "batch" else [message]:
+            kind = frame["type"]
+            self.bytes[kind] += len(json.dumps(frame))
+            self.frames[kind] += 1
+            self.mirror(frame)
+            if self.version >= 2:
+                if kind == "hello":
+                    self.replies.append({"type": "hello", "version": 2, "features": self.features})
+                elif "seq" in frame:
+                    self.replies.append({"type": "ack", "seq": frame["seq"]})
+
+    def mirror(self, message):
+        kind = message["type"]
+        if kind == "snapshot":
+            for sport, data in message["state"].items():
+                self.state[("sport", sport)] = data
+        elif kind == "delta":
+            key = (message["kind"], message["sport"])
+            self.state[key] = apply_delta(self.state[key], message.get("set", []), message.get("unset", []))
+        elif kind in FIELDS or kind in cloud_relay.PAYLOAD_KINDS:
+            self.state[(kind, message["sport"])] = message[FIELDS.get(kind, "payload")]
+
+    def close(self):
+        pass
+
+
+# --- The recorded game ---
+
+
+def basketball_frame(clock_s, period, home, visitor, home_fouls, visitor_fouls, shot) -> bytes:
+    data = bytearray([0x30] * BBALL_LEN)
+    data[0], data[1], data[-1] = STX, TP_BBALL_BASE_SOFT, CR
+    data[2:6] = f"{clock_s // 60:02d}{clock_s % 60:02d}".encode()
+    data[6] = 0x30 + period
+    data[7:9] = f"{home % 100:02d}".encode()
+    data[9:11] = f"{visitor % 100:02d}".encode()
+    data[13] = 0x30 + min(home_fouls, 9)
+    data[14] = 0x30 + min(visitor_fouls, 9)
+    data[18:20] = f"{shot:02d}".encode()
+    return bytes(data)
+
+
+def synthesized_game(minutes: int):
+    """Yield (game second, OES frame), ten frames per second."""
+    home = visitor = home_fouls = visitor_fouls = 0
+    shot = 30
+    total = minutes * 60
+    for second in range(total):
+        if second and second % 37 == 0:
+            if (second // 37) % 2:
+                home += 2
+            else:
+                visitor += 2
+            shot = 30
+        if second and second % 90 == 0:
+            home_fouls += (second // 90) % 2
+            visitor_fouls += 1 - (second // 90) % 2
+        shot = shot - 1 if shot > 0 else 30
+        frame = basketball_frame(total - second, 1, home, visitor, home_fouls, visitor_fouls, shot)
+        for _tenth in range(10):
+            yield second, frame
+
+
+def recorded_game(path: str):
+    """Yield (frame index / 10, frame) for every frame in a raw capture."""
+    parser = BulkPacketStreamParser()
+    with open(path, "rb") as f:
+        packets = parser.feed_bytes(f.read())
+    for n, packet in enumerate(packets):
+        yield n // 10, packet
+
+
+class StatCrewFeed:
+    """Republishes the example box score with a few stats bumped each time."""
+
+    def __init__(self):
+        with open(os.path.join(ROOT, "examples", "baseballDataStats.xml"), encoding="utf-8") as f:
+            self.payload = statcrew._parse_statcrew_xml(f.read())
+        self.updates = 0
+
+    def publish(self, second: int) -> None:
+        self.updates += 1
+        n = self.updates
+        payload = copy.deepcopy(self.payload)
+        payload["home_pitcher_pitches"] = str(int(payload["home_pitcher_pitches"] or 0) + n)
+        batters = payload["home_batters"]
+        batter = batters[n % len(batters)]
+        batter["ab"] = str(int(batter["ab"] or 0) + 1)
+        payload["_meta"] = {"source": "baseballDataStats.xml", "mtime": second, "parsed_at": second}
+        with statcrew.statcrew_lock:
+            version = statcrew.statcrew_versions.get("Baseball", 0) + 1
+            statcrew.statcrew_data["Baseball"] = Snapshot(payload, version)
+            statcrew.statcrew_versions["Baseball"] = version
+        store_changes.publish("statcrew", "Baseball")
+
+
+# --- Replay ---
+
+
+def reset_stores() -> None:
+    with ingestion.parsed_data_lock:
+        ingestion.parsed_data_by_source.clear()
+        ingestion.last_seen_by_source.clear()
+        ingestion._auto_sticky_source.clear()
+        ingestion._sources_by_freshness.clear()
+        ingestion._last_frame_by_source.clear()
+        ingestion._data_versions.clear()
+    with statcrew.statcrew_lock:
+        statcrew.statcrew_data["Baseball"] = {}
+
+
+def replay(edge: str, game, statcrew_every: int) -> tuple[FakeEdge, float, int]:
+    reset_stores()
+    changes = store_changes.subscribe()
+    feed = StatCrewFeed()
+    version, features = EDGES[edge]
+    relay = cloud_relay.CloudRelay(
+        config=replace(CONFIG, cloud_relay_url="ws://bench/ws/publisher", cloud_relay_token="bench"),
+        ws_factory=lambda url, token, name="": FakeEdge(version, features),
+    )
+    ws = relay._ws_factory(CONFIG.cloud_relay_url, CONFIG.cloud_relay_token)
+    relay._changes = changes
+    endpoint = relay._endpoints[0]
+
+    def deliver_replies():
+        replies, ws.replies = ws.replies, []
+        for message in replies:
+            endpoint._handle_edge_frame(message)
+
+    def flush():
+        endpoint._send_frames(ws, outbox.take(0))
+        deliver_replies()
+
+    endpoint._send_hello(ws)
+    deliver_replies()
+    endpoint._outbox = outbox = cloud_relay._Outbox(CONFIG.cloud_relay_queue_size, endpoint._send_stats)
+    relay._send_initial_state([endpoint])
+    flush()
+    changes.wait(0)
+    last_statcrew = second = 0
+    relay_time = 0.0
+    for second, frame in game:
+        if second - last_statcrew >= statcrew_every:
+            feed.publish(second)
+            last_statcrew = second
+        ingestion.handle_serial_packet(frame, source_id=SOURCE)
+        keys = changes.wait(0)
+        keys.discard(cloud_relay.SOURCES_KEY)  # age_seconds; throttled by the pump
+        if keys:
+            start = time.perf_counter()
+            relay._tick(keys)
+            endpoint._send_frames(ws, outbox.take(0))
+            relay_time += time.perf_counter() - start
+        deliver_replies()
+    changes.close()
+
+    if version >= 2:
+        for key in (("sport", "Basketball"), ("clock", "Basketball"), ("statcrew", "Baseball")):
+            kind, sport = key
+            if kind == "sport":
+                expected = ingestion.get_sport_data(sport)
+            elif kind == "clock":
+                expected = ingestion.get_clock_snapshot(sport)
+            else:
+                expected = cloud_relay.PAYLOAD_GETTERS[kind](sport)
+            expected = json.loads(json.dumps(expected, default=cloud_relay._json_default))
+            assert ws.state.get(key) == expected, f"edge state for {key} diverged"
+    return ws, relay_time, second + 1
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--minutes", type=int, default=20)
+    ap.add_argument("--statcrew-every", type=int, default=15, help="game seconds between StatCrew updates")
+    ap.add_argument("--recording", help="raw serial capture to replay instead of the synthesized game")
+    args = ap.parse_args()
+
+    def game():
+        return recorded_game(args.recording) if args.recording else synthesized_game(args.minutes)
+
+    print(f"{'recording ' + args.recording if args.recording else f'{args.minutes} min of basketball'}"
+          f", StatCrew every {args.statcrew_every} s")
+    results = {edge: replay(edge, game(), args.statcrew_every) for edge in EDGES}
+    baseline = results["v1"][0].wire_bytes
+    print(f"  {'edge':<14} {'messages':>9} {'msgs/s':>7} {'wire KiB':>9} {'of v1':>6} {'relay ms':>9}")
+    for edge, (ws, relay_time, seconds) in results.items():
+        print(
+            f"  {edge:<14} {ws.messages:9d} {ws.messages / seconds:7.1f} {ws.wire_bytes / 1024:9.1f} "
+            f"{ws.wire_bytes / baseline:6.1%} {1000 * relay_time:9.1f}"
+        )
+
+    v1, v2 = results["v1"][0], results["v2"][0]
+    print(f"\n  {'frame':<10} {'v1 frames':>10} {'v1 KiB':>10} {'v2 frames':>10} {'v2 KiB':>10}")
+    for kind in sorted(set(v1.bytes) | set(v2.bytes)):
+        print(
+            f"  {kind:<10} {v1.frames[kind]:10d} {v1.bytes[kind] / 1024:10.1f} "
+            f"{v2.frames[kind]:10d} {v2.bytes[kind] / 1024:10.1f}"
+        )
+    print("  v2 edge state matches the stores")
+
+
+if __name__ == "__main__":
+    main()
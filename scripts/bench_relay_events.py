@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""Benchmark: cloud relay wakeups and latency, polling vs. change events.
+
+Runs the relay's sampling loop, with one endpoint whose writer thread
+sends to a recording socket, in two modes:
+
+  poll   the old loop: sleep one poll interval, then resample every key
+  event  ``CloudRelay._pump`` as it is now: wait on the store change feed
+         and resample only the announced keys
+
+Each mode first sits idle for --idle seconds (reporting loop wakeups and
+the relay thread's CPU time), then receives --writes basketball updates
+through ``record_packet`` at random intervals averaging --gap seconds
+(reporting, per write, the time until a frame carrying it or a later
+update was sent).  Linux only: thread CPU time is read through
+``pthread_getcpuclockid``.
+
+Usage:
+  python scripts/bench_relay_events.py [--poll 0.5] [--idle 5] [--writes 40] [--gap 0.1]
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import random
+import statistics
+import sys
+import threading
+import time
+from dataclasses import replace
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from website import cloud_relay, ingestion  # noqa: E402
+from website.change_feed import store_changes  # noqa: E402
+from website.config import CONFIG  # noqa: E402
+
+SOURCE = "tcp:10.0.0.1:4001"
+
+
+class RecordingWS:
+    """Notes when each basketball score was sent."""
+
+    def __init__(self):
+        self.sent = []  # (time, home_score)
+
+    def send(self, frame):
+        now = time.perf_counter()
+        message = json.loads(frame)
+        if message["type"] == "sport" and message["sport"] == "Basketball":
+            self.sent.append((now, int(message["state"]["home_score"])))
+
+    def delivered_at(self, n):
+        return next((t for t, score in self.sent if score >= n), None)
+
+
+def poll_loop(relay, poll):
+    """The pre-event relay loop."""
+    while not relay._stop.is_set():
+        relay._sleep(poll)
+        if relay._stop.is_set():
+            return
+        relay._tick()
+
+
+def write(n: int) -> None:
+    ingestion.record_packet(
+        "Basketball", {"home_score": str(n), "away_score": "0", "game_clock": f"{n % 60}:00"}, SOURCE
+    )
+
+
+def run(mode: str, poll: float, idle: float, writes: int, gap: float, first: int):
+    relay = cloud_relay.CloudRelay(
+        config=replace(CONFIG, cloud_relay_poll_interval=poll, cloud_relay_url="ws://bench/ws/publisher")
+    )
+    relay._sleep = relay._stop.wait
+    ws = RecordingWS()
+    wakeups = [0]
+    real_tick = relay._tick
+
+    def counting_tick(keys=None):
+        wakeups[0] += 1
+        real_tick(keys)
+
+    relay._tick = counting_tick
+    relay._changes = store_changes.subscribe()
+    endpoint = relay._endpoints[0]
+    endpoint._outbox = outbox = cloud_relay._Outbox(CONFIG.cloud_relay_queue_size, endpoint._send_stats)
+    writer = threading.Thread(target=endpoint._write, args=(ws, outbox, threading.Event()))
+    writer.start()
+    relay._send_initial_state([endpoint])
+
+    if mode == "poll":
+        thread = threading.Thread(target=poll_loop, args=(relay, poll))
+    else:
+        thread = threading.Thread(target=relay._pump)
+    thread.start()
+    clock = time.pthread_getcpuclockid(thread.ident)
+
+    time.sleep(idle)
+    idle_wakeups = wakeups[0]
+    idle_cpu = time.clock_gettime(clock)
+
+    written_at = {}
+    rng = random.Random(first)
+    for n in range(first, first + writes):
+        time.sleep(rng.uniform(0, 2 * gap))
+        written_at[n] = time.perf_counter()
+        write(n)
+    time.sleep(poll + 0.1)
+
+    relay.stop()
+    thread.join()
+    writer.join()
+    frames = sum(1 for _t, score in ws.sent if score >= first)
+    latencies = [ws.delivered_at(n) - t for n, t in written_at.items()]
+    return idle_wakeups, idle_cpu, latencies, frames
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--poll", type=float, default=0.5, help="relay poll interval in seconds")
+    ap.add_argument("--idle", type=float, default=5.0)
+    ap.add_argument("--writes", type=int, default=40)
+    ap.add_argument("--gap", type=float, default=0.1, help="mean seconds between writes")
+    args = ap.parse_args()
+
+    write(0)
+    print(f"poll interval {args.poll:g} s, {args.idle:g} s idle, then {args.writes} writes")
+    for n, mode in enumerate(("poll", "event")):
+        idle_wakeups, idle_cpu, latencies, frames = run(
+            mode, args.poll, args.idle, args.writes, args.gap, first=1 + n * args.writes
+        )
+        latencies.sort()
+        p99 = latencies[min(len(latencies) - 1, int(0.99 * len(latencies)))]
+        print(
+            f"  {mode:<6} idle wakeups/s {idle_wakeups / args.idle:5.1f}   "
+            f"idle CPU {1000 * idle_cpu:6.1f} ms   "
+            f"frames {frames:3d}/{args.writes}   "
+            f"latency median {1000 * statistics.median(latencies):7.2f} ms  "
+            f"p99 {1000 * p99:7.2f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
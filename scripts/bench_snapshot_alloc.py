@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+"""Benchmark: allocation of data reads, defensive copies vs. snapshots.
+
+Simulates one cloud relay plus --pollers HTTP pollers against live stores:
+every cycle one sport gets a new packet, the relay runs a poll tick
+(``CloudRelay._tick`` to an endpoint with a discarding socket) and each poller reads its
+sport's data plus the StatCrew, TrackMan and Virtius payloads.  Two modes:
+
+  copy      the old getters (``dict(...)`` under the store lock) and the
+            old relay tick (deep ``!=`` against the last value sent)
+  snapshot  the getters and relay as they are now
+
+For each mode the script prints bytes allocated per cycle (summed
+tracemalloc peaks of every read and tick) and wall time per cycle.
+
+Usage:
+  python scripts/bench_snapshot_alloc.py [--pollers 50] [--cycles 500]
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+from dataclasses import replace
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from website import cloud_relay, ingestion, statcrew, trackman, virtius  # noqa: E402
+from website.config import CONFIG  # noqa: E402
+from website.snapshot import Snapshot  # noqa: E402
+
+SPORTS = ("Basketball", "Hockey", "Volleyball", "Baseball")
+
+
+class NullWS:
+    def send(self, frame):
+        pass
+
+
+# --- The pre-snapshot getters and relay tick ---
+
+
+def copy_get_sport_data(sport, source_id=None):
+    with ingestion.parsed_data_lock:
+        sid = ingestion._select_source_locked(sport, source_id)
+        if sid is None:
+            return dict(ingestion.parsed_data.get(sport, {}))
+        return dict(ingestion.parsed_data_by_source.get(sid, {}).get(sport, {}))
+
+
+def copy_get_clock_snapshot(sport):
+    snap = ingestion._clock_snapshots.get(sport)
+    return dict(snap) if snap else None
+
+
+def copy_getter(store, lock):
+    def get_data(sport):
+        with lock:
+            return dict(store.get(sport, {}))
+    return get_data
+
+
+COPY_GETTERS = {
+    "trackman": copy_getter(trackman.trackman_data, trackman.trackman_lock),
+    "statcrew": copy_getter(statcrew.statcrew_data, statcrew.statcrew_lock),
+    "virtius": copy_getter(virtius.virtius_data, virtius.virtius_lock),
+}
+
+
+def copy_tick(endpoint, ws):
+    last = endpoint._last_sent
+    for sport in cloud_relay.RELAY_SPORTS:
+        data = copy_get_sport_data(sport)
+        if data and data != last.get(("sport", sport)):
+            endpoint._send(ws, {"type": "sport", "sport": sport, "state": data})
+            last[("sport", sport)] = data
+        clock = copy_get_clock_snapshot(sport)
+        if clock and clock != last.get(("clock", sport)):
+            endpoint._send(ws, {"type": "clock", "sport": sport, "clock": clock})
+            last[("clock", sport)] = clock
+    for kind, sports in cloud_relay.PAYLOAD_KINDS.items():
+        getter = COPY_GETTERS[kind]
+        for sport in sports:
+            payload = getter(sport)
+            if payload and payload != last.get((kind, sport)):
+                endpoint._send(ws, {"type": kind, "sport": sport, "payload": payload})
+                last[(kind, sport)] = payload
+    sources = ingestion.get_sources_snapshot()
+    if sources != last.get(("sources", None)):
+        endpoint._send(ws, {"type": "sources", "sources": sources})
+        last[("sources", None)] = sources
+
+
+# --- Workload ---
+
+
+def seed() -> None:
+    for n, sport in enumerate(SPORTS):
+        packet(sport, n)
+    with statcrew.statcrew_lock:
+        statcrew.statcrew_data["Baseball"] = Snapshot(
+            {
+                "teams": [{"name": f"Team {t}", "players": [{"name": f"P{p}", "avg": ".300"}
+                                                            for p in range(25)]}
+                          for t in range(2)],
+                **{f"stat_{k}": k for k in range(40)},
+            },
+            1,
+        )
+    with trackman.trackman_lock:
+        trackman.trackman_data["Baseball"] = Snapshot(
+            {f"pitch_{k}": float(k) for k in range(20)}, 1
+        )
+    with virtius.virtius_lock:
+        virtius.virtius_data["Gymnastics"] = Snapshot(
+            {"teams": [{"name": f"Team {t}", "score": 49.1} for t in range(4)],
+             **{f"field_{k}": k for k in range(20)}},
+            1,
+        )
+
+
+def packet(sport: str, n: int) -> None:
+    fields = {f"field_{k}": str(k) for k in range(30)}
+    fields.update(home_score=str(n % 100), game_clock=f"{n % 20}:00")
+    ingestion.record_packet(sport, fields, "tcp:10.0.0.1:4001")
+
+
+def run(mode: str, pollers: int, cycles: int) -> tuple[float, float]:
+    relay = cloud_relay.CloudRelay(
+        config=replace(CONFIG, cloud_relay_url="ws://bench/ws/publisher", cloud_relay_token="bench"),
+        ws_factory=lambda url, token, name="": NullWS(),
+    )
+    ws = relay._ws_factory(CONFIG.cloud_relay_url, CONFIG.cloud_relay_token)
+    endpoint = relay._endpoints[0]
+    endpoint._outbox = outbox = cloud_relay._Outbox(CONFIG.cloud_relay_queue_size, endpoint._send_stats)
+
+    def flush():
+        endpoint._send_frames(ws, outbox.take(0))
+
+    if mode == "copy":
+        tick = lambda: copy_tick(endpoint, ws)  # noqa: E731
+        read_sport = copy_get_sport_data
+        payload_getters = COPY_GETTERS
+    else:
+        tick = lambda: (relay._tick(), flush())  # noqa: E731
+        read_sport = ingestion.get_sport_data
+        payload_getters = cloud_relay.PAYLOAD_GETTERS
+
+    def poll(slot):
+        read_sport(SPORTS[slot % len(SPORTS)])
+        payload_getters["statcrew"]("Baseball")
+        payload_getters["trackman"]("Baseball")
+        payload_getters["virtius"]("Gymnastics")
+
+    relay._send_initial_state([endpoint])
+    flush()
+
+    def cycle(n, measure):
+        total = 0
+        packet(SPORTS[n % len(SPORTS)], n)
+        for step in [tick] + [lambda slot=slot: poll(slot) for slot in range(pollers)]:
+            if measure:
+                tracemalloc.reset_peak()
+                before = tracemalloc.get_traced_memory()[0]
+                step()
+                total += tracemalloc.get_traced_memory()[1] - before
+            else:
+                step()
+        return total
+
+    tracemalloc.start()
+    try:
+        allocated = sum(cycle(n, True) for n in range(cycles))
+    finally:
+        tracemalloc.stop()
+    start = time.perf_counter()
+    for n in range(cycles):
+        cycle(n, False)
+    elapsed = time.perf_counter() - start
+    return allocated / cycles, elapsed / cycles
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--pollers", type=int, default=50)
+    ap.add_argument("--cycles", type=int, default=500)
+    args = ap.parse_args()
+
+    seed()
+    print(f"relay + {args.pollers} pollers, one write per cycle")
+    for mode in ("copy", "snapshot"):
+        allocated, elapsed = run(mode, args.pollers, args.cycles)
+        print(f"  {mode:<9} {allocated / 1024:8.1f} KiB/cycle   {1e6 * elapsed:8.1f} us/cycle")
+
+
+if __name__ == "__main__":
+    main()
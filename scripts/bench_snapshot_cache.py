@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""Requests/sec benchmark: per-request jsonify vs. cached snapshot bytes.
+
+Fills the ingestion and StatCrew stores with representative snapshots, then
+has N client threads poll them through the Flask app, once via the old
+``jsonify(get_*_data(...))`` handlers (registered here under ``/legacy``)
+and once via the real endpoints, which serve the encode-once cached bytes.
+
+Usage:
+  python scripts/bench_snapshot_cache.py [--clients 8,64,256] [--requests 20000]
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from flask import jsonify  # noqa: E402
+
+from website import create_app, ingestion, statcrew  # noqa: E402
+
+
+def populate() -> None:
+    scoreboard = {f"field_{i:02d}": f"{i:>4}" for i in range(60)}
+    ingestion.record_packet("Basketball", scoreboard, "bench:1")
+
+    players = [
+        {"name": f"Player {i}", "ab": "4", "r": "1", "h": "2", "rbi": "1", "avg": ".312"}
+        for i in range(40)
+    ]
+    box = {
+        "home": {"name": "Home", "players": players, "line": ["0"] * 9},
+        "away": {"name": "Away", "players": players, "line": ["0"] * 9},
+        "plays": [f"play {i}: single to left field" for i in range(300)],
+        "_meta": {"source": "bench.xml", "mtime": 0, "parsed_at": time.time()},
+    }
+    with statcrew.statcrew_lock:
+        statcrew.statcrew_data["Baseball"] = box
+        statcrew.statcrew_versions["Baseball"] = (
+            statcrew.statcrew_versions.get("Baseball", 0) + 1
+        )
+
+
+def build_app():
+    app = create_app()
+
+    @app.route("/legacy/get_raw_data/<sport>")
+    def legacy_raw_data(sport):
+        return jsonify(ingestion.get_sport_data(sport))
+
+    @app.route("/legacy/get_statcrew_data/<sport>")
+    def legacy_statcrew_data(sport):
+        return jsonify(statcrew.get_data(sport))
+
+    return app
+
+
+def run(app, url: str, clients: int, total: int) -> float:
+    per_client = max(1, total // clients)
+    barrier = threading.Barrier(clients + 1)
+
+    def worker():
+        client = app.test_client()
+        barrier.wait()
+        for _ in range(per_client):
+            client.get(url)
+
+    threads = [threading.Thread(target=worker) for _ in range(clients)]
+    for t in threads:
+        t.start()
+    barrier.wait()
+    start = time.perf_counter()
+    for t in threads:
+        t.join()
+    return per_client * clients / (time.perf_counter() - start)
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--clients", default="8,64,256", help="comma-separated client counts")
+    ap.add_argument("--requests", type=int, default=20000, help="requests per run")
+    args = ap.parse_args()
+
+    populate()
+    app = build_app()
+    for path in ("/get_raw_data/Basketball", "/get_statcrew_data/Baseball"):
+        print(path)
+        for clients in (int(c) for c in args.clients.split(",")):
+            before = run(app, "/legacy" + path, clients, args.requests)
+            after = run(app, path, clients, args.requests)
+            print(
+                f"  {clients:>4} clients: jsonify {before:9,.0f} req/s   "
+                f"cached {after:9,.0f} req/s   ({after / before:.2f}x)"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""Benchmark: in-memory footprint per data source.
+
+Simulates --sources controllers (three basketball, one baseball, in
+turn), each arriving over UDP: its datagrams go through the listener's
+per-sender parser (``_UdpPeers``) into ``handle_serial_packet``, it sends
+--updates changing frames, and it is polled once with ``?source=`` so its
+JSON body is cached.  The script then reports bytes per source, both in
+total (tracemalloc) and split by the structure that holds them.
+
+Usage:
+  python scripts/bench_source_memory.py [--sources 500] [--updates 5]
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import tracemalloc
+from collections import deque
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from website import ingestion  # noqa: E402
+from website.protocol import BASE_LEN, BBALL_LEN, CR, STX, TP_BBALL_BASE_SOFT  # noqa: E402
+
+
+def frame(length: int, n: int) -> bytes:
+    data = bytearray([0x30] * length)
+    data[0], data[1], data[-1] = STX, TP_BBALL_BASE_SOFT, CR
+    data[8] = 0x30 + n % 10
+    return bytes(data)
+
+
+def deep_size(obj, seen: set) -> int:
+    """Size of *obj* and everything it references that was not counted yet."""
+    if id(obj) in seen or obj is None or isinstance(obj, (bool, int)) and -5 <= obj <= 256:
+        return 0
+    seen.add(id(obj))
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        size += sum(deep_size(k, seen) + deep_size(v, seen) for k, v in obj.items())
+    elif isinstance(obj, (list, tuple, set, frozenset, deque)):
+        size += sum(deep_size(item, seen) for item in obj)
+    elif isinstance(obj, (str, bytes, bytearray, float, int, memoryview)):
+        pass
+    else:
+        if hasattr(obj, "__dict__"):
+            size += deep_size(vars(obj), seen)
+        for cls in type(obj).__mro__:
+            for name in getattr(cls, "__slots__", ()):
+                if name != "__dict__" and hasattr(obj, name):
+                    size += deep_size(getattr(obj, name), seen)
+    return size
+
+
+def breakdown(ids: list[str], peers) -> dict[str, int]:
+    # Strings shared by every source (field names, sport names) and the
+    # Auto-mode copies are not per-source costs.
+    seen = {id(k) for data in ingestion.parsed_data.values() for k in data}
+    seen.update(id(sport) for sport in ingestion.parsed_data)
+    seen.update(id(v) for v in ingestion.parsed_data.values())
+    parts = {
+        "stored data": [ingestion.parsed_data_by_source.get(s) for s in ids],
+        "frame cache": [ingestion._last_frame_by_source.get(s) for s in ids],
+        "frame stats": [ingestion._frame_stats_by_source.get(s) for s in ids],
+        "baseball state": [ingestion._baseball_states.get(s) for s in ids],
+        "udp peer": [peer for peer in peers._peers.values()],
+        "json cache": [
+            entry for key, entry in ingestion._json_cache._entries.items() if key[0] in ids
+        ],
+        "indexes": [
+            (ingestion.last_seen_by_source.get(s), ingestion._data_versions.get((s, sport)),
+             ingestion._last_change_seq.get((s, sport)))
+            for s in ids for sport in ("Basketball", "Baseball")
+        ],
+        "journal (bounded)": [ingestion._change_journal],
+    }
+    return {name: sum(deep_size(obj, seen) for obj in objs) for name, objs in parts.items()}
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--sources", type=int, default=500)
+    ap.add_argument("--updates", type=int, default=5)
+    args = ap.parse_args()
+
+    peers = ingestion._UdpPeers(max_peers=args.sources, idle_timeout=0)
+    # Warm up lazily created shared state so it is not charged to sources.
+    warm_peers = ingestion._UdpPeers(max_peers=1, idle_timeout=0)
+    for packet in warm_peers.feed(("10.9.9.9", 1), frame(BBALL_LEN, 0))[1]:
+        ingestion.handle_serial_packet(packet, source_id="warmup")
+    ingestion.get_sport_data_json("Basketball", "warmup")
+
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    ids = []
+    for n in range(args.sources):
+        addr = (f"10.{n // 62500}.{n // 250 % 250}.{n % 250}", 20000 + n % 7)
+        length, sport = (BASE_LEN, "Baseball") if n % 4 == 3 else (BBALL_LEN, "Basketball")
+        for update in range(args.updates):
+            source_id, packets = peers.feed(addr, frame(length, n + update))
+            for packet in packets:
+                ingestion.handle_serial_packet(packet, source_id=source_id)
+        ids.append(source_id)
+        ingestion.get_sport_data_json(sport, source_id)
+    grown = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+
+    print(f"{args.sources} sources, {args.updates} updates each")
+    print(f"  total (tracemalloc)  {grown / args.sources:8.0f} bytes/source")
+    for name, size in breakdown(ids, peers).items():
+        print(f"  {name:<20} {size / args.sources:8.0f} bytes/source")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""Wakeup benchmark: one global Condition vs. per-sport update channels.
+
+C subscriber threads are spread round-robin over the clock sports, each
+blocking the way an SSE generator does.  S sports then publish clock ticks
+at --rate Hz each.  For both fan-out strategies the script reports
+wakeups/sec, how many of those were wasted (the subscriber's sport had not
+changed) and process CPU time.
+
+  global    the old scheme: one seq + Condition shared by every sport
+  channels  ingestion._UpdateChannels, keyed by (sport, source)
+
+Usage:
+  python scripts/bench_sse_fanout.py [--clients 50,200] [--sports 1,3,7]
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from website.ingestion import CLOCK_FIELDS, _UpdateChannels  # noqa: E402
+
+SPORTS = sorted(CLOCK_FIELDS)
+
+
+class GlobalCondition:
+    """The pre-channel fan-out: every publish wakes every subscriber."""
+
+    def __init__(self):
+        self.cond = threading.Condition()
+        self.seq = 0
+        self.by_sport = {}
+
+    def publish(self, sport, source_id, seq):
+        with self.cond:
+            self.seq = seq
+            self.by_sport[sport] = seq
+            self.cond.notify_all()
+
+    def wait(self, sport, last_seq, timeout, source_id=None):
+        with self.cond:
+            while self.seq <= last_seq:
+                if not self.cond.wait(timeout=timeout):
+                    break
+            return self.seq
+
+    def sport_seq(self, sport):
+        return self.by_sport.get(sport, 0)
+
+
+def run(fanout, clients: int, sports: int, rate: float, seconds: float):
+    stop = threading.Event()
+    stats = [[0, 0] for _ in range(clients)]  # [wakeups, wasted]
+
+    def subscriber(sport, counts):
+        last_seq = 0
+        seen = 0
+        while not stop.is_set():
+            new_seq = fanout.wait(sport, last_seq, 0.2)
+            if new_seq == last_seq:
+                continue
+            last_seq = new_seq
+            counts[0] += 1
+            # What an SSE generator does next: look at its sport's snapshot.
+            current = (
+                fanout.sport_seq(sport) if isinstance(fanout, GlobalCondition) else new_seq
+            )
+            if current == seen:
+                counts[1] += 1
+            seen = current
+
+    def publisher():
+        seq = 0
+        interval = 1.0 / (rate * sports)
+        while not stop.is_set():
+            for sport in SPORTS[:sports]:
+                seq += 1
+                fanout.publish(sport, "src", seq)
+                time.sleep(interval)
+
+    threads = [
+        threading.Thread(target=subscriber, args=(SPORTS[i % len(SPORTS)], stats[i]))
+        for i in range(clients)
+    ]
+    for t in threads:
+        t.start()
+    time.sleep(0.2)
+    cpu_start = time.process_time()
+    pub = threading.Thread(target=publisher)
+    pub.start()
+    time.sleep(seconds)
+    stop.set()
+    pub.join()
+    cpu = time.process_time() - cpu_start
+    for t in threads:
+        t.join()
+    wakeups = sum(s[0] for s in stats)
+    wasted = sum(s[1] for s in stats)
+    return wakeups / seconds, wasted / seconds, cpu
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--clients", default="50,200", help="comma-separated subscriber counts")
+    ap.add_argument("--sports", default="1,3,7", help="comma-separated active sport counts")
+    ap.add_argument("--rate", type=float, default=10.0, help="clock ticks/s per sport")
+    ap.add_argument("--seconds", type=float, default=2.0)
+    args = ap.parse_args()
+
+    for clients in (int(c) for c in args.clients.split(",")):
+        for sports in (int(s) for s in args.sports.split(",")):
+            print(f"{clients} clients, {sports} active sports")
+            for name, fanout in (("global", GlobalCondition()), ("channels", _UpdateChannels())):
+                wakeups, wasted, cpu = run(fanout, clients, sports, args.rate, args.seconds)
+                print(
+                    f"  {name:<9} {wakeups:9,.0f} wakeups/s  {wasted:9,.0f} wasted/s  "
+                    f"CPU {cpu:5.2f}s"
+                )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""Benchmark: parsed_data readers and writers contending for one lock.
+
+--writers threads each feed their own source with basketball updates
+(``record_packet``, as the ingestion threads do) while --readers threads
+poll Auto-mode data the way the HTTP handlers do (every --poll seconds;
+0 only yields between polls).  Two reader variants run against the same
+writers:
+
+  locked     the old readers: select and copy under parsed_data_lock
+  lock-free  ingestion.get_sport_data / get_sport_data_json as they are now
+
+The script prints aggregate writes/s and reads/s, plus the worst single
+write latency seen, for each.
+
+Usage:
+  python scripts/bench_store_contention.py [--writers 8] [--readers 32] [--poll 0.001] [--seconds 3]
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from website import ingestion  # noqa: E402
+from website.json_cache import encode_json  # noqa: E402
+
+
+def locked_get_sport_data(sport):
+    """The pre-copy-on-write reader."""
+    with ingestion.parsed_data_lock:
+        sid = ingestion._select_source_locked(sport)
+        if sid is None:
+            return dict(ingestion.parsed_data.get(sport, {}))
+        return dict(ingestion.parsed_data_by_source.get(sid, {}).get(sport, {}))
+
+
+def locked_get_sport_data_json(sport):
+    """The pre-copy-on-write JSON reader (without the encode cache)."""
+    with ingestion.parsed_data_lock:
+        sid = ingestion._select_source_locked(sport)
+        data = ingestion.parsed_data_by_source.get(sid, {}).get(sport, {})
+        return encode_json(data)
+
+
+def lockfree_get_sport_data(sport):
+    return ingestion.get_sport_data(sport)
+
+
+def lockfree_get_sport_data_json(sport):
+    return ingestion.get_sport_data_json(sport)
+
+
+def reset() -> None:
+    with ingestion.parsed_data_lock:
+        ingestion.parsed_data_by_source.clear()
+        ingestion.last_seen_by_source.clear()
+        ingestion._auto_sticky_source.clear()
+        ingestion._auto_locked_at_seq.clear()
+        ingestion._data_versions.clear()
+
+
+def run(readers_fns, writers: int, readers: int, poll: float, seconds: float) -> tuple[float, float, float]:
+    reset()
+    stop = threading.Event()
+    writes = [0] * writers
+    reads = [0] * readers
+    worst = [0.0] * writers
+
+    def writer(slot):
+        source_id = f"tcp:10.0.0.{slot + 1}:4001"
+        n = 0
+        while not stop.is_set():
+            n += 1
+            start = time.perf_counter()
+            ingestion.record_packet(
+                "Basketball",
+                {"home_score": str(n % 100), "away_score": "0", "game_clock": f"{n % 60}"},
+                source_id,
+            )
+            worst[slot] = max(worst[slot], time.perf_counter() - start)
+            time.sleep(0)  # yield like a real reader waiting on its socket
+        writes[slot] = n
+
+    def reader(slot):
+        read = readers_fns[slot % len(readers_fns)]
+        done = 0
+        while not stop.is_set():
+            read("Basketball")
+            done += 1
+            time.sleep(poll)
+        reads[slot] = done
+
+    threads = [threading.Thread(target=writer, args=(i,)) for i in range(writers)]
+    threads += [threading.Thread(target=reader, args=(i,)) for i in range(readers)]
+    for t in threads:
+        t.start()
+    time.sleep(seconds)
+    stop.set()
+    for t in threads:
+        t.join()
+    return sum(writes) / seconds, sum(reads) / seconds, max(worst)
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--writers", type=int, default=8)
+    ap.add_argument("--readers", type=int, default=32)
+    ap.add_argument("--poll", type=float, default=0.001, help="seconds between polls per reader")
+    ap.add_argument("--seconds", type=float, default=3.0)
+    args = ap.parse_args()
+
+    print(f"{args.writers} writers, {args.readers} readers polling every {args.poll:g} s")
+    for name, fns in (
+        ("locked", (locked_get_sport_data, locked_get_sport_data_json)),
+        ("lock-free", (lockfree_get_sport_data, lockfree_get_sport_data_json)),
+    ):
+        write_rate, read_rate, worst = run(fns, args.writers, args.readers, args.poll, args.seconds)
+        print(
+            f"  {name:<10} writes/s {write_rate:10,.0f}   reads/s {read_rate:10,.0f}   "
+            f"worst write {1000 * worst:7.2f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
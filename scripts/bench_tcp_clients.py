@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+"""Benchmark: thread-per-source TCP clients vs. the selector multiplexer.
+
+A child process simulates N OES controllers (one listening socket; every
+accepted connection gets a basketball frame every ``1/--rate`` seconds, or
+nothing at all with ``--rate 0``).  This process then connects N data
+sources to it, once with the old one-thread-per-source worker (reproduced
+below) and once through ``ingestion.start_tcp_client``, and reports thread
+count, loop wakeups/sec and CPU over the measurement window.
+
+Usage:
+  python scripts/bench_tcp_clients.py [--controllers 50] [--rates 0,10] [--seconds 5]
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import socket
+import subprocess
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from website import ingestion  # noqa: E402
+from website.protocol import (  # noqa: E402
+    BBALL_LEN,
+    CR,
+    STX,
+    TP_BBALL_BASE_SOFT,
+    BulkPacketStreamParser,
+)
+
+BASE_THREADS = threading.active_count()
+
+
+def controllers(port: int, rate: float) -> None:
+    async def feed(reader, writer):
+        tick = 0
+        try:
+            while True:
+                if rate <= 0:
+                    await reader.read()  # stay silent until the client leaves
+                    return
+                tick += 1
+                frame = bytearray([0x30] * BBALL_LEN)
+                frame[0], frame[1], frame[-1] = STX, TP_BBALL_BASE_SOFT, CR
+                frame[8] = 0x30 + tick % 10
+                writer.write(bytes(frame))
+                await writer.drain()
+                await asyncio.sleep(1.0 / rate)
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def main():
+        server = await asyncio.start_server(feed, "127.0.0.1", port, backlog=1024)
+        async with server:
+            await server.serve_forever()
+
+    asyncio.run(main())
+
+
+class LegacyClients:
+    """The pre-multiplexer engine: one blocking thread per source."""
+
+    def __init__(self):
+        self.events = {}
+        self.threads = []
+        self.wakeups = 0
+
+    def worker(self, source, stop_event):
+        parser = BulkPacketStreamParser()
+        backoff = 1.0
+        while not stop_event.is_set():
+            conn = None
+            try:
+                conn = socket.create_connection((source["host"], source["port"]), timeout=5)
+                conn.settimeout(1.0)
+                backoff = 1.0
+                while not stop_event.is_set():
+                    try:
+                        data = conn.recv(4096)
+                    except socket.timeout:
+                        self.wakeups += 1
+                        continue
+                    self.wakeups += 1
+                    if not data:
+                        break
+                    for packet in parser.feed_bytes(data):
+                        ingestion.handle_serial_packet(packet, source_id=source["id"])
+            except OSError:
+                pass
+            finally:
+                if conn is not None:
+                    conn.close()
+            if stop_event.wait(backoff):
+                break
+            backoff = min(backoff * 2, 10.0)
+
+    def start(self, source):
+        stop_event = threading.Event()
+        self.events[source["id"]] = stop_event
+        thread = threading.Thread(target=self.worker, args=(source, stop_event), daemon=True)
+        self.threads.append(thread)
+        thread.start()
+
+    def stop_all(self):
+        for event in self.events.values():
+            event.set()
+        for thread in self.threads:
+            thread.join(timeout=2)
+
+
+class MuxClients:
+    def __init__(self):
+        self.ids = []
+
+    @property
+    def wakeups(self):
+        return ingestion._tcp_clients.wakeups
+
+    def start(self, source):
+        self.ids.append(source["id"])
+        ingestion.start_tcp_client(source)
+
+    def stop_all(self):
+        for source_id in self.ids:
+            ingestion.stop_tcp_client(source_id)
+
+
+def measure(engine, port: int, count: int, seconds: float) -> tuple[int, float, float, int]:
+    for n in range(count):
+        engine.start({"id": f"tcp:127.0.0.1:{port}:{n + 1}", "host": "127.0.0.1", "port": port})
+    time.sleep(1.0)
+    threads = threading.active_count() - BASE_THREADS
+    wakeups_start, cpu_start = engine.wakeups, time.process_time()
+    stats_start = sum(s["decoded"] + s["deduplicated"] for s in ingestion.get_frame_stats().values())
+    time.sleep(seconds)
+    wakeups = (engine.wakeups - wakeups_start) / seconds
+    cpu = time.process_time() - cpu_start
+    frames = sum(s["decoded"] + s["deduplicated"] for s in ingestion.get_frame_stats().values())
+    engine.stop_all()
+    return threads, wakeups, cpu, frames - stats_start
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--controllers", type=int, default=50)
+    ap.add_argument("--rates", default="0,10", help="comma-separated frames/s per controller")
+    ap.add_argument("--seconds", type=float, default=5.0)
+    ap.add_argument("--port", type=int, default=18801)
+    ap.add_argument("--serve", type=float, default=None, help=argparse.SUPPRESS)
+    args = ap.parse_args()
+
+    if args.serve is not None:
+        controllers(args.port, args.serve)
+        return
+
+    for offset, rate in enumerate(float(r) for r in args.rates.split(",")):
+        port = args.port + offset
+        child = subprocess.Popen(
+            [sys.executable, __file__, "--serve", str(rate), "--port", str(port)]
+        )
+        try:
+            for _ in range(50):
+                try:
+                    socket.create_connection(("127.0.0.1", port), timeout=1).close()
+                    break
+                except OSError:
+                    time.sleep(0.1)
+            print(f"{args.controllers} controllers, {rate:g} frames/s each")
+            for name, engine in (("threads", LegacyClients()), ("selector", MuxClients())):
+                threads, wakeups, cpu, frames = measure(
+                    engine, port, args.controllers, args.seconds
+                )
+                print(
+                    f"  {name:<9} threads {threads:>3}   wakeups/s {wakeups:8,.0f}   "
+                    f"CPU {100 * cpu / args.seconds:5.1f}%   frames {frames:,}"
+                )
+        finally:
+            child.terminate()
+            child.wait()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""Benchmark: a burst of relay reconnects against the inbound TCP listener.
+
+Opens --burst connections to the listener at once (as misbehaving relay
+software does when it reconnects in a loop without closing old sockets)
+and keeps them open and silent.  Reports the listener's thread count,
+RSS and CPU for the old thread-per-connection listener (reproduced
+below) and for ``ingestion._TcpServer``.
+
+Usage:
+  python scripts/bench_tcp_listener.py [--burst 300] [--seconds 3]
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import resource
+import socket
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from website import ingestion  # noqa: E402
+from website.protocol import BulkPacketStreamParser  # noqa: E402
+
+
+def rss_mb() -> float:
+    with open("/proc/self/statm") as handle:
+        return int(handle.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2**20
+
+
+class LegacyListener:
+    """The pre-selector listener: ``listen(5)`` and one thread per peer."""
+
+    def __init__(self):
+        self.sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self.sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self.sock.bind(("127.0.0.1", 0))
+        self.sock.listen(5)
+        self.sock.settimeout(1.0)
+        self.port = self.sock.getsockname()[1]
+
+    def reader(self, conn, addr, stop_event):
+        parser = BulkPacketStreamParser()
+        conn.settimeout(1.0)
+        try:
+            while not stop_event.is_set():
+                try:
+                    data = conn.recv(4096)
+                except socket.timeout:
+                    continue
+                except OSError:
+                    break
+                if not data:
+                    break
+                for packet in parser.feed_bytes(data):
+                    ingestion.handle_serial_packet(packet, source_id=f"tcp:{addr[0]}:{addr[1]}")
+        finally:
+            conn.close()
+
+    def serve(self, stop_event):
+        while not stop_event.is_set():
+            try:
+                conn, addr = self.sock.accept()
+            except socket.timeout:
+                continue
+            except OSError:
+                break
+            threading.Thread(
+                target=self.reader, args=(conn, addr, stop_event), daemon=True
+            ).start()
+        self.sock.close()
+
+
+class SelectorListener:
+    def __init__(self, max_connections):
+        self.server = ingestion._TcpServer(0, max_connections=max_connections, idle_timeout=0)
+        self.server.bind()
+        self.port = self.server.port
+
+    def serve(self, stop_event):
+        self.server.serve(stop_event)
+
+
+def run(listener, burst: int, seconds: float) -> tuple[int, float, float, int]:
+    stop = threading.Event()
+    base_threads = threading.active_count()
+    base_rss = rss_mb()
+    thread = threading.Thread(target=listener.serve, args=(stop,), daemon=True)
+    thread.start()
+    peers = []
+    for _ in range(burst):
+        try:
+            peers.append(socket.create_connection(("127.0.0.1", listener.port), timeout=2))
+        except OSError:
+            pass
+    time.sleep(1.0)
+    cpu_start = time.process_time()
+    time.sleep(seconds)
+    cpu = time.process_time() - cpu_start
+    threads = threading.active_count() - base_threads
+    grown = rss_mb() - base_rss
+    served = burst
+    if isinstance(listener, SelectorListener):
+        served = listener.server.stats()["connections"]
+    stop.set()
+    for peer in peers:
+        peer.close()
+    thread.join(timeout=3)
+    return threads, grown, cpu, served
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--burst", type=int, default=300)
+    ap.add_argument("--max-connections", type=int, default=64)
+    ap.add_argument("--seconds", type=float, default=3.0)
+    args = ap.parse_args()
+
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    resource.setrlimit(resource.RLIMIT_NOFILE, (hard, hard))
+
+    print(f"{args.burst} idle peers, selector cap {args.max_connections}")
+    for name, listener in (
+        ("threads", LegacyListener()),
+        ("selector", SelectorListener(args.max_connections)),
+    ):
+        threads, grown, cpu, served = run(listener, args.burst, args.seconds)
+        print(
+            f"  {name:<9} threads {threads:>4}   RSS +{grown:6.1f} MB   "
+            f"CPU {100 * cpu / args.seconds:5.1f}%   peers served {served}"
+        )
+
+
+if __name__ == "__main__":
+    main()
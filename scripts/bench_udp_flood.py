@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""UDP flood benchmark: per-datagram recvfrom vs. batched receive.
+
+A child process sends basketball frames (one per datagram; the score
+changes every --repeat datagrams, as controllers resend an unchanged
+board) to a local port at each --rates step.  The
+receiver is either the old listener loop (``recvfrom(4096)`` per datagram,
+reproduced below) or ``ingestion.udp_listener`` with its
+``DatagramReceiver``.  For every rate the script reports how many of the
+sent datagrams reached ``handle_serial_packet``, and finally the highest
+rate each receiver sustained without drops.
+
+Usage:
+  python scripts/bench_udp_flood.py [--rates 25000,50000,100000] [--repeat 20] [--seconds 2]
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import socket
+import subprocess
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from website import ingestion  # noqa: E402
+from website.protocol import (  # noqa: E402
+    BBALL_LEN,
+    CR,
+    STX,
+    TP_BBALL_BASE_SOFT,
+    BulkPacketStreamParser,
+)
+
+
+def frames() -> list[bytes]:
+    out = []
+    for n in range(10):
+        frame = bytearray([0x30] * BBALL_LEN)
+        frame[0], frame[1], frame[-1] = STX, TP_BBALL_BASE_SOFT, CR
+        frame[8] = 0x30 + n
+        out.append(bytes(frame))
+    return out
+
+
+def flood(port: int, rate: float, seconds: float, repeat: int) -> None:
+    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    payloads = frames()
+    target = ("127.0.0.1", port)
+    sent = 0
+    start = time.perf_counter()
+    end = start + seconds
+    while True:
+        now = time.perf_counter()
+        if now >= end:
+            break
+        due = int((now - start) * rate)
+        while sent < due:
+            sock.sendto(payloads[sent // repeat % 10], target)
+            sent += 1
+        time.sleep(0.0005)
+    print(sent, flush=True)
+
+
+def legacy_listener(port: int, stop_event: threading.Event) -> None:
+    """The pre-batching loop: one recvfrom per datagram, 1 s timeout."""
+    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    sock.bind(("0.0.0.0", port))
+    sock.settimeout(1.0)
+    parser = BulkPacketStreamParser()
+    try:
+        while not stop_event.is_set():
+            try:
+                data, addr = sock.recvfrom(4096)
+            except socket.timeout:
+                continue
+            for packet in parser.feed_bytes(data):
+                ingestion.handle_serial_packet(packet, source_id=f"udp:{addr[0]}:{addr[1]}")
+    finally:
+        sock.close()
+
+
+def frames_handled() -> int:
+    return sum(s["decoded"] + s["deduplicated"] for s in ingestion.get_frame_stats().values())
+
+
+def run(listener, port: int, rate: float, seconds: float, repeat: int) -> tuple[int, int]:
+    stop = threading.Event()
+    thread = threading.Thread(target=listener, args=(port, stop), daemon=True)
+    thread.start()
+    time.sleep(0.3)
+    before = frames_handled()
+    out = subprocess.run(
+        [sys.executable, __file__, "--flood", str(rate), "--port", str(port),
+         "--seconds", str(seconds), "--repeat", str(repeat)],
+        capture_output=True, text=True, check=True,
+    )
+    time.sleep(0.5)  # let the receiver drain its socket buffer
+    received = frames_handled() - before
+    stop.set()
+    thread.join(timeout=3)
+    return int(out.stdout), received
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--rates", default="25000,50000,75000,100000,150000",
+                    help="comma-separated datagrams/s")
+    ap.add_argument("--seconds", type=float, default=2.0)
+    ap.add_argument("--repeat", type=int, default=20, help="datagrams per distinct frame")
+    ap.add_argument("--port", type=int, default=18802)
+    ap.add_argument("--flood", type=float, default=None, help=argparse.SUPPRESS)
+    args = ap.parse_args()
+
+    if args.flood is not None:
+        flood(args.port, args.flood, args.seconds, args.repeat)
+        return
+
+    rates = [float(r) for r in args.rates.split(",")]
+    best = {}
+    for name, listener in (("recvfrom", legacy_listener), ("batched", ingestion.udp_listener)):
+        print(name)
+        for rate in rates:
+            sent, received = run(listener, args.port, rate, args.seconds, args.repeat)
+            delivered = received / sent if sent else 0.0
+            print(
+                f"  target {rate:9,.0f}/s  sent {sent / args.seconds:9,.0f}/s  "
+                f"delivered {100 * delivered:6.2f}%"
+            )
+            if delivered >= 0.999:
+                best[name] = max(best.get(name, 0), sent / args.seconds)
+    for name, rate in best.items():
+        print(f"max sustained without drops, {name}: {rate:,.0f} datagrams/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""Load test: thousands of SSE displays on the async server mode.
+
+Starts the app with ``website.async_server`` in a child process (plus a
+feeder thread recording a basketball packet every ``1/--rate`` seconds),
+then ramps up SSE connections to /sse/data/<sport> from a single asyncio
+loop in this process.  At every step it reports the server's RSS, the
+number of streams it holds and how many events the displays received.
+
+Usage:
+  python scripts/load_async_sse.py [--steps 500,1000,2000,4000] [--seconds 5]
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import resource
+import subprocess
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+SPORT = "Basketball"
+
+
+def _raise_fd_limit() -> None:
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    resource.setrlimit(resource.RLIMIT_NOFILE, (hard, hard))
+
+
+def serve(port: int, rate: float) -> None:
+    _raise_fd_limit()
+    from website import create_app, ingestion
+    from website.async_server import AsyncApp, serve as serve_async
+
+    flask_app = create_app()
+    app = AsyncApp(flask_app, max_sse=1_000_000)
+
+    @flask_app.route("/_bench/stats")
+    def stats():
+        with open("/proc/self/statm") as handle:
+            rss_pages = int(handle.read().split()[1])
+        return {
+            "rss_mb": rss_pages * os.sysconf("SC_PAGE_SIZE") / 2**20,
+            "streams": app.sse_connections,
+            "threads": threading.active_count(),
+            "cpu": time.process_time(),
+        }
+
+    def feed():
+        tick = 0
+        while True:
+            tick += 1
+            ingestion.record_packet(
+                SPORT,
+                {
+                    "game_clock": f"{(6000 - tick) // 600:02d}:{(6000 - tick) // 10 % 60:02d}",
+                    "home_score": str(tick // 50),
+                    "period": "1",
+                },
+                "bench:1",
+            )
+            time.sleep(1.0 / rate)
+
+    threading.Thread(target=feed, daemon=True).start()
+    asyncio.run(serve_async(app, "127.0.0.1", port))
+
+
+async def fetch_stats(port: int) -> dict:
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    writer.write(b"GET /_bench/stats HTTP/1.1\r\nHost: bench\r\nConnection: close\r\n\r\n")
+    raw = await reader.read()
+    writer.close()
+    return json.loads(raw.split(b"\r\n\r\n", 1)[1])
+
+
+async def display(port: int, counter: list, stop: asyncio.Event) -> None:
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    writer.write(f"GET /sse/data/{SPORT} HTTP/1.1\r\nHost: bench\r\n\r\n".encode())
+    try:
+        while not stop.is_set():
+            line = await reader.readline()
+            if not line:
+                break
+            if line.startswith(b"event: "):
+                counter[0] += 1
+    finally:
+        writer.close()
+
+
+async def ramp(port: int, steps: list[int], seconds: float) -> None:
+    stop = asyncio.Event()
+    counter = [0]
+    tasks = []
+    baseline = await fetch_stats(port)
+    print(f"  idle         RSS {baseline['rss_mb']:7.1f} MB  threads {baseline['threads']}")
+    for target in steps:
+        while len(tasks) < target:
+            tasks.append(asyncio.ensure_future(display(port, counter, stop)))
+            if len(tasks) % 200 == 0:
+                await asyncio.sleep(0.05)  # stay under the listen backlog
+        await asyncio.sleep(1.0)
+        start = await fetch_stats(port)
+        events_start = counter[0]
+        await asyncio.sleep(seconds)
+        end = await fetch_stats(port)
+        events = counter[0] - events_start
+        cpu = end["cpu"] - start["cpu"]
+        per_conn_kb = (end["rss_mb"] - baseline["rss_mb"]) * 1024 / max(1, end["streams"])
+        print(
+            f"  {target:>5} displays  RSS {end['rss_mb']:7.1f} MB "
+            f"({per_conn_kb:5.1f} KB/stream)  streams {end['streams']:>5}  "
+            f"threads {end['threads']:>3}  events/s {events / seconds:9,.0f}  "
+            f"CPU {100 * cpu / seconds:5.1f}%"
+        )
+    stop.set()
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--steps", default="500,1000,2000,4000", help="comma-separated display counts")
+    ap.add_argument("--seconds", type=float, default=5.0, help="measurement window per step")
+    ap.add_argument("--rate", type=float, default=10.0, help="packets/s from the feeder")
+    ap.add_argument("--port", type=int, default=18790)
+    ap.add_argument("--serve", action="store_true", help=argparse.SUPPRESS)
+    args = ap.parse_args()
+
+    if args.serve:
+        serve(args.port, args.rate)
+        return
+
+    _raise_fd_limit()
+    print(f"async server, feeder {args.rate:.0f} packets/s")
+    child = subprocess.Popen(
+        [sys.executable, __file__, "--serve", "--port", str(args.port), "--rate", str(args.rate)],
+        stdout=subprocess.DEVNULL,
+    )
+    try:
+        for _ in range(100):
+            try:
+                asyncio.run(fetch_stats(args.port))
+                break
+            except OSError:
+                time.sleep(0.1)
+        steps = [int(step) for step in args.steps.split(",")]
+        asyncio.run(ramp(args.port, steps, args.seconds))
+    finally:
+        child.terminate()
+        child.wait()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""Load test: server CPU for N displays polling vs. streaming /sse/data.
+
+Starts the app in a child process (threaded Werkzeug server plus a feeder
+thread recording a basketball packet every ``1/--rate`` seconds), connects
+N display clients from this process and reports the server's CPU time over
+the measurement window for two modes:
+
+  polling    each display GETs /get_raw_data/<sport> every --interval s
+  streaming  each display holds one /sse/data/<sport> connection
+
+The SSE connection cap is raised in the child so all N displays fit.
+
+Usage:
+  python scripts/load_sse_vs_polling.py [--displays 100] [--seconds 10]
+"""
+from __future__ import annotations
+
+import argparse
+import http.client
+import json
+import os
+import subprocess
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+SPORT = "Basketball"
+
+
+def serve(port: int, rate: float, displays: int) -> None:
+    from werkzeug.serving import make_server
+
+    from website import create_app, ingestion
+
+    ingestion.SSE_MAX_CONNECTIONS = displays + 10
+    app = create_app()
+
+    @app.route("/_bench/cpu")
+    def cpu():
+        return {"cpu": time.process_time()}
+
+    def feed():
+        tick = 0
+        while True:
+            tick += 1
+            ingestion.record_packet(
+                SPORT,
+                {
+                    "game_clock": f"{(6000 - tick) // 600:02d}:{(6000 - tick) // 10 % 60:02d}",
+                    "shot_clock": f"{30 - tick // 10 % 30:02d}",
+                    "home_score": str(tick // 50),
+                    "away_score": str(tick // 70),
+                    "period": "1",
+                    **{f"stat_{i}": str(i) for i in range(30)},
+                },
+                "bench:1",
+            )
+            time.sleep(1.0 / rate)
+
+    threading.Thread(target=feed, daemon=True).start()
+    make_server("127.0.0.1", port, app, threaded=True).serve_forever()
+
+
+def server_cpu(port: int) -> float:
+    conn = http.client.HTTPConnection("127.0.0.1", port, timeout=10)
+    conn.request("GET", "/_bench/cpu")
+    value = json.loads(conn.getresponse().read())["cpu"]
+    conn.close()
+    return value
+
+
+def poller(port: int, interval: float, stop: threading.Event, counter: list) -> None:
+    while not stop.is_set():
+        started = time.perf_counter()
+        try:
+            conn = http.client.HTTPConnection("127.0.0.1", port, timeout=10)
+            conn.request("GET", f"/get_raw_data/{SPORT}")
+            conn.getresponse().read()
+            conn.close()
+            counter[0] += 1
+        except OSError:
+            pass
+        stop.wait(max(0.0, interval - (time.perf_counter() - started)))
+
+
+def streamer(port: int, stop: threading.Event, counter: list) -> None:
+    conn = http.client.HTTPConnection("127.0.0.1", port, timeout=30)
+    conn.request("GET", f"/sse/data/{SPORT}")
+    resp = conn.getresponse()
+    while not stop.is_set():
+        line = resp.fp.readline()
+        if not line:
+            break
+        if line.startswith(b"event: "):
+            counter[0] += 1
+    conn.close()
+
+
+def measure(port: int, mode: str, args) -> tuple[float, int]:
+    stop = threading.Event()
+    counters = [[0] for _ in range(args.displays)]
+    if mode == "polling":
+        targets = [(poller, (port, args.interval, stop, c)) for c in counters]
+    else:
+        targets = [(streamer, (port, stop, c)) for c in counters]
+    threads = [threading.Thread(target=fn, args=a, daemon=True) for fn, a in targets]
+    for t in threads:
+        t.start()
+    time.sleep(1.0)  # let every display connect before measuring
+    cpu_start = server_cpu(port)
+    seen_start = sum(c[0] for c in counters)
+    time.sleep(args.seconds)
+    cpu = server_cpu(port) - cpu_start
+    seen = sum(c[0] for c in counters) - seen_start
+    stop.set()
+    return cpu, seen
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--displays", type=int, default=100)
+    ap.add_argument("--seconds", type=float, default=10.0, help="measurement window")
+    ap.add_argument("--interval", type=float, default=0.5, help="polling interval (s)")
+    ap.add_argument("--rate", type=float, default=10.0, help="packets/s from the feeder")
+    ap.add_argument("--port", type=int, default=18765)
+    ap.add_argument("--serve", action="store_true", help=argparse.SUPPRESS)
+    args = ap.parse_args()
+
+    if args.serve:
+        serve(args.port, args.rate, args.displays)
+        return
+
+    print(
+        f"{args.displays} displays, {args.seconds:.0f}s window, "
+        f"feeder {args.rate:.0f} packets/s, polling every {args.interval}s"
+    )
+    for offset, mode in enumerate(("polling", "streaming")):
+        port = args.port + offset
+        child = subprocess.Popen(
+            [sys.executable, __file__, "--serve", "--port", str(port),
+             "--rate", str(args.rate), "--displays", str(args.displays)],
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+        try:
+            for _ in range(50):
+                try:
+                    server_cpu(port)
+                    break
+                except OSError:
+                    time.sleep(0.1)
+            cpu, seen = measure(port, mode, args)
+        finally:
+            child.terminate()
+            child.wait()
+        print(
+            f"  {mode:<10} server CPU {cpu:6.2f}s ({100 * cpu / args.seconds:5.1f}% of one core)"
+            f"   updates delivered {seen:,}"
+        )
+
+
+if __name__ == "__main__":
+    main()
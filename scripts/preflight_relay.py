@@ -7,6 +7,8 @@ moment to confirm the edge does not reject the connection, then exits.
 
 Use this *before* flipping ``CLOUD_RELAY_ENABLED=1`` on prod to verify
 the token, URL, and reachability without starting the polling loop.
+With several comma-separated URLs (and either one token or one per URL)
+each edge is checked in turn, stopping at the first failure.
 
 Exit codes:
   0 — handshake accepted
@@ -30,15 +32,26 @@ def _fail(msg: str, code: int = 1) -> None:
 
 
 def main() -> None:
-    url = os.environ.get("CLOUD_RELAY_URL", "").strip()
-    token = os.environ.get("CLOUD_RELAY_TOKEN", "")
+    urls = [url.strip() for url in os.environ.get("CLOUD_RELAY_URL", "").split(",") if url.strip()]
+    tokens = [token.strip() for token in os.environ.get("CLOUD_RELAY_TOKEN", "").split(",")]
     publisher = os.environ.get("CLOUD_RELAY_PUBLISHER_NAME", "preflight").strip() or "preflight"
 
-    if not url:
+    if not urls:
         _fail("CLOUD_RELAY_URL is not set")
-    if not token:
+    if len(tokens) == 1:
+        tokens *= len(urls)
+    if not all(tokens):
         _fail("CLOUD_RELAY_TOKEN is not set")
+    if len(tokens) != len(urls):
+        _fail(f"CLOUD_RELAY_TOKEN lists {len(tokens)} tokens for {len(urls)} URLs")
 
+    for url, token in zip(urls, tokens):
+        _check(url, token, publisher)
+
+    print("OK: hello accepted, pong received. Relay credentials are valid.")
+
+
+def _check(url: str, token: str, publisher: str) -> None:
     try:
         from websocket import create_connection, WebSocketBadStatusException
     except ImportError:
@@ -84,8 +97,6 @@ def main() -> None:
         except Exception:
             pass
 
-    print("OK: hello accepted, pong received. Relay credentials are valid.")
-
 
 if __name__ == "__main__":
     main()
@@ -2,10 +2,18 @@ import base64
 
 import pytest
 
-from website import create_app
+from website import create_app, ingestion
 from website.config import CONFIG
 
 
+@pytest.fixture(autouse=True)
+def sources_file(tmp_path, monkeypatch):
+    """Keep data-source writes out of the working tree."""
+    path = tmp_path / "data_sources.json"
+    monkeypatch.setattr(ingestion, "DATA_SOURCES_FILE", str(path))
+    return path
+
+
 @pytest.fixture()
 def app():
     app = create_app()
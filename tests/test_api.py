@@ -16,8 +16,19 @@ def _reset_state():
         ingestion.last_seen_by_source.clear()
         ingestion._clock_snapshots.clear()
         ingestion._clock_seq = 0
+        ingestion._frame_stats_by_source.clear()
+        ingestion._change_journal.clear()
+        ingestion._journal_seq = 0
+        ingestion._last_change_seq.clear()
+        ingestion._auto_locked_at_seq.clear()
+        ingestion._auto_sticky_source.clear()
+        ingestion._sources_by_freshness.clear()
+        ingestion._data_versions.clear()
+    ingestion._clock_channels = ingestion._UpdateChannels()
+    ingestion._journal_channels = ingestion._UpdateChannels()
     with ingestion.data_sources_lock:
         ingestion.data_sources.clear()
+    ingestion._override_index = {}
     with ingestion._sse_connection_lock:
         ingestion._sse_connection_count = 0
     yield
@@ -35,6 +46,18 @@ class TestGetEndpoints:
         data = resp.get_json()
         assert data["home_score"] == "50"
 
+    def test_get_raw_data_body_matches_jsonify(self, app, client):
+        from flask import jsonify
+
+        ingestion.record_packet(
+            "Basketball", {"home_score": "50", "period": "2", "clock": "9:59"}, "test:1"
+        )
+        resp = client.get("/get_raw_data/Basketball")
+        assert resp.mimetype == "application/json"
+        with app.app_context():
+            expected = jsonify(ingestion.get_sport_data("Basketball")).get_data()
+        assert resp.get_data() == expected
+
     def test_get_sources_empty(self, client):
         resp = client.get("/get_sources")
         assert resp.status_code == 200
@@ -53,6 +76,18 @@ class TestGetEndpoints:
         assert data["sources"][0]["name"] == "Boshamer"
         assert data["sources"][0]["source"] == "tcp:10.0.0.1:3000"
 
+    def test_get_frame_stats(self, client):
+        pkt = [0x30] * 23
+        pkt[0], pkt[1], pkt[-1] = 0x02, 0x74, 0x0D
+        ingestion.handle_serial_packet(pkt, source_id="udp:10.0.0.5:5002")
+        ingestion.handle_serial_packet(pkt, source_id="udp:10.0.0.5:5002")
+        resp = client.get("/get_frame_stats")
+        assert resp.get_json()["sources"]["udp:10.0.0.5:5002"] == {
+            "decoded": 1,
+            "deduplicated": 1,
+        }
+        assert resp.get_json()["cloud_relay"] is None
+
     def test_get_trackman_data_unknown_sport(self, client):
         resp = client.get("/get_trackman_data/Tennis")
         assert resp.status_code == 404
@@ -62,6 +97,140 @@ class TestGetEndpoints:
         assert resp.status_code == 404
 
 
+class TestRawDataSince:
+    def test_first_request_returns_full_state(self, client):
+        ingestion.record_packet("Hockey", {"home_score": "1", "period": "1"}, "src:A")
+        data = client.get("/get_raw_data/Hockey?since=0").get_json()
+        assert data["full"] is True
+        assert data["seq"] == 1
+        assert data["data"]["home_score"] == "1"
+        assert data["data"]["_meta"]["source"] == "src:A"
+
+    def test_unchanged_returns_304(self, client):
+        ingestion.record_packet("Hockey", {"home_score": "1"}, "src:A")
+        seq = client.get("/get_raw_data/Hockey?since=0").get_json()["seq"]
+        ingestion.record_packet("Hockey", {"home_score": "1"}, "src:A")
+        resp = client.get(f"/get_raw_data/Hockey?since={seq}")
+        assert resp.status_code == 304
+        assert resp.data == b""
+
+    def test_returns_only_changed_fields(self, client):
+        ingestion.record_packet("Hockey", {"home_score": "1", "period": "1"}, "src:A")
+        seq = client.get("/get_raw_data/Hockey?since=0").get_json()["seq"]
+        ingestion.record_packet("Soccer", {"home_score": "7"}, "src:A")
+        ingestion.record_packet("Hockey", {"home_score": "2", "period": "1"}, "src:A")
+        ingestion.record_packet("Hockey", {"home_score": "3", "period": "1"}, "src:A")
+        data = client.get(f"/get_raw_data/Hockey?since={seq}").get_json()
+        assert data["full"] is False
+        assert data["seq"] == 4
+        assert data["changes"] == {"home_score": "3"}
+        assert data["removed"] == []
+        assert data["_meta"]["source"] == "src:A"
+
+    def test_auto_source_switch_forces_full_state(self, client):
+        ingestion.record_packet("Hockey", {"home_score": "1"}, "src:A")
+        seq = client.get("/get_raw_data/Hockey?since=0").get_json()["seq"]
+        with ingestion.parsed_data_lock:
+            ingestion.last_seen_by_source["src:A"] -= 60
+        ingestion.record_packet("Hockey", {"home_score": "5"}, "src:B")
+        data = client.get(f"/get_raw_data/Hockey?since={seq}").get_json()
+        assert data["full"] is True
+        assert data["data"]["_meta"]["source"] == "src:B"
+
+    def test_explicit_source(self, client):
+        ingestion.record_packet("Hockey", {"home_score": "1"}, "src:A")
+        ingestion.record_packet("Hockey", {"home_score": "9"}, "src:B")
+        seq = client.get("/get_raw_data/Hockey?since=0&source=src:A").get_json()["seq"]
+        ingestion.record_packet("Hockey", {"home_score": "8"}, "src:B")
+        resp = client.get(f"/get_raw_data/Hockey?since={seq}&source=src:A")
+        assert resp.status_code == 304
+
+    def test_unknown_source_returns_empty_state(self, client):
+        ingestion.record_packet("Hockey", {"home_score": "1"}, "src:A")
+        assert client.get("/get_raw_data/Hockey?source=bogus").get_json() == {}
+        data = client.get("/get_raw_data/Hockey?since=0&source=bogus").get_json()
+        assert data["full"] is True
+        assert data["data"] == {}
+
+    def test_invalid_since(self, client):
+        resp = client.get("/get_raw_data/Hockey?since=abc")
+        assert resp.status_code == 400
+
+
+class TestConditionalGet:
+    def _revalidate(self, client, url):
+        etag = client.get(url).headers["ETag"]
+        return client.get(url, headers={"If-None-Match": etag})
+
+    def test_raw_data_unchanged_returns_304(self, client):
+        ingestion.record_packet("Hockey", {"home_score": "1"}, "src:A")
+        resp = self._revalidate(client, "/get_raw_data/Hockey")
+        assert resp.status_code == 304
+        assert resp.data == b""
+        assert resp.headers["ETag"].startswith('W/"')
+
+    def test_raw_data_new_packet_changes_etag(self, client):
+        ingestion.record_packet("Hockey", {"home_score": "1"}, "src:A")
+        etag = client.get("/get_raw_data/Hockey").headers["ETag"]
+        # Even an identical resend refreshes _meta.received_at.
+        ingestion.record_packet("Hockey", {"home_score": "1"}, "src:A")
+        resp = client.get("/get_raw_data/Hockey", headers={"If-None-Match": etag})
+        assert resp.status_code == 200
+        assert resp.headers["ETag"] != etag
+
+    def test_raw_data_explicit_source_ignores_other_sources(self, client):
+        ingestion.record_packet("Hockey", {"home_score": "1"}, "src:A")
+        url = "/get_raw_data/Hockey?source=src:A"
+        etag = client.get(url).headers["ETag"]
+        ingestion.record_packet("Hockey", {"home_score": "9"}, "src:B")
+        resp = client.get(url, headers={"If-None-Match": etag})
+        assert resp.status_code == 304
+
+    def test_raw_data_auto_source_switch_changes_etag(self, client):
+        ingestion.record_packet("Hockey", {"home_score": "1"}, "src:A")
+        etag = client.get("/get_raw_data/Hockey").headers["ETag"]
+        with ingestion.parsed_data_lock:
+            ingestion.last_seen_by_source["src:A"] -= 60
+        ingestion.record_packet("Hockey", {"home_score": "5"}, "src:B")
+        resp = client.get("/get_raw_data/Hockey", headers={"If-None-Match": etag})
+        assert resp.status_code == 200
+        assert resp.get_json()["_meta"]["source"] == "src:B"
+
+    def test_statcrew_data(self, client):
+        from website import statcrew
+
+        resp = self._revalidate(client, "/get_statcrew_data/Baseball")
+        assert resp.status_code == 304
+        etag = resp.headers["ETag"]
+        with statcrew.statcrew_lock:
+            statcrew.statcrew_versions["Baseball"] = (
+                statcrew.statcrew_versions.get("Baseball", 0) + 1
+            )
+        resp = client.get(
+            "/get_statcrew_data/Baseball", headers={"If-None-Match": etag}
+        )
+        assert resp.status_code == 200
+
+    def test_trackman_and_virtius_data(self, client):
+        assert self._revalidate(client, "/get_trackman_data/Baseball").status_code == 304
+        assert self._revalidate(client, "/get_virtius_data/Gymnastics").status_code == 304
+
+    def test_gymnastics_data_tracks_oes_updates(self, client):
+        etag = client.get("/get_gymnastics_data").headers["ETag"]
+        assert self._revalidate(client, "/get_gymnastics_data").status_code == 304
+        ingestion.record_packet("Gymnastics", {"game_clock": "1:00"}, "src:A")
+        resp = client.get("/get_gymnastics_data", headers={"If-None-Match": etag})
+        assert resp.status_code == 200
+        assert resp.get_json()["clock"] == "1:00"
+
+    def test_sources_etag_changes_on_new_source(self, client):
+        etag = client.get("/get_sources").headers["ETag"]
+        ingestion.record_packet("Hockey", {"home_score": "1"}, "src:A")
+        resp = client.get("/get_sources", headers={"If-None-Match": etag})
+        assert resp.status_code == 200
+        assert len(resp.get_json()["sources"]) == 1
+
+
 class TestSSEEndpoint:
     def test_sse_returns_event_stream_for_clock_sport(self, client):
         resp = client.get("/sse/clock/Basketball")
@@ -77,6 +246,60 @@ class TestSSEEndpoint:
         assert resp.status_code == 404
 
 
+class TestSSEDataEndpoint:
+    def _events(self, resp):
+        """Yield (event, data) pairs from a streamed SSE response."""
+        for chunk in resp.response:
+            text = chunk.decode() if isinstance(chunk, bytes) else chunk
+            if text.startswith("event: "):
+                head, data = text.strip().split("\n", 1)
+                yield head[len("event: "):], json.loads(data[len("data: "):])
+
+    def test_state_then_delta(self, client):
+        ingestion.record_packet("Baseball", {"home_runs": " 0", "outs": "0"}, "src:A")
+        resp = client.get("/sse/data/Baseball", buffered=False)
+        assert resp.content_type.startswith("text/event-stream")
+        events = self._events(resp)
+        try:
+            event, data = next(events)
+            assert event == "state"
+            assert data["full"] is True
+            assert data["data"]["outs"] == "0"
+
+            ingestion.record_packet("Baseball", {"home_runs": " 0", "outs": "1"}, "src:A")
+            event, data = next(events)
+            assert event == "delta"
+            assert data["changes"] == {"outs": "1"}
+            assert data["seq"] == ingestion.get_journal_seq()
+        finally:
+            resp.close()
+
+    def test_honors_source(self, client):
+        ingestion.record_packet("Gymnastics", {"game_clock": "1:00"}, "src:A")
+        ingestion.record_packet("Gymnastics", {"game_clock": "2:00"}, "src:B")
+        resp = client.get("/sse/data/Gymnastics?source=src:A", buffered=False)
+        events = self._events(resp)
+        try:
+            assert next(events)[1]["data"]["game_clock"] == "1:00"
+            ingestion.record_packet("Gymnastics", {"game_clock": "3:00"}, "src:B")
+            ingestion.record_packet("Gymnastics", {"game_clock": "0:59"}, "src:A")
+            event, data = next(events)
+            assert event == "delta"
+            assert data["changes"] == {"game_clock": "0:59"}
+        finally:
+            resp.close()
+
+    def test_releases_connection_slot(self, client):
+        resp = client.get("/sse/data/Softball", buffered=False)
+        next(iter(resp.response))
+        assert ingestion._sse_connection_count == 1
+        resp.close()
+        assert ingestion._sse_connection_count == 0
+
+    def test_unknown_sport_404(self, client):
+        assert client.get("/sse/data/Tennis").status_code == 404
+
+
 class TestDataSourcesCRUD:
     def test_add_and_list(self, auth_client):
         resp = auth_client.post(
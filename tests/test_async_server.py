@@ -0,0 +1,202 @@
+import asyncio
+import json
+import threading
+
+import pytest
+
+from website import ingestion
+from website.async_server import AsyncApp, start_server
+
+
+def _clear_ingestion():
+    with ingestion.parsed_data_lock:
+        for key in ingestion.parsed_data:
+            ingestion.parsed_data[key] = {}
+        ingestion.parsed_data_by_source.clear()
+        ingestion.last_seen_by_source.clear()
+        ingestion._clock_snapshots.clear()
+        ingestion._clock_seq = 0
+        ingestion._change_journal.clear()
+        ingestion._journal_seq = 0
+        ingestion._last_change_seq.clear()
+        ingestion._auto_locked_at_seq.clear()
+        ingestion._auto_sticky_source.clear()
+        ingestion._sources_by_freshness.clear()
+        ingestion._data_versions.clear()
+    ingestion._clock_channels = ingestion._UpdateChannels()
+    ingestion._journal_channels = ingestion._UpdateChannels()
+
+
+@pytest.fixture(autouse=True)
+def _reset_state():
+    _clear_ingestion()
+    yield
+    _clear_ingestion()
+
+
+@pytest.fixture()
+def asgi(app):
+    asgi_app = AsyncApp(app, max_sse=2)
+    yield asgi_app
+    asgi_app.close()
+
+
+def _scope(path, query=b"", headers=()):
+    return {
+        "type": "http",
+        "method": "GET",
+        "path": path,
+        "query_string": query,
+        "headers": list(headers),
+        "http_version": "1.1",
+    }
+
+
+async def _request(asgi_app, path, query=b"", headers=()):
+    """Run one non-streaming request; returns (status, headers, body)."""
+    messages = []
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        messages.append(message)
+
+    await asgi_app(_scope(path, query, headers), receive, send)
+    start = messages[0]
+    body = b"".join(m.get("body", b"") for m in messages[1:])
+    return start["status"], dict(start["headers"]), body
+
+
+class TestNativeRoutes:
+    def test_raw_data_matches_flask(self, asgi, client):
+        ingestion.record_packet("Hockey", {"home_score": "3"}, "src:A")
+        status, headers, body = asyncio.run(_request(asgi, "/get_raw_data/Hockey"))
+        flask_resp = client.get("/get_raw_data/Hockey")
+        assert status == 200
+        assert body == flask_resp.get_data()
+        assert headers[b"etag"].decode() == flask_resp.headers["ETag"]
+
+    def test_raw_data_if_none_match(self, asgi):
+        ingestion.record_packet("Hockey", {"home_score": "3"}, "src:A")
+        _, headers, _ = asyncio.run(_request(asgi, "/get_raw_data/Hockey"))
+        status, _, body = asyncio.run(
+            _request(asgi, "/get_raw_data/Hockey", headers=[(b"if-none-match", headers[b"etag"])])
+        )
+        assert (status, body) == (304, b"")
+
+    def test_raw_data_since(self, asgi):
+        ingestion.record_packet("Hockey", {"home_score": "3"}, "src:A")
+        seq = ingestion.get_journal_seq()
+        status, _, _ = asyncio.run(
+            _request(asgi, "/get_raw_data/Hockey", query=f"since={seq}".encode())
+        )
+        assert status == 304
+        status, _, _ = asyncio.run(_request(asgi, "/get_raw_data/Hockey", query=b"since=x"))
+        assert status == 400
+
+    def test_unknown_payload_sport(self, asgi):
+        status, _, body = asyncio.run(_request(asgi, "/get_statcrew_data/Tennis"))
+        assert (status, body) == (404, b"{}\n")
+
+    def test_other_routes_fall_back_to_flask(self, asgi):
+        status, _, body = asyncio.run(_request(asgi, "/get_gymnastics_data"))
+        assert status == 200
+        assert json.loads(body)["oes"] == {}
+        status, _, _ = asyncio.run(_request(asgi, "/data_sources"))
+        assert status == 401
+
+
+class TestSSE:
+    def test_data_stream_state_then_delta(self, asgi):
+        ingestion.record_packet("Softball", {"outs": "0"}, "src:A")
+
+        async def scenario():
+            chunks = asyncio.Queue()
+            disconnect = asyncio.Event()
+            received_body = False
+
+            async def receive():
+                nonlocal received_body
+                if not received_body:
+                    received_body = True
+                    return {"type": "http.request", "body": b"", "more_body": False}
+                await disconnect.wait()
+                return {"type": "http.disconnect"}
+
+            async def send(message):
+                if message["type"] == "http.response.body":
+                    await chunks.put(message["body"].decode())
+
+            stream = asyncio.ensure_future(asgi(_scope("/sse/data/Softball"), receive, send))
+            assert await chunks.get() == "retry: 1000\n\n"
+            state = await chunks.get()
+            assert state.startswith("event: state\n")
+            assert asgi.sse_connections == 1
+
+            # Published from an ingestion thread, delivered on the loop.
+            publisher = threading.Thread(
+                target=ingestion.record_packet, args=("Softball", {"outs": "1"}, "src:A")
+            )
+            publisher.start()
+            delta = await asyncio.wait_for(chunks.get(), 5)
+            publisher.join()
+            assert delta.startswith("event: delta\n")
+            assert json.loads(delta.split("data: ", 1)[1])["changes"] == {"outs": "1"}
+
+            disconnect.set()
+            await asyncio.wait_for(stream, 5)
+            assert asgi.sse_connections == 0
+
+        asyncio.run(scenario())
+
+    def test_connection_cap(self, asgi):
+        asgi.sse_connections = asgi.max_sse
+        status, _, _ = asyncio.run(_request(asgi, "/sse/clock/Basketball"))
+        assert status == 503
+
+    def test_clock_stream_unknown_sport(self, asgi):
+        status, _, _ = asyncio.run(_request(asgi, "/sse/clock/Baseball"))
+        assert status == 404
+
+
+class TestHttpServer:
+    def test_keep_alive_and_fallback(self, asgi):
+        ingestion.record_packet("Hockey", {"home_score": "3"}, "src:A")
+
+        async def scenario():
+            server = await start_server(asgi, "127.0.0.1", 0)
+            port = server.sockets[0].getsockname()[1]
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+            responses = []
+            for path in ("/get_raw_data/Hockey", "/get_gymnastics_data"):
+                writer.write(f"GET {path} HTTP/1.1\r\nHost: x\r\n\r\n".encode())
+                head = (await reader.readuntil(b"\r\n\r\n")).decode()
+                length = int(head.lower().split("content-length: ")[1].split("\r\n")[0])
+                responses.append((head.split(" ")[1], await reader.readexactly(length)))
+            writer.close()
+            server.close()
+            await server.wait_closed()
+            return responses
+
+        (status1, body1), (status2, body2) = asyncio.run(scenario())
+        assert status1 == status2 == "200"
+        assert json.loads(body1)["home_score"] == "3"
+        assert "team_colors" in json.loads(body2)
+
+    def test_bad_content_length_is_rejected(self, asgi):
+        async def scenario(value):
+            server = await start_server(asgi, "127.0.0.1", 0)
+            port = server.sockets[0].getsockname()[1]
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+            writer.write(
+                f"POST /get_raw_data/Hockey HTTP/1.1\r\nHost: x\r\nContent-Length: {value}\r\n\r\n".encode()
+            )
+            head = (await reader.readuntil(b"\r\n\r\n")).decode()
+            writer.close()
+            server.close()
+            await server.wait_closed()
+            return head.split(" ")[1]
+
+        for value in ("abc", "-5", "1e3"):
+            assert asyncio.run(scenario(value)) == "400"
@@ -1,37 +1,95 @@
 """Cloud relay tests — no real network.
 
 The relay accepts dependency-injected ``ws_factory`` and ``sleep``, so we
-exercise the connect/snapshot/tick logic against a fake websocket and a
-deterministic sleep.
+exercise the connect/snapshot/tick logic against a fake websocket; the
+run-loop tests drive it with real store writes and the change feed.
 """
 from __future__ import annotations
 
+import itertools
 import json
+import queue
 import threading
+import time
+import zlib
 from dataclasses import replace
 
 import pytest
 
 from website import cloud_relay, ingestion, statcrew, trackman, virtius
+from website.change_feed import store_changes
 from website.config import CONFIG
+from website.relay_delta import apply_delta, changed_paths, make_delta
+from website.snapshot import Snapshot
 
 
 # --- Fake websocket -------------------------------------------------------
 
 
 class FakeWS:
-    def __init__(self):
+    """Records sent frames (``sent``, with batches unpacked) and raw
+    messages (``messages``: ``(is_binary, size)``). With ``edge_version=2``
+    it also answers like a version-2 edge accepting *features*: a ``hello``
+    back, and an ``ack`` for every ``seq``."""
+
+    def __init__(self, edge_version=1, features=()):
         self.sent: list[dict] = []
+        self.messages: list[tuple[bool, int]] = []
         self.closed = False
+        self.edge_version = edge_version
+        self.features = list(features)
         self._send_raises_after: int | None = None
+        self._inbox: queue.Queue = queue.Queue()
+        self._inflate = zlib.decompressobj()
 
     def send(self, frame: str) -> None:
+        self._receive(frame, binary=False)
+
+    def send_binary(self, data: bytes) -> None:
+        self._receive(self._inflate.decompress(data).decode(), binary=True, size=len(data))
+
+    def _receive(self, text, binary, size=None):
         if self._send_raises_after is not None and len(self.sent) >= self._send_raises_after:
             raise ConnectionError("simulated disconnect")
-        self.sent.append(json.loads(frame))
+        self.messages.append((binary, len(text) if size is None else size))
+        message = json.loads(text)
+        frames = message["frames"] if message["type"] == "batch" else [message]
+        self.sent.extend(frames)
+        if self.edge_version >= 2:
+            for frame in frames:
+                if frame["type"] == "hello":
+                    self.push({"type": "hello", "version": 2, "features": self.features})
+                elif "seq" in frame:
+                    self.push({"type": "ack", "seq": frame["seq"]})
+
+    def push(self, message: dict) -> None:
+        """Queue a frame from the edge for ``recv``."""
+        self._inbox.put(json.dumps(message))
+
+    def recv(self) -> str:
+        message = self._inbox.get()
+        return "" if message is None else message
 
     def close(self) -> None:
         self.closed = True
+        self._inbox.put(None)
+
+
+def _mirror(frames):
+    """Rebuild the edge's view from *frames*: (kind, sport) -> value."""
+    fields = {"sport": "state", "clock": "clock"}
+    state = {}
+    for frame in frames:
+        kind = frame["type"]
+        if kind == "snapshot":
+            for sport, data in frame["state"].items():
+                state[("sport", sport)] = data
+        elif kind == "delta":
+            key = (frame["kind"], frame["sport"])
+            state[key] = apply_delta(state[key], frame.get("set", []), frame.get("unset", []))
+        elif kind in fields or kind in cloud_relay.PAYLOAD_KINDS:
+            state[(kind, frame["sport"])] = frame[fields.get(kind, "payload")]
+    return state
 
 
 def _make_factory(*sockets: FakeWS):
@@ -51,9 +109,25 @@ def _make_factory(*sockets: FakeWS):
     return factory
 
 
+def _endpoint(relay):
+    """The relay's first endpoint, marked connected: frames queue in its
+    outbox until ``_flush`` sends them, standing in for the writer."""
+    endpoint = relay._endpoints[0]
+    endpoint._outbox = cloud_relay._Outbox(256, endpoint._send_stats)
+    return endpoint
+
+
+def _flush(endpoint, ws):
+    endpoint._send_frames(ws, endpoint._outbox.take(0))
+
+
+def _tick(relay, endpoint, ws, keys=None):
+    relay._tick(keys)
+    _flush(endpoint, ws)
+
+
 def _enabled_config(**overrides):
-    return replace(
-        CONFIG,
+    settings = dict(
         cloud_relay_enabled=True,
         cloud_relay_url="ws://test/ws/publisher",
         cloud_relay_token="secret",
@@ -61,8 +135,10 @@ def _enabled_config(**overrides):
         cloud_relay_poll_interval=0.01,
         cloud_relay_reconnect_min=0.0,
         cloud_relay_reconnect_max=0.0,
-        **overrides,
+        cloud_relay_hello_timeout=0.0,
     )
+    settings.update(overrides)
+    return replace(CONFIG, **settings)
 
 
 # --- State helpers --------------------------------------------------------
@@ -74,6 +150,8 @@ def reset_state():
     saved_parsed = {k: dict(v) for k, v in ingestion.parsed_data.items()}
     saved_by_source = {k: dict(v) for k, v in ingestion.parsed_data_by_source.items()}
     saved_seen = dict(ingestion.last_seen_by_source)
+    saved_fresh = {k: v.copy() for k, v in ingestion._sources_by_freshness.items()}
+    saved_sticky = dict(ingestion._auto_sticky_source)
     saved_clocks = {k: dict(v) for k, v in ingestion._clock_snapshots.items()}
     saved_tm = {k: dict(v) for k, v in trackman.trackman_data.items()}
     saved_sc = {k: dict(v) for k, v in getattr(statcrew, "statcrew_data", {}).items()}
@@ -85,6 +163,10 @@ def reset_state():
     ingestion.parsed_data_by_source.update(saved_by_source)
     ingestion.last_seen_by_source.clear()
     ingestion.last_seen_by_source.update(saved_seen)
+    ingestion._sources_by_freshness.clear()
+    ingestion._sources_by_freshness.update(saved_fresh)
+    ingestion._auto_sticky_source.clear()
+    ingestion._auto_sticky_source.update(saved_sticky)
     ingestion._clock_snapshots.clear()
     ingestion._clock_snapshots.update(saved_clocks)
     trackman.trackman_data.clear()
@@ -97,6 +179,25 @@ def reset_state():
         virtius.virtius_data.update(saved_vt)
 
 
+_versions = itertools.count(1)
+
+
+def _publish(sport, data):
+    """Store *data* as the Auto-mode snapshot for *sport*, versioned and
+    announced the way ``record_packet`` publishes it."""
+    ingestion.parsed_data[sport] = Snapshot(data, next(_versions))
+    store_changes.publish("sport", sport)
+
+
+def _wait_for(predicate, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.01)
+    return predicate()
+
+
 # --- Tests ----------------------------------------------------------------
 
 
@@ -120,7 +221,7 @@ def test_missing_url_or_token_does_not_start(caplog):
 
 
 def test_initial_state_sends_hello_snapshot_and_frames():
-    ingestion.parsed_data["Basketball"] = {"home_score": "10", "away_score": "5"}
+    _publish("Basketball", {"home_score": "10", "away_score": "5"})
     ingestion._clock_snapshots["Basketball"] = {
         "game_clock": "8:23",
         "shot_clock": "14",
@@ -134,20 +235,19 @@ def test_initial_state_sends_hello_snapshot_and_frames():
     }
 
     ws = FakeWS()
-    relay = cloud_relay.CloudRelay(
-        config=_enabled_config(),
-        ws_factory=_make_factory(ws),
-    )
-
-    relay._connect_and_pump_init = relay._send_initial_state  # readability
+    relay = cloud_relay.CloudRelay(config=_enabled_config())
+    endpoint = _endpoint(relay)
     # Drive the handshake without entering the poll loop.
-    relay._send_hello(ws)
-    relay._send_initial_state(ws)
+    endpoint._send_hello(ws)
+    relay._send_initial_state([endpoint])
+    _flush(endpoint, ws)
 
     types = [f["type"] for f in ws.sent]
     assert types[0] == "hello"
     assert ws.sent[0]["publisher"] == "onprem-test"
     assert ws.sent[0]["version"] == cloud_relay.PROTOCOL_VERSION
+    assert ws.sent[0]["max_version"] == cloud_relay.DELTA_PROTOCOL_VERSION
+    assert ws.sent[0]["features"] == ["batch", "zlib"]
 
     snapshot = next(f for f in ws.sent if f["type"] == "snapshot")
     assert snapshot["state"]["Basketball"] == {"home_score": "10", "away_score": "5"}
@@ -170,19 +270,21 @@ def test_initial_state_sends_hello_snapshot_and_frames():
 
 
 def test_tick_only_sends_changed_frames():
-    ingestion.parsed_data["Basketball"] = {"home_score": "10"}
+    _publish("Basketball", {"home_score": "10"})
     ws = FakeWS()
-    relay = cloud_relay.CloudRelay(config=_enabled_config(), ws_factory=_make_factory(ws))
-    relay._send_initial_state(ws)
+    relay = cloud_relay.CloudRelay(config=_enabled_config())
+    endpoint = _endpoint(relay)
+    relay._send_initial_state([endpoint])
+    _flush(endpoint, ws)
     initial = len(ws.sent)
 
     # No state change → tick emits nothing.
-    relay._tick(ws)
+    _tick(relay, endpoint, ws)
     assert len(ws.sent) == initial
 
     # Change one sport → exactly one new frame.
-    ingestion.parsed_data["Basketball"] = {"home_score": "11"}
-    relay._tick(ws)
+    _publish("Basketball", {"home_score": "11"})
+    _tick(relay, endpoint, ws)
     assert len(ws.sent) == initial + 1
     assert ws.sent[-1] == {
         "type": "sport",
@@ -191,44 +293,123 @@ def test_tick_only_sends_changed_frames():
     }
 
     # Tick again with no changes → still nothing.
-    relay._tick(ws)
+    _tick(relay, endpoint, ws)
     assert len(ws.sent) == initial + 1
 
 
-def test_full_run_loop_with_injected_sleep():
-    """Drive the relay through one connect → one tick → stop."""
-    ingestion.parsed_data["Basketball"] = {"home_score": "1"}
+def test_store_writes_announce_their_keys():
+    changes = store_changes.subscribe()
+    try:
+        ingestion.record_packet("Basketball", {"home_score": "1"}, "src1")
+        ingestion.record_packet("Basketball", {"home_score": "2"}, "src1")
+        keys = changes.wait(0)
+        assert {("sport", "Basketball"), ("sources", None)} <= keys
+        assert all(sport in ("Basketball", None) for _kind, sport in keys)
+        assert changes.wait(0) == set()
+    finally:
+        changes.close()
+
+
+def test_closing_subscription_wakes_waiter():
+    changes = store_changes.subscribe()
+    woke = threading.Event()
+
+    def waiter():
+        changes.wait(5)
+        woke.set()
+
+    thread = threading.Thread(target=waiter)
+    thread.start()
+    changes.close()
+    thread.join(timeout=2)
+    assert woke.is_set()
+    assert changes.closed
+    store_changes.publish("sport", "Basketball")  # no longer delivered
+    assert changes.wait(0) == set()
+
+
+def test_run_loop_sends_announced_changes():
+    """Connect → snapshot → a published change is sent without polling."""
+    _publish("Basketball", {"home_score": "1"})
     ws = FakeWS()
-    relay = cloud_relay.CloudRelay(
-        config=_enabled_config(),
-        ws_factory=_make_factory(ws),
-    )
-
-    sleep_calls = {"n": 0}
-
-    def fake_sleep(_secs):
-        sleep_calls["n"] += 1
-        if sleep_calls["n"] == 1:
-            # First sleep: let the tick run, then mutate state for it.
-            ingestion.parsed_data["Basketball"] = {"home_score": "2"}
-            return False  # don't stop
-        relay._stop.set()
-        return True  # stop
-
-    relay._sleep = fake_sleep
-    relay._run()
+    relay = cloud_relay.CloudRelay(config=_enabled_config(), ws_factory=_make_factory(ws))
+    relay.start()
+    try:
+        assert _wait_for(lambda: any(f["type"] == "snapshot" for f in ws.sent))
+        _publish("Basketball", {"home_score": "2"})
+        assert _wait_for(
+            lambda: any(f["type"] == "sport" and f["state"] == {"home_score": "2"} for f in ws.sent)
+        )
+    finally:
+        relay.stop()
 
     types = [f["type"] for f in ws.sent]
     assert types.count("hello") == 1
     assert types.count("snapshot") == 1
-    # The post-snapshot tick should have caught the score bump.
-    sport_frames = [f for f in ws.sent if f["type"] == "sport"]
-    assert any(f["state"] == {"home_score": "2"} for f in sport_frames)
     assert ws.closed is True
 
 
+def test_idle_relay_does_not_resample():
+    ws = FakeWS()
+    relay = cloud_relay.CloudRelay(config=_enabled_config(), ws_factory=_make_factory(ws))
+    ticks = []
+    real_tick = relay._tick
+    relay._tick = lambda keys=None: (ticks.append(keys), real_tick(keys))
+    relay.start()
+    try:
+        assert _wait_for(lambda: any(f["type"] == "snapshot" for f in ws.sent))
+        time.sleep(0.3)  # many poll intervals
+        assert ticks == []
+        _publish("Hockey", {"home_score": "3"})
+        assert _wait_for(lambda: ticks)
+        assert ticks[0] == {("sport", "Hockey")}
+    finally:
+        relay.stop()
+
+
+def test_unannounced_change_is_caught_by_resync():
+    ingestion.parsed_data["Basketball"] = Snapshot({"home_score": "1"}, next(_versions))
+    ws = FakeWS()
+    relay = cloud_relay.CloudRelay(
+        config=_enabled_config(cloud_relay_resync_interval=0.1),
+        ws_factory=_make_factory(ws),
+    )
+    relay.start()
+    try:
+        assert _wait_for(lambda: any(f["type"] == "snapshot" for f in ws.sent))
+        ingestion.parsed_data["Basketball"] = Snapshot({"home_score": "5"}, next(_versions))
+        assert _wait_for(
+            lambda: any(f["type"] == "sport" and f["state"] == {"home_score": "5"} for f in ws.sent)
+        )
+    finally:
+        relay.stop()
+
+
+def test_sources_refresh_is_throttled():
+    ingestion.record_packet("Basketball", {"home_score": "1"}, "src1")
+    ws = FakeWS()
+    relay = cloud_relay.CloudRelay(
+        config=_enabled_config(cloud_relay_poll_interval=0.3),
+        ws_factory=_make_factory(ws),
+    )
+    relay.start()
+    try:
+        assert _wait_for(lambda: any(f["type"] == "snapshot" for f in ws.sent))
+        for n in range(20):
+            ingestion.record_packet("Basketball", {"home_score": str(n)}, "src1")
+        assert _wait_for(
+            lambda: any(f["type"] == "sport" and f["state"]["home_score"] == "19" for f in ws.sent)
+        )
+        time.sleep(0.15)
+        # Only the connect-time list so far: refreshes wait for the interval.
+        assert [f["type"] for f in ws.sent].count("sources") == 1
+        assert _wait_for(lambda: [f["type"] for f in ws.sent].count("sources") == 2)
+    finally:
+        relay.stop()
+
+
 def test_reconnect_after_disconnect():
-    ingestion.parsed_data["Basketball"] = {"home_score": "1"}
+    _publish("Basketball", {"home_score": "1"})
     ws1 = FakeWS()
     ws1._send_raises_after = 1  # disconnect right after `hello`
     ws2 = FakeWS()
@@ -238,19 +419,12 @@ def test_reconnect_after_disconnect():
         config=_enabled_config(),
         ws_factory=factory,
     )
-
-    sleep_calls = {"n": 0}
-
-    def fake_sleep(_secs):
-        sleep_calls["n"] += 1
+    relay.start()
+    try:
         # After the second connect's handshake completes, stop.
-        if ws2.sent and any(f["type"] == "snapshot" for f in ws2.sent):
-            relay._stop.set()
-            return True
-        return False
-
-    relay._sleep = fake_sleep
-    relay._run()
+        assert _wait_for(lambda: any(f["type"] == "snapshot" for f in ws2.sent))
+    finally:
+        relay.stop()
 
     assert len(factory.calls) == 2
     # Second socket must have received a fresh hello + snapshot.
@@ -258,10 +432,411 @@ def test_reconnect_after_disconnect():
     assert "hello" in types
     assert "snapshot" in types
     # Auth header carried the configured token.
-    assert all(token == "secret" for _url, token in factory.calls)
+    assert all(token == "secret" for _url, token, _name in factory.calls)
 
 
 def test_send_serializes_frame():
     ws = FakeWS()
-    cloud_relay.CloudRelay._send(ws, {"type": "ping", "ts": 1.5})
+    cloud_relay._Endpoint._send(ws, {"type": "ping", "ts": 1.5})
     assert ws.sent == [{"type": "ping", "ts": 1.5}]
+
+
+# --- Protocol version 2 ---------------------------------------------------
+
+
+def test_changed_paths_descends_into_dicts_and_same_length_lists():
+    old = {"a": 1, "teams": [{"h": "1"}, {"h": "2"}], "gone": 0, "list": [1, 2]}
+    new = {"a": 1, "teams": [{"h": "1"}, {"h": "3"}], "list": [1, 2, 3], "added": True}
+    assert set(changed_paths(old, new)) == {
+        ("teams", 1, "h"),
+        ("gone",),
+        ("list",),
+        ("added",),
+    }
+    assert list(changed_paths(old, old)) == []
+    assert list(changed_paths({"a": 1}, [1])) == [()]
+
+
+def test_delta_applies_to_base_and_to_every_inflight_value():
+    base = {"clock": "10:00", "score": "0", "fouls": "1", "players": [{"h": "0"}]}
+    sent = [
+        {"clock": "9:59", "score": "2", "fouls": "1", "players": [{"h": "1"}]},
+        {"clock": "9:58", "score": "2", "fouls": "2", "players": [{"h": "1"}], "extra": 1},
+    ]
+    value = {"clock": "9:57", "score": "0", "fouls": "2", "players": [{"h": "1"}]}
+    set_ops, unset_ops = make_delta(base, sent, value)
+    # "score" went back to the base value but the edge may hold a "2".
+    assert [["score"], "0"] in set_ops
+    assert unset_ops == [["extra"]]
+    for held in [base] + sent:
+        assert apply_delta(held, set_ops, unset_ops) == value
+
+    assert make_delta(base, [], dict(base)) == ([], [])
+    assert make_delta(base, [], ["not", "a", "dict"]) is None
+
+
+def _v2_relay(**overrides):
+    relay = cloud_relay.CloudRelay(config=_enabled_config(**overrides))
+    endpoint = _endpoint(relay)
+    endpoint._handle_edge_frame({"type": "hello", "version": 2})
+    return relay, endpoint
+
+
+def test_v2_sends_keyframe_then_delta_against_acked_base():
+    relay, endpoint = _v2_relay()
+    ws = FakeWS()
+    key = ("sport", "Basketball")
+    _publish("Basketball", {"home_score": "10", "away_score": "5", "game_clock": "8:00"})
+    _tick(relay, endpoint, ws, {key})
+    keyframe = ws.sent[-1]
+    assert keyframe["type"] == "sport" and keyframe["seq"] == 1
+    endpoint._handle_edge_frame({"type": "ack", "seq": 1})
+
+    _publish("Basketball", {"home_score": "10", "away_score": "5", "game_clock": "7:59"})
+    _tick(relay, endpoint, ws, {key})
+    assert ws.sent[-1] == {
+        "type": "delta", "kind": "sport", "sport": "Basketball",
+        "seq": 2, "base": 1, "set": [[["game_clock"], "7:59"]],
+    }
+
+    # Not acknowledged yet: the next delta is still against seq 1 and
+    # repeats the clock change alongside the new score.
+    _publish("Basketball", {"home_score": "12", "away_score": "5", "game_clock": "7:58"})
+    _tick(relay, endpoint, ws, {key})
+    delta = ws.sent[-1]
+    assert delta["base"] == 1 and delta["seq"] == 3
+    assert sorted(delta["set"]) == [[["game_clock"], "7:58"], [["home_score"], "12"]]
+
+
+def test_v2_keyframe_every_n_frames():
+    relay, endpoint = _v2_relay(cloud_relay_keyframe_every=2)
+    ws = FakeWS()
+    for n in range(5):
+        _publish("Basketball", {"home_score": str(n), "away_score": "0"})
+        _tick(relay, endpoint, ws, {("sport", "Basketball")})
+        endpoint._handle_edge_frame({"type": "ack", "seq": n + 1})
+    assert [f["type"] for f in ws.sent] == ["sport", "delta", "sport", "delta", "sport"]
+
+
+def test_v1_edge_keeps_full_frames():
+    ws = FakeWS()
+    relay = cloud_relay.CloudRelay(config=_enabled_config(), ws_factory=_make_factory(ws))
+    relay.start()
+    try:
+        assert _wait_for(lambda: any(f["type"] == "snapshot" for f in ws.sent))
+        for n in range(3):
+            _publish("Basketball", {"home_score": str(n), "away_score": "0"})
+        assert _wait_for(lambda: any(f.get("state", {}).get("home_score") == "2" for f in ws.sent))
+    finally:
+        relay.stop()
+    assert not any("seq" in f or f["type"] == "delta" for f in ws.sent)
+
+
+def test_v2_edge_mirror_matches_store():
+    ws = FakeWS(edge_version=2)
+    relay = cloud_relay.CloudRelay(config=_enabled_config(), ws_factory=_make_factory(ws))
+    endpoint = relay._endpoints[0]
+    relay.start()
+    try:
+        assert _wait_for(lambda: endpoint._protocol == 2)
+        for n in range(20):
+            _publish("Basketball", {"home_score": str(n // 5), "away_score": "0", "game_clock": f"9:{59 - n}"})
+            _wait_for(lambda: endpoint._last_sent.get(("sport", "Basketball")) == ingestion.parsed_data["Basketball"].version)
+        assert _wait_for(lambda: _mirror(ws.sent)[("sport", "Basketball")] == ingestion.get_sport_data("Basketball"))
+    finally:
+        relay.stop()
+    assert any(f["type"] == "delta" for f in ws.sent)
+
+
+def test_edge_resync_resends_full_state():
+    ws = FakeWS(edge_version=2)
+    relay = cloud_relay.CloudRelay(config=_enabled_config(), ws_factory=_make_factory(ws))
+    endpoint = relay._endpoints[0]
+    _publish("Basketball", {"home_score": "1"})
+    relay.start()
+    try:
+        assert _wait_for(lambda: endpoint._protocol == 2)
+        ws.push({"type": "resync"})
+        assert _wait_for(lambda: [f["type"] for f in ws.sent].count("snapshot") == 2)
+        assert endpoint._streams == {}
+    finally:
+        relay.stop()
+
+
+# --- Batches and compression ----------------------------------------------
+
+
+def test_queued_frames_go_out_as_one_batch_when_edge_accepts_batches():
+    relay = cloud_relay.CloudRelay(config=_enabled_config())
+    endpoint = _endpoint(relay)
+    endpoint._handle_edge_frame({"type": "hello", "version": 1, "features": ["batch", "bogus"]})
+    assert endpoint._features == {"batch"}
+    ws = FakeWS()
+    _publish("Basketball", {"home_score": "1"})
+    _publish("Hockey", {"home_score": "2"})
+    relay._tick({("sport", "Basketball"), ("sport", "Hockey")})
+    assert ws.messages == []
+    _flush(endpoint, ws)
+    assert ws.messages == [(False, ws.messages[0][1])]
+    assert [(f["type"], f["sport"]) for f in ws.sent] == [("sport", "Basketball"), ("sport", "Hockey")]
+
+    # A single frame goes out as itself.
+    _publish("Hockey", {"home_score": "3"})
+    _tick(relay, endpoint, ws, {("sport", "Hockey")})
+    assert len(ws.messages) == 2 and ws.sent[-1]["state"] == {"home_score": "3"}
+
+
+def test_frames_share_one_zlib_stream_when_edge_accepts_zlib():
+    relay = cloud_relay.CloudRelay(config=_enabled_config())
+    endpoint = _endpoint(relay)
+    endpoint._handle_edge_frame({"type": "hello", "version": 1, "features": ["zlib"]})
+    ws = FakeWS()
+    statcrew.statcrew_data["Baseball"] = Snapshot({f"stat_{n}": "0" for n in range(100)}, 1)
+    _tick(relay, endpoint, ws, {("statcrew", "Baseball")})
+    for n in range(5):
+        _publish("Basketball", {"home_score": str(n), "game_clock": "10:00"})
+        _tick(relay, endpoint, ws, {("sport", "Basketball")})
+    assert all(binary for binary, _size in ws.messages)
+    large = ws.messages[0][1]
+    assert large < len(json.dumps(ws.sent[0])) / 4
+    # Later frames reuse the stream's history and shrink further.
+    assert ws.messages[-1][1] < ws.messages[1][1] < len(json.dumps(ws.sent[1]))
+    assert ws.sent[-1]["state"] == {"home_score": "4", "game_clock": "10:00"}
+
+
+def test_features_off_when_not_configured_or_not_accepted():
+    relay = cloud_relay.CloudRelay(
+        config=_enabled_config(cloud_relay_batch=False, cloud_relay_compress=False)
+    )
+    endpoint = relay._endpoints[0]
+    ws = FakeWS()
+    endpoint._send_hello(ws)
+    assert ws.sent[0]["features"] == []
+    endpoint._handle_edge_frame({"type": "hello", "version": 2, "features": ["batch", "zlib"]})
+    assert endpoint._features == frozenset()
+
+
+def test_connect_waits_for_edge_hello_before_snapshot():
+    ws = FakeWS(edge_version=2, features=["batch", "zlib"])
+    statcrew.statcrew_data["Baseball"] = Snapshot({f"stat_{n}": "0" for n in range(500)}, 1)
+    _publish("Basketball", {"home_score": "1"})
+    relay = cloud_relay.CloudRelay(
+        config=_enabled_config(cloud_relay_hello_timeout=2.0), ws_factory=_make_factory(ws)
+    )
+    relay.start()
+    try:
+        assert _wait_for(lambda: any(f["type"] == "sources" for f in ws.sent))
+    finally:
+        relay.stop()
+    # hello, then the whole initial state as one compressed batch.
+    assert [binary for binary, _size in ws.messages] == [False, True]
+    assert [f["type"] for f in ws.sent[1:]] == ["snapshot", "statcrew", "sources"]
+
+
+# --- Send queue -----------------------------------------------------------
+
+
+class SlowWS(FakeWS):
+    """A socket on a slow uplink: every send takes *delay* seconds."""
+
+    def __init__(self, delay, **kwargs):
+        super().__init__(**kwargs)
+        self.delay = delay
+
+    def send(self, frame: str) -> None:
+        time.sleep(self.delay)
+        super().send(frame)
+
+
+def test_outbox_keeps_latest_frame_per_key():
+    stats = cloud_relay._SendStats()
+    outbox = cloud_relay._Outbox(8, stats)
+    outbox.put(("sport", "Basketball"), {"n": 1})
+    outbox.put(("sport", "Hockey"), {"n": 2})
+    first_queued = outbox._frames[("sport", "Basketball")][1]
+    outbox.put(("sport", "Basketball"), {"n": 3})
+    entries = outbox.take(0)
+    # The newer frame replaced the older one and moved behind Hockey.
+    assert [frame for frame, _queued_at in entries] == [{"n": 2}, {"n": 3}]
+    assert entries[1][1] == first_queued
+    assert stats.coalesced == 1 and stats.max_depth == 2
+    assert outbox.take(0) == []
+
+
+def test_full_outbox_refuses_new_key_without_waiting():
+    stats = cloud_relay._SendStats()
+    outbox = cloud_relay._Outbox(1, stats)
+    assert outbox.put(("sport", "Basketball"), {"n": 1})
+    assert outbox.put(("sport", "Basketball"), {"n": 2})  # coalesces
+    assert not outbox.put(("sport", "Hockey"), {"n": 3})
+    assert stats.dropped == 1
+    assert [frame for frame, _queued_at in outbox.take(0)] == [{"n": 2}]
+
+
+def test_dropped_frame_requests_full_sync():
+    relay = cloud_relay.CloudRelay(config=_enabled_config())
+    endpoint = _endpoint(relay)
+    endpoint._outbox = cloud_relay._Outbox(1, endpoint._send_stats)
+    endpoint._emit(("sport", "Basketball"), {"n": 1})
+    assert not endpoint.take_sync()
+    endpoint._emit(("sport", "Hockey"), {"n": 2})
+    assert endpoint.take_sync()
+    assert endpoint.stats()["dropped"] == 1
+
+
+def test_queue_size_below_key_count_is_raised():
+    ws = FakeWS()
+    relay = cloud_relay.CloudRelay(
+        config=_enabled_config(cloud_relay_queue_size=1), ws_factory=_make_factory(ws)
+    )
+    relay.start()
+    try:
+        assert _wait_for(lambda: relay._endpoints[0]._outbox is not None)
+        assert relay._endpoints[0]._outbox._maxsize == cloud_relay.MIN_QUEUE_SIZE
+    finally:
+        relay.stop()
+
+
+def test_slow_uplink_coalesces_without_stalling_sampling():
+    ws = SlowWS(0.1)
+    _publish("Basketball", {"home_score": "0"})
+    relay = cloud_relay.CloudRelay(config=_enabled_config(), ws_factory=_make_factory(ws))
+    relay.start()
+    try:
+        assert _wait_for(lambda: any(f["type"] == "sources" for f in ws.sent))
+        for n in range(1, 11):
+            _publish("Basketball", {"home_score": str(n)})
+            time.sleep(0.01)
+        # The sampler keeps up while the writer is still sending.
+        latest = ingestion.parsed_data["Basketball"].version
+        endpoint = relay._endpoints[0]
+        assert _wait_for(lambda: endpoint._last_sent.get(("sport", "Basketball")) == latest, timeout=0.5)
+        assert _wait_for(
+            lambda: any(f["type"] == "sport" and f["state"] == {"home_score": "10"} for f in ws.sent)
+        )
+        [stats] = relay.stats()["endpoints"]
+    finally:
+        relay.stop()
+
+    scores = [f["state"]["home_score"] for f in ws.sent if f["type"] == "sport"]
+    assert len(scores) < 10 and scores == sorted(scores, key=int)
+    assert stats["connected"] and stats["coalesced"] >= 1
+    assert stats["frames_sent"] == len(ws.sent) - 1  # all but hello
+    assert stats["send_latency_ms"]["max"] >= 100
+
+
+def test_failed_send_ends_the_connection():
+    ws1 = FakeWS()
+    ws1._send_raises_after = 3  # hello, snapshot, sources
+    ws2 = FakeWS()
+    relay = cloud_relay.CloudRelay(config=_enabled_config(), ws_factory=_make_factory(ws1, ws2))
+    relay.start()
+    try:
+        assert _wait_for(lambda: any(f["type"] == "sources" for f in ws1.sent))
+        _publish("Basketball", {"home_score": "9"})  # the writer fails on this one
+        assert _wait_for(lambda: any(f["type"] == "snapshot" for f in ws2.sent))
+    finally:
+        relay.stop()
+    assert ws1.closed
+    assert [f["type"] for f in ws1.sent] == ["hello", "snapshot", "sources"]
+
+
+# --- Several endpoints ----------------------------------------------------
+
+
+def _endpoint_factory(sockets):
+    """Factory that returns ``sockets[url]``, or raises when that entry
+    is an exception, recording every URL it was asked for."""
+    calls: list[str] = []
+
+    def factory(url: str, token: str, publisher_name: str = ""):
+        calls.append(url)
+        target = sockets[url]
+        if isinstance(target, Exception):
+            raise target
+        return target
+
+    factory.calls = calls  # type: ignore[attr-defined]
+    return factory
+
+
+def test_endpoint_settings_split_urls_and_tokens():
+    cfg = _enabled_config(cloud_relay_url="ws://a/ws, ws://b/ws,", cloud_relay_token="shared")
+    assert cloud_relay._endpoint_settings(cfg) == (["ws://a/ws", "ws://b/ws"], ["shared", "shared"])
+    cfg = replace(cfg, cloud_relay_token="one,two")
+    assert cloud_relay._endpoint_settings(cfg) == (["ws://a/ws", "ws://b/ws"], ["one", "two"])
+
+    relay = cloud_relay.CloudRelay(config=replace(cfg, cloud_relay_token="one,two,three"))
+    relay.start()
+    assert relay._thread is None
+
+
+def test_endpoints_share_one_sampler_with_their_own_protocol(monkeypatch):
+    v1, v2 = FakeWS(), FakeWS(edge_version=2)
+    factory = _endpoint_factory({"ws://primary/ws": v1, "ws://backup/ws": v2})
+    sampled = []
+    real_sample = cloud_relay._sample
+    monkeypatch.setattr(cloud_relay, "_sample", lambda key: (sampled.append(key), real_sample(key))[1])
+    _publish("Basketball", {"home_score": "0", "away_score": "0"})
+    relay = cloud_relay.CloudRelay(
+        config=_enabled_config(
+            cloud_relay_url="ws://primary/ws,ws://backup/ws", cloud_relay_token="p,b",
+            cloud_relay_hello_timeout=0.3,  # the v1 edge never answers
+        ),
+        ws_factory=factory,
+    )
+    relay.start()
+    try:
+        primary, backup = relay._endpoints
+        assert _wait_for(lambda: primary.connected and backup._protocol == 2)
+        assert _wait_for(lambda: all(any(f["type"] == "snapshot" for f in ws.sent) for ws in (v1, v2)))
+        for n in range(1, 6):
+            _publish("Basketball", {"home_score": str(n), "away_score": "0"})
+            version = ingestion.parsed_data["Basketball"].version
+            assert _wait_for(lambda: all(
+                e._last_sent.get(("sport", "Basketball")) == version for e in (primary, backup)
+            ))
+        expected = ingestion.get_sport_data("Basketball")
+        assert _wait_for(lambda: _mirror(v1.sent)[("sport", "Basketball")] == expected)
+        assert _wait_for(lambda: _mirror(v2.sent)[("sport", "Basketball")] == expected)
+    finally:
+        relay.stop()
+
+    # Each write was read once, whatever the number of endpoints.
+    assert sampled.count(("sport", "Basketball")) == 5
+    assert not any(f["type"] == "delta" for f in v1.sent)
+    assert any(f["type"] == "delta" for f in v2.sent)
+    assert [f["type"] for f in v1.sent].count("hello") == 1
+    assert [f["type"] for f in v2.sent].count("hello") == 1
+
+
+def test_failing_endpoint_does_not_hold_up_the_others():
+    up = FakeWS()
+    factory = _endpoint_factory({
+        "ws://down/ws": ConnectionError("edge unreachable"),
+        "ws://up/ws": up,
+    })
+    relay = cloud_relay.CloudRelay(
+        config=_enabled_config(
+            cloud_relay_url="ws://down/ws,ws://up/ws",
+            cloud_relay_reconnect_min=0.01,
+            cloud_relay_reconnect_max=0.05,
+        ),
+        ws_factory=factory,
+    )
+    relay.start()
+    try:
+        assert _wait_for(lambda: any(f["type"] == "snapshot" for f in up.sent))
+        _publish("Basketball", {"home_score": "7"})
+        assert _wait_for(
+            lambda: any(f["type"] == "sport" and f["state"] == {"home_score": "7"} for f in up.sent)
+        )
+        # The dead edge keeps retrying on its own backoff.
+        assert _wait_for(lambda: factory.calls.count("ws://down/ws") >= 3)
+        stats = {s["url"]: s for s in relay.stats()["endpoints"]}
+    finally:
+        relay.stop()
+
+    assert factory.calls.count("ws://up/ws") == 1
+    assert stats["ws://up/ws"]["connected"] and not stats["ws://down/ws"]["connected"]
+    assert stats["ws://down/ws"]["frames_sent"] == 0
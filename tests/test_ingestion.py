@@ -1,7 +1,18 @@
+import json
+import random
+import selectors
+import socket
+import threading
 import time
+import tracemalloc
+from collections import deque
+
+import pytest
 
 from website import ingestion
+from website.udp_batch import DatagramReceiver
 from website.protocol import (
+    BulkPacketStreamParser,
     STX,
     CR,
     TP_VOLLEYBALL,
@@ -20,11 +31,20 @@ def _reset_ingestion_state():
         ingestion.parsed_data_by_source.clear()
         ingestion.last_seen_by_source.clear()
         ingestion._auto_sticky_source.clear()
+        ingestion._sources_by_freshness.clear()
         ingestion._clock_snapshots.clear()
         ingestion._clock_seq = 0
+        ingestion._frame_stats_by_source.clear()
+        ingestion._change_journal.clear()
+        ingestion._journal_seq = 0
+        ingestion._data_versions.clear()
+        ingestion._json_cache.clear()
+    ingestion._clock_channels = ingestion._UpdateChannels()
+    ingestion._journal_channels = ingestion._UpdateChannels()
     ingestion.reset_baseball_state()
     with ingestion.data_sources_lock:
         ingestion.data_sources.clear()
+    ingestion._override_index = {}
     with ingestion._sse_connection_lock:
         ingestion._sse_connection_count = 0
 
@@ -123,6 +143,7 @@ class TestHandleSerialPacket:
                     "sport_overrides": {"Lacrosse": "Gymnastics"},
                 }
             )
+        ingestion.data_sources_changed()
 
         pkt = [0x30] * LAX_LEN
         pkt[0] = STX
@@ -134,6 +155,213 @@ class TestHandleSerialPacket:
         assert gym.get("game_clock") is not None
         assert ingestion.get_sport_data("Lacrosse") == {}
 
+    def test_override_lookup_does_not_take_data_sources_lock(self):
+        with ingestion.data_sources_lock:
+            ingestion.data_sources.append(
+                {
+                    "id": "tcp:10.0.0.9:9999",
+                    "name": "Gym Venue",
+                    "host": "10.0.0.9",
+                    "port": 9999,
+                    "enabled": True,
+                    "sport_overrides": {"Lacrosse": "Gymnastics"},
+                }
+            )
+        ingestion.data_sources_changed()
+        assert ingestion._get_source_override("tcp:10.0.0.9:9999", "Lacrosse") == "Gymnastics"
+
+        pkt = [0x30] * LAX_LEN
+        pkt[0], pkt[1], pkt[-1] = STX, TP_LACROSSE_FH, CR
+        with ingestion.data_sources_lock:  # e.g. an admin request mid-edit
+            reader = threading.Thread(
+                target=ingestion.handle_serial_packet,
+                args=(pkt,),
+                kwargs={"source_id": "tcp:10.0.0.9:9999"},
+            )
+            reader.start()
+            reader.join(timeout=2)
+            assert not reader.is_alive()
+        assert ingestion.get_sport_data("Gymnastics").get("game_clock") is not None
+
+
+def _basketball_frame(home_score_ones=ord("0")):
+    pkt = [0x30] * BBALL_LEN
+    pkt[0] = STX
+    pkt[1] = TP_BBALL_BASE_SOFT
+    pkt[8] = home_score_ones
+    pkt[-1] = CR
+    return bytes(pkt)
+
+
+class TestDuplicateFrames:
+    def setup_method(self):
+        _reset_ingestion_state()
+
+    def _count_decodes(self, monkeypatch):
+        calls = []
+        real = ingestion.identify_and_parse
+
+        def counting(packet):
+            calls.append(packet)
+            return real(packet)
+
+        monkeypatch.setattr(ingestion, "identify_and_parse", counting)
+        return calls
+
+    def test_identical_frame_skips_decode_and_bumps_timestamps(self, monkeypatch):
+        calls = self._count_decodes(monkeypatch)
+        frame = _basketball_frame()
+        ingestion.handle_serial_packet(frame, source_id="src:A")
+        first = ingestion.get_sport_data("Basketball", source_id="src:A")
+
+        with ingestion.parsed_data_lock:
+            ingestion.last_seen_by_source["src:A"] -= 5
+        ingestion.handle_serial_packet(frame, source_id="src:A")
+
+        assert len(calls) == 1
+        second = ingestion.get_sport_data("Basketball", source_id="src:A")
+        assert second["_meta"]["received_at"] >= first["_meta"]["received_at"]
+        assert ingestion.last_seen_by_source["src:A"] == second["_meta"]["received_at"]
+        # The copy handed out earlier is not mutated underneath the reader.
+        assert first["_meta"] is not second["_meta"]
+        assert {k: v for k, v in second.items() if k != "_meta"} == {
+            k: v for k, v in first.items() if k != "_meta"
+        }
+
+    def test_duplicate_publishes_new_snapshot(self):
+        frame = _basketball_frame()
+        ingestion.handle_serial_packet(frame, source_id="src:A")
+        published = ingestion.parsed_data_by_source["src:A"]["Basketball"]
+        meta = published["_meta"]
+        ingestion.handle_serial_packet(frame, source_id="src:A")
+        # Lock-free readers may still be holding the old snapshot.
+        assert published["_meta"] is meta
+        assert ingestion.parsed_data_by_source["src:A"]["Basketball"] is not published
+        assert ingestion.parsed_data["Basketball"] is ingestion.parsed_data_by_source["src:A"]["Basketball"]
+
+    def test_changed_frame_is_decoded(self, monkeypatch):
+        calls = self._count_decodes(monkeypatch)
+        ingestion.handle_serial_packet(_basketball_frame(ord("1")), source_id="src:A")
+        ingestion.handle_serial_packet(_basketball_frame(ord("2")), source_id="src:A")
+        assert len(calls) == 2
+        assert ingestion.get_sport_data("Basketball")["home_score"] == "02"
+
+    def test_frame_stats_count_decoded_and_deduplicated(self):
+        frame = _basketball_frame()
+        for _ in range(3):
+            ingestion.handle_serial_packet(frame, source_id="src:A")
+        ingestion.handle_serial_packet(frame, source_id="src:B")
+        stats = ingestion.get_frame_stats()
+        assert stats["src:A"] == {"decoded": 1, "deduplicated": 2}
+        assert stats["src:B"] == {"decoded": 1, "deduplicated": 0}
+
+    def test_duplicate_restores_global_latest(self):
+        frame_a = _basketball_frame(ord("1"))
+        ingestion.handle_serial_packet(frame_a, source_id="src:A")
+        ingestion.record_packet("Basketball", {"home_score": "99"}, "src:B")
+        ingestion.handle_serial_packet(frame_a, source_id="src:A")
+        assert ingestion.parsed_data["Basketball"]["_meta"]["source"] == "src:A"
+
+    def test_override_change_invalidates_cache(self, monkeypatch):
+        with ingestion.data_sources_lock:
+            ingestion.data_sources.append(
+                {
+                    "id": "tcp:10.0.0.9:9999",
+                    "name": "Gym Venue",
+                    "host": "10.0.0.9",
+                    "port": 9999,
+                    "enabled": True,
+                    "sport_overrides": {},
+                }
+            )
+        pkt = [0x30] * LAX_LEN
+        pkt[0] = STX
+        pkt[1] = TP_LACROSSE_FH
+        pkt[-1] = CR
+
+        ingestion.handle_serial_packet(pkt, source_id="tcp:10.0.0.9:9999")
+        assert ingestion.get_sport_data("Lacrosse")
+
+        with ingestion.data_sources_lock:
+            ingestion.data_sources[0]["sport_overrides"] = {"Lacrosse": "Gymnastics"}
+        ingestion.data_sources_changed()
+
+        ingestion.handle_serial_packet(pkt, source_id="tcp:10.0.0.9:9999")
+        assert ingestion.get_sport_data("Gymnastics").get("game_clock") is not None
+
+    def test_baseball_reset_forces_decode(self, monkeypatch):
+        calls = self._count_decodes(monkeypatch)
+        frame = _basketball_frame()
+        ingestion.handle_serial_packet(frame, source_id="src:A")
+        ingestion.reset_baseball_state()
+        ingestion.handle_serial_packet(frame, source_id="src:A")
+        assert len(calls) == 2
+
+
+class TestChangeJournal:
+    def setup_method(self):
+        _reset_ingestion_state()
+
+    def test_first_packet_journals_all_fields(self):
+        ingestion.record_packet("Hockey", {"home_score": "1", "period": "1"}, "src:A")
+        entries, latest, complete = ingestion.get_changes_since(0)
+        assert complete is True
+        assert latest == 1
+        assert len(entries) == 1
+        assert entries[0]["seq"] == 1
+        assert entries[0]["source"] == "src:A"
+        assert entries[0]["sport"] == "Hockey"
+        assert entries[0]["changes"] == {"home_score": "1", "period": "1"}
+        assert entries[0]["removed"] == []
+
+    def test_only_changed_fields_are_journaled(self):
+        ingestion.record_packet("Hockey", {"home_score": "1", "period": "1"}, "src:A")
+        ingestion.record_packet("Hockey", {"home_score": "2", "period": "1"}, "src:A")
+        entries, latest, _ = ingestion.get_changes_since(1)
+        assert latest == 2
+        assert [e["changes"] for e in entries] == [{"home_score": "2"}]
+
+    def test_unchanged_packet_adds_no_entry(self):
+        ingestion.record_packet("Hockey", {"home_score": "1"}, "src:A")
+        ingestion.record_packet("Hockey", {"home_score": "1"}, "src:A")
+        assert ingestion.get_journal_seq() == 1
+
+    def test_removed_fields_are_reported(self):
+        ingestion.record_packet("Hockey", {"home_score": "1", "error": "x"}, "src:A")
+        ingestion.record_packet("Hockey", {"home_score": "1"}, "src:A")
+        entries, _, _ = ingestion.get_changes_since(1)
+        assert entries[0]["changes"] == {}
+        assert entries[0]["removed"] == ["error"]
+
+    def test_diff_is_per_source(self):
+        ingestion.record_packet("Hockey", {"home_score": "1"}, "src:A")
+        ingestion.record_packet("Hockey", {"home_score": "1"}, "src:B")
+        entries, _, _ = ingestion.get_changes_since(0, source_id="src:B")
+        assert [e["changes"] for e in entries] == [{"home_score": "1"}]
+
+    def test_filter_by_sport(self):
+        ingestion.record_packet("Hockey", {"home_score": "1"}, "src:A")
+        ingestion.record_packet("Soccer", {"home_score": "3"}, "src:A")
+        entries, latest, _ = ingestion.get_changes_since(0, sport="Soccer")
+        assert latest == 2
+        assert [e["sport"] for e in entries] == ["Soccer"]
+
+    def test_evicted_entries_mark_incomplete(self, monkeypatch):
+        monkeypatch.setattr(ingestion, "_change_journal", deque(maxlen=3))
+        for score in range(6):
+            ingestion.record_packet("Hockey", {"home_score": str(score)}, "src:A")
+        _, latest, complete = ingestion.get_changes_since(1)
+        assert latest == 6
+        assert complete is False
+        entries, _, complete = ingestion.get_changes_since(3)
+        assert complete is True
+        assert [e["seq"] for e in entries] == [4, 5, 6]
+
+    def test_future_seq_is_incomplete(self):
+        ingestion.record_packet("Hockey", {"home_score": "1"}, "src:A")
+        _, _, complete = ingestion.get_changes_since(50)
+        assert complete is False
+
 
 # --- Baseball inning state machine tests ---
 
@@ -157,6 +385,424 @@ def _base_baseball(outs="0", away_innings=None, home_innings=None):
     }
 
 
+class TestSportDataJson:
+    def setup_method(self):
+        _reset_ingestion_state()
+
+    def test_matches_get_sport_data(self):
+        ingestion.record_packet("Hockey", {"home_score": "1", "period": "2"}, "src:A")
+        body = ingestion.get_sport_data_json("Hockey")
+        assert body.endswith(b"\n")
+        assert json.loads(body) == ingestion.get_sport_data("Hockey")
+
+    def test_encoded_once_per_snapshot(self):
+        ingestion.record_packet("Hockey", {"home_score": "1"}, "src:A")
+        first = ingestion.get_sport_data_json("Hockey")
+        assert ingestion.get_sport_data_json("Hockey") is first
+        assert ingestion.get_sport_data_json("Hockey", source_id="src:A") is first
+
+    def test_replaced_snapshot_is_reencoded(self):
+        ingestion.record_packet("Hockey", {"home_score": "1"}, "src:A")
+        first = ingestion.get_sport_data_json("Hockey")
+        ingestion.record_packet("Hockey", {"home_score": "2"}, "src:A")
+        assert json.loads(ingestion.get_sport_data_json("Hockey"))["home_score"] == "2"
+        assert ingestion.get_sport_data_json("Hockey") is not first
+
+    def test_unknown_source_is_not_cached(self):
+        assert ingestion.get_sport_data_json("Hockey", source_id="nope") == b"{}\n"
+        assert ("nope", "Hockey") not in ingestion._json_cache._entries
+
+
+class TestSnapshots:
+    def setup_method(self):
+        _reset_ingestion_state()
+
+    def test_get_sport_data_returns_stored_snapshot(self):
+        ingestion.record_packet("Hockey", {"home_score": "1"}, "src:A")
+        data = ingestion.get_sport_data("Hockey")
+        assert data is ingestion.get_sport_data("Hockey", source_id="src:A")
+        assert data.version == ingestion.get_sport_data_version("Hockey")
+        ingestion.record_packet("Hockey", {"home_score": "2"}, "src:A")
+        assert ingestion.get_sport_data("Hockey").version > data.version
+        assert data["home_score"] == "1"
+
+    def test_snapshot_is_read_only(self):
+        ingestion.record_packet("Hockey", {"home_score": "1"}, "src:A")
+        data = ingestion.get_sport_data("Hockey")
+        with pytest.raises(TypeError):
+            data["home_score"] = "9"
+        with pytest.raises(TypeError):
+            data.update(home_score="9")
+        with pytest.raises(TypeError):
+            del data["_meta"]
+        copy = dict(data)
+        copy["home_score"] = "9"
+        assert ingestion.get_sport_data("Hockey")["home_score"] == "1"
+
+    def test_empty_sport_and_clock_versions(self):
+        empty = ingestion.get_sport_data("Hockey")
+        assert empty == {} and empty.version == 0
+        ingestion.record_packet("Basketball", {"game_clock": "5:00"}, "src:A")
+        clock = ingestion.get_clock_snapshot("Basketball")
+        assert clock.version == clock["_seq"] == ingestion.get_clock_seq()
+
+
+class TestCompactRecords:
+    def setup_method(self):
+        _reset_ingestion_state()
+
+    def test_per_source_records_have_no_instance_dict(self):
+        ingestion.record_packet("Baseball", _base_baseball(), "src:A")
+        ingestion.handle_serial_packet(_basketball_frame(), source_id="src:A")
+        records = [
+            ingestion._baseball_states["src:A"],
+            ingestion._frame_stats_by_source["src:A"],
+            ingestion._change_journal[-1],
+            ingestion._UdpPeer(("10.0.0.1", 5000)),
+            ingestion._TcpClient({"id": "tcp:x", "host": "10.0.0.1", "port": 1}),
+            BulkPacketStreamParser(),
+        ]
+        for record in records:
+            assert not hasattr(record, "__dict__"), type(record).__name__
+
+    def test_public_projections_are_dicts(self):
+        ingestion.handle_serial_packet(_basketball_frame(), source_id="src:A")
+        assert ingestion.get_frame_stats() == {"src:A": {"decoded": 1, "deduplicated": 0}}
+        (entry,), _, _ = ingestion.get_changes_since(0)
+        assert set(entry) == {"seq", "source", "sport", "changes", "removed", "received_at"}
+        assert json.loads(json.dumps(entry))["source"] == "src:A"
+
+
+class TestTcpClientMux:
+    def setup_method(self):
+        _reset_ingestion_state()
+        self.server = socket.create_server(("127.0.0.1", 0))
+        self.server.settimeout(5)
+        self.port = self.server.getsockname()[1]
+        self.source_id = f"tcp:127.0.0.1:{self.port}"
+
+    def teardown_method(self):
+        ingestion.stop_tcp_client(self.source_id)
+        self.server.close()
+
+    def _wait_for(self, predicate, timeout=5.0):
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            if predicate():
+                return True
+            time.sleep(0.01)
+        return False
+
+    def _start(self):
+        ingestion.start_tcp_client(
+            {"id": self.source_id, "host": "127.0.0.1", "port": self.port}
+        )
+        conn, _ = self.server.accept()
+        return conn
+
+    def test_frames_are_recorded_under_source_id(self):
+        conn = self._start()
+        frame = _basketball_frame(ord("7"))
+        conn.sendall(frame[:10])
+        conn.sendall(frame[10:])
+        assert self._wait_for(
+            lambda: ingestion.get_sport_data("Basketball", self.source_id)
+        )
+        conn.close()
+
+    def test_stop_closes_connection(self):
+        conn = self._start()
+        ingestion.stop_tcp_client(self.source_id)
+        conn.settimeout(2)
+        assert conn.recv(1) == b""
+        assert self.source_id not in ingestion._tcp_clients.source_ids()
+        conn.close()
+
+    def test_reconnects_after_disconnect(self, monkeypatch):
+        monkeypatch.setattr(ingestion, "_TCP_BACKOFF_MIN", 0.05)
+        conn = self._start()
+        conn.close()
+        again, _ = self.server.accept()
+        again.sendall(_basketball_frame())
+        assert self._wait_for(
+            lambda: ingestion.get_sport_data("Basketball", self.source_id)
+        )
+        again.close()
+
+    def test_bad_host_does_not_stop_other_sources(self):
+        bad_id = "tcp:bad-host"
+        # An over-long DNS label makes getaddrinfo raise UnicodeError.
+        ingestion.start_tcp_client({"id": bad_id, "host": "a" * 64 + ".example", "port": 1})
+        try:
+            conn = self._start()
+            conn.sendall(_basketball_frame())
+            assert self._wait_for(
+                lambda: ingestion.get_sport_data("Basketball", self.source_id)
+            )
+            assert ingestion._tcp_clients._thread.is_alive()
+            started = time.monotonic()
+            ingestion.stop_tcp_client(bad_id)
+            assert time.monotonic() - started < 1.0
+            conn.close()
+        finally:
+            ingestion.stop_tcp_client(bad_id)
+
+    def test_stop_skips_event_already_selected(self, capsys):
+        # Drive a private mux by hand so the stop command and the
+        # stopped client's read event land in the same select() batch.
+        mux = ingestion._TcpClientMux()
+        mux._selector = selectors.DefaultSelector()
+        mux._wake_r, mux._wake_w = socket.socketpair()
+        mux._wake_r.setblocking(False)
+        mux._selector.register(mux._wake_r, selectors.EVENT_READ, None)
+        try:
+            mux._commands.append(
+                ("start", {"id": self.source_id, "host": "127.0.0.1", "port": self.port}, None)
+            )
+            mux._drain_commands()
+            conn, _ = self.server.accept()
+            client = mux._clients[self.source_id]
+            while not client.connected:
+                mux._run_once()
+            conn.sendall(_basketball_frame())
+            done = threading.Event()
+            mux._commands.append(("stop", self.source_id, done))
+            mux._wake_w.send(b"\0")
+            select = mux._selector.select
+
+            def wake_first(timeout=None):
+                events = []
+                while len(events) < 2:
+                    events = select(1.0)
+                return sorted(events, key=lambda event: event[0].data is not None)
+
+            mux._selector.select = wake_first
+            capsys.readouterr()
+            mux._run_once()
+            assert done.is_set()
+            assert "TCP error" not in capsys.readouterr().out
+            conn.close()
+        finally:
+            mux._wake_r.close()
+            mux._wake_w.close()
+
+    def test_many_sources_share_one_thread(self):
+        before = threading.active_count()
+        ids = [f"tcp:127.0.0.1:{self.port}:{n}" for n in range(2, 12)]
+        for sid in ids:
+            ingestion.start_tcp_client({"id": sid, "host": "127.0.0.1", "port": self.port})
+        conns = [self.server.accept()[0] for _ in ids]
+        assert threading.active_count() <= before + 1
+        for sid in ids:
+            ingestion.stop_tcp_client(sid)
+        for conn in conns:
+            conn.close()
+
+
+class TestUdpPeers:
+    def test_interleaved_senders_keep_separate_buffers(self):
+        peers = ingestion._UdpPeers()
+        a, b = ("10.0.0.1", 5000), ("10.0.0.2", 5000)
+        frame_a, frame_b = _basketball_frame(ord("1")), _basketball_frame(ord("2"))
+        assert peers.feed(a, frame_a[:10]) == ("udp:10.0.0.1:5000", [])
+        assert peers.feed(b, frame_b[:12]) == ("udp:10.0.0.2:5000", [])
+        assert peers.feed(a, frame_a[10:]) == ("udp:10.0.0.1:5000", [frame_a])
+        assert peers.feed(b, frame_b[12:]) == ("udp:10.0.0.2:5000", [frame_b])
+        stats = peers.stats()["peers"]
+        assert stats["udp:10.0.0.1:5000"] == {"frames": 1, "resyncs": 0}
+        assert stats["udp:10.0.0.2:5000"] == {"frames": 1, "resyncs": 0}
+
+    def test_cap_evicts_least_recently_heard(self):
+        peers = ingestion._UdpPeers(max_peers=2)
+        for port in (1, 2, 1, 3):
+            peers.feed(("10.0.0.1", port), b"\x02")
+        stats = peers.stats()
+        assert set(stats["peers"]) == {"udp:10.0.0.1:1", "udp:10.0.0.1:3"}
+        assert stats["evicted"] == 1
+
+    def test_expire_drops_idle_peers(self, monkeypatch):
+        peers = ingestion._UdpPeers(idle_timeout=10)
+        peers.feed(("10.0.0.1", 1), b"")
+        now = time.monotonic()
+        monkeypatch.setattr(ingestion.time, "monotonic", lambda: now + 5)
+        peers.feed(("10.0.0.1", 2), b"")
+        monkeypatch.setattr(ingestion.time, "monotonic", lambda: now + 12)
+        peers.expire()
+        assert set(peers.stats()["peers"]) == {"udp:10.0.0.1:2"}
+
+    def test_counts_resyncs_per_peer(self):
+        peers = ingestion._UdpPeers()
+        frame = _basketball_frame()
+        peers.feed(("10.0.0.1", 1), frame[:6] + b"\x10" + frame)
+        assert peers.stats()["peers"]["udp:10.0.0.1:1"] == {"frames": 1, "resyncs": 1}
+
+
+class TestDatagramReceiver:
+    def setup_method(self):
+        self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.sock.bind(("127.0.0.1", 0))
+        self.sender = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+
+    def teardown_method(self):
+        self.sock.close()
+        self.sender.close()
+
+    def test_drains_queued_datagrams_in_one_batch(self):
+        receiver = DatagramReceiver(self.sock, slot_size=64, max_batch=8)
+        for n in range(5):
+            self.sender.sendto(b"frame%d" % n, self.sock.getsockname())
+        time.sleep(0.05)
+        batch = receiver.receive(1.0)
+        assert [bytes(data) for data, _addr in batch] == [b"frame%d" % n for n in range(5)]
+        assert batch[0][1][1] == self.sender.getsockname()[1]
+        assert (receiver.batches, receiver.datagrams) == (1, 5)
+        receiver.close()
+
+    def test_batch_size_is_capped_and_timeout_returns_empty(self):
+        receiver = DatagramReceiver(self.sock, slot_size=64, max_batch=2)
+        for n in range(3):
+            self.sender.sendto(b"x", self.sock.getsockname())
+        time.sleep(0.05)
+        assert len(receiver.receive(1.0)) == 2
+        assert len(receiver.receive(1.0)) == 1
+        assert receiver.receive(0.01) == []
+        receiver.close()
+
+
+class TestZeroCopyReceive:
+    """The TCP readers receive into a preallocated buffer, so a read costs
+    the frames it yields, not a fresh ``recv`` bytes object."""
+
+    def _allocated_per_mb(self, read, chunks):
+        a, b = socket.socketpair()
+        total = 0
+        tracemalloc.start()
+        try:
+            for chunk in chunks:
+                a.sendall(chunk)
+                tracemalloc.reset_peak()
+                before, _ = tracemalloc.get_traced_memory()
+                read(b)
+                total += tracemalloc.get_traced_memory()[1] - before
+        finally:
+            tracemalloc.stop()
+            a.close()
+            b.close()
+        return total * (1 << 20) / sum(len(chunk) for chunk in chunks)
+
+    def _compare(self, monkeypatch, read):
+        monkeypatch.setattr(ingestion, "handle_serial_packet", lambda packet, source_id=None: None)
+        chunks = [_basketball_frame()] * 2000  # one frame per read, as controllers send
+        parser = BulkPacketStreamParser()
+        legacy = self._allocated_per_mb(lambda sock: parser.feed_bytes(sock.recv(4096)), chunks)
+        current = self._allocated_per_mb(read, chunks)
+        assert current < legacy / 2
+
+    def test_tcp_server_read(self, monkeypatch):
+        server = ingestion._TcpServer(0)
+        state = ["tcp:test", BulkPacketStreamParser(), 0.0]
+        self._compare(monkeypatch, lambda sock: server._read(sock, state))
+
+    def test_tcp_client_read(self, monkeypatch):
+        mux = ingestion._TcpClientMux()
+        client = ingestion._TcpClient({"id": "tcp:test", "host": "127.0.0.1", "port": 1})
+        client.connected = True
+
+        def read(sock):
+            client.sock = sock
+            mux._read(client)
+
+        self._compare(monkeypatch, read)
+
+
+class TestTcpServer:
+    def setup_method(self):
+        _reset_ingestion_state()
+        self.stop = threading.Event()
+        self.clients = []
+
+    def teardown_method(self):
+        self.stop.set()
+        self.thread.join(timeout=3)
+        for conn in self.clients:
+            conn.close()
+
+    def _serve(self, **limits):
+        self.server = ingestion._TcpServer(0, **limits)
+        self.server.bind()
+        self.thread = threading.Thread(target=self.server.serve, args=(self.stop,))
+        self.thread.start()
+
+    def _connect(self):
+        conn = socket.create_connection(("127.0.0.1", self.server.port), timeout=2)
+        self.clients.append(conn)
+        return conn
+
+    def _wait_for(self, predicate, timeout=5.0):
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            if predicate():
+                return True
+            time.sleep(0.01)
+        return False
+
+    def test_frames_recorded_and_peak_tracked(self):
+        self._serve()
+        before = threading.active_count()
+        first, second = self._connect(), self._connect()
+        first.sendall(_basketball_frame())
+        source_id = "tcp:127.0.0.1:%d" % first.getsockname()[1]
+        assert self._wait_for(lambda: ingestion.get_sport_data("Basketball", source_id))
+        assert self._wait_for(lambda: self.server.stats()["connections"] == 2)
+        assert threading.active_count() == before
+        second.close()
+        assert self._wait_for(lambda: self.server.stats()["connections"] == 1)
+        assert self.server.stats()["peak"] == 2
+
+    def test_connections_over_cap_are_rejected(self):
+        self._serve(max_connections=1)
+        self._connect()
+        assert self._wait_for(lambda: self.server.stats()["connections"] == 1)
+        extra = self._connect()
+        assert extra.recv(1) == b""
+        assert self.server.stats()["rejected"] == 1
+
+    def test_idle_peer_is_dropped(self):
+        self._serve(idle_timeout=0.2)
+        conn = self._connect()
+        assert conn.recv(1) == b""
+        assert self.server.stats()["idle_closed"] == 1
+
+    def test_unterminated_frame_over_buffer_limit_is_dropped(self):
+        self._serve(max_buffer=64)
+        conn = self._connect()
+        conn.sendall(bytes([0x02, 0x74]) + b"0" * 200)
+        assert conn.recv(1) == b""
+        assert self.server.stats()["overflow_closed"] == 1
+
+    def test_handler_error_drops_only_that_peer(self, monkeypatch):
+        real_handle = ingestion.handle_serial_packet
+        bad_source = []
+
+        def handle(packet, source_id=None):
+            if source_id in bad_source:
+                raise ValueError("malformed frame")
+            real_handle(packet, source_id=source_id)
+
+        monkeypatch.setattr(ingestion, "handle_serial_packet", handle)
+        self._serve()
+        bad, good = self._connect(), self._connect()
+        bad_source.append("tcp:127.0.0.1:%d" % bad.getsockname()[1])
+        assert self._wait_for(lambda: self.server.stats()["connections"] == 2)
+        bad.sendall(_basketball_frame())
+        assert bad.recv(1) == b""
+        good.sendall(_basketball_frame())
+        source_id = "tcp:127.0.0.1:%d" % good.getsockname()[1]
+        assert self._wait_for(lambda: ingestion.get_sport_data("Basketball", source_id))
+        assert self.thread.is_alive()
+        assert self.server.stats()["connections"] == 1
+
+
 class TestBaseballInningStateMachine:
     def setup_method(self):
         _reset_ingestion_state()
@@ -365,6 +1011,38 @@ class TestAutoSourceStickiness:
         assert bball["_meta"]["source"] == "src:A"
         assert lax["_meta"]["source"] == "src:B"
 
+    def test_sticky_read_does_not_take_lock(self):
+        ingestion.record_packet("Basketball", {"home_score": "10"}, "src:A")
+        assert ingestion.get_sport_data("Basketball")["home_score"] == "10"
+
+        results = []
+        with ingestion.parsed_data_lock:
+            reader = threading.Thread(
+                target=lambda: results.append(
+                    (
+                        ingestion.get_sport_data_version("Basketball"),
+                        ingestion.get_sport_data("Basketball"),
+                        ingestion.get_sport_data_json("Basketball"),
+                        ingestion.get_sources_snapshot(),
+                    )
+                )
+            )
+            reader.start()
+            reader.join(timeout=2)
+            assert not reader.is_alive()
+        version, data, body, sources = results[0]
+        assert version and data["home_score"] == "10"
+        assert json.loads(body)["home_score"] == "10"
+        assert [s["source"] for s in sources] == ["src:A"]
+
+    def test_relocking_after_stale_takes_lock_path(self):
+        ingestion.record_packet("Basketball", {"home_score": "10"}, "src:A")
+        ingestion.get_sport_data("Basketball")
+        ingestion.last_seen_by_source["src:A"] = time.time() - 30
+        ingestion.record_packet("Basketball", {"home_score": "20"}, "src:B")
+        assert ingestion.get_sport_data("Basketball")["home_score"] == "20"
+        assert ingestion._auto_sticky_source["Basketball"] == "src:B"
+
     def test_single_source_no_issue(self):
         """With only one source, stickiness is transparent."""
         ingestion.record_packet("Basketball", {"home_score": "10"}, "src:only")
@@ -376,6 +1054,79 @@ class TestAutoSourceStickiness:
         assert result2["home_score"] == "15"
 
 
+def _scan_freshest(sport):
+    """The pre-index selection: scan every source for the newest timestamp."""
+    best_sid, best_ts = None, 0
+    for sid, src_data in ingestion.parsed_data_by_source.items():
+        if sport in src_data:
+            ts = ingestion.last_seen_by_source.get(sid, 0)
+            if ts > best_ts:
+                best_sid, best_ts = sid, ts
+    return best_sid
+
+
+class TestFreshestSourceIndex:
+    def setup_method(self):
+        _reset_ingestion_state()
+
+    def test_matches_scan_with_many_sources(self, monkeypatch):
+        clock = [1000.0]
+        monkeypatch.setattr(ingestion.time, "time", lambda: clock[0])
+        rng = random.Random(7)
+        sports = ["Basketball", "Hockey", "Lacrosse"]
+        for _ in range(2000):
+            clock[0] += 0.001
+            sid = f"src:{rng.randrange(250)}"
+            ingestion.record_packet(rng.choice(sports), {"home_score": str(rng.randrange(99))}, sid)
+            sport = rng.choice(sports)
+            with ingestion.parsed_data_lock:
+                assert ingestion._freshest_source_locked(sport) == _scan_freshest(sport)
+
+    def test_write_to_one_sport_refreshes_source_for_all(self):
+        ingestion.record_packet("Basketball", {"home_score": "1"}, "src:A")
+        ingestion.record_packet("Hockey", {"home_score": "2"}, "src:A")
+        ingestion.record_packet("Basketball", {"home_score": "3"}, "src:B")
+        ingestion.record_packet("Hockey", {"home_score": "4"}, "src:A")
+        with ingestion.parsed_data_lock:
+            assert ingestion._freshest_source_locked("Basketball") == "src:A"
+
+    def test_duplicate_frame_refreshes_order(self):
+        frame = _basketball_frame()
+        ingestion.handle_serial_packet(frame, source_id="src:A")
+        ingestion.record_packet("Basketball", {"home_score": "9"}, "src:B")
+        ingestion.handle_serial_packet(frame, source_id="src:A")
+        with ingestion.parsed_data_lock:
+            assert ingestion._freshest_source_locked("Basketball") == "src:A"
+
+    def test_purge_removes_source(self):
+        for n in range(50):
+            ingestion.record_packet("Basketball", {"home_score": str(n)}, f"src:{n}")
+        with ingestion.parsed_data_lock:
+            ingestion.last_seen_by_source["src:49"] -= 2 * ingestion._STALE_TTL
+        ingestion.purge_stale_sources()
+        with ingestion.parsed_data_lock:
+            assert ingestion._freshest_source_locked("Basketball") == "src:48"
+            assert len(ingestion._sources_by_freshness["Basketball"]) == 49
+
+    def test_sticky_ttl_with_many_sources(self):
+        ingestion.record_packet("Basketball", {"home_score": "0"}, "src:sticky")
+        assert ingestion.get_sport_data("Basketball")["_meta"]["source"] == "src:sticky"
+        for n in range(200):
+            ingestion.record_packet("Basketball", {"home_score": str(n)}, f"src:{n}")
+
+        with ingestion.parsed_data_lock:
+            ingestion.last_seen_by_source["src:sticky"] = (
+                time.time() - ingestion._AUTO_STICKY_TTL + 1
+            )
+        assert ingestion.get_sport_data("Basketball")["_meta"]["source"] == "src:sticky"
+
+        with ingestion.parsed_data_lock:
+            ingestion.last_seen_by_source["src:sticky"] = (
+                time.time() - ingestion._AUTO_STICKY_TTL - 0.01
+            )
+        assert ingestion.get_sport_data("Basketball")["_meta"]["source"] == "src:199"
+
+
 class TestOrdinal:
     def test_ordinals(self):
         assert ingestion._ordinal(1) == "1st"
@@ -448,3 +1199,67 @@ class TestClockPubSub:
         # Release one and try again
         ingestion.sse_connection_release()
         assert ingestion.sse_connection_acquire() is True
+
+
+class TestUpdateChannels:
+    def setup_method(self):
+        _reset_ingestion_state()
+
+    def _clock(self, sport, value, source="t"):
+        ingestion.record_packet(sport, {"game_clock": value, "period": "1"}, source)
+
+    def test_other_sport_does_not_wake_subscriber(self):
+        woke = []
+        waiter = threading.Thread(
+            target=lambda: woke.append(
+                ingestion.wait_for_clock_update("Hockey", 0, timeout=0.3)
+            )
+        )
+        waiter.start()
+        time.sleep(0.05)
+        self._clock("Soccer", "10:00")
+        waiter.join()
+        assert woke == [0]
+
+    def test_update_wakes_subscriber(self):
+        woke = []
+        waiter = threading.Thread(
+            target=lambda: woke.append(
+                ingestion.wait_for_clock_update("Hockey", 0, timeout=5.0)
+            )
+        )
+        waiter.start()
+        time.sleep(0.05)
+        self._clock("Hockey", "10:00")
+        waiter.join()
+        assert woke == [ingestion.get_clock_seq()]
+
+    def test_update_before_wait_is_not_missed(self):
+        self._clock("Hockey", "10:00")
+        seq = ingestion.wait_for_clock_update("Hockey", 0, timeout=0.1)
+        self._clock("Hockey", "9:59")
+        start = time.monotonic()
+        assert ingestion.wait_for_clock_update("Hockey", seq, timeout=5.0) > seq
+        assert time.monotonic() - start < 1.0
+
+    def test_source_channels(self):
+        self._clock("Hockey", "10:00", source="src:A")
+        seq_a = ingestion.wait_for_clock_update("Hockey", 0, 0.1, source_id="src:A")
+        self._clock("Hockey", "5:00", source="src:B")
+        # src:A subscribers stay asleep; Auto subscribers see src:B's change.
+        assert ingestion.wait_for_clock_update(
+            "Hockey", seq_a, 0.1, source_id="src:A"
+        ) == seq_a
+        assert ingestion.wait_for_clock_update("Hockey", seq_a, 0.1) > seq_a
+
+    def test_journal_channel(self):
+        ingestion.record_packet("Baseball", {"outs": "0"}, "src:A")
+        seq = ingestion.get_journal_seq()
+        ingestion.record_packet("Softball", {"outs": "1"}, "src:A")
+        assert ingestion.wait_for_journal_update("Baseball", seq, 0.1) == seq
+        ingestion.record_packet("Baseball", {"outs": "1"}, "src:A")
+        assert ingestion.wait_for_journal_update("Baseball", seq, 0.1) > seq
+
+    def test_waiter_bookkeeping_is_dropped(self):
+        ingestion.wait_for_clock_update("Hockey", 0, timeout=0.01, source_id="x")
+        assert ingestion._clock_channels._waiters == {}
@@ -1,12 +1,12 @@
 from website.protocol import (
-    PacketStreamParser,
+    PacketStreamParser, BulkPacketStreamParser,
     STX, CR,
-    TP_BBALL_BASE_SOFT, TP_FOOTBALL, TP_VOLLEYBALL, TP_WRESTLING,
-    BBALL_LEN,
+    TP_BBALL_BASE_SOFT, TP_FOOTBALL, TP_VOLLEYBALL, TP_WRESTLING, TP_LACROSSE_FH,
+    BBALL_LEN, LAX_LEN, SOFT_LEN,
     _decode_score, _decode_clock,
     identify_and_parse,
     parse_basketball_data, parse_volleyball_data, parse_football_data,
-    parse_wrestling_data,
+    parse_wrestling_data, parse_lacrosse_data, parse_softball_data,
 )
 
 
@@ -217,3 +217,171 @@ class TestWrestlingParser:
         result = parse_wrestling_data(pkt)
         assert "error" not in result
         assert result["period"] == "OT"
+
+
+class TestBulkPacketStreamParser:
+    def _feed_both(self, data, chunk):
+        legacy = PacketStreamParser()
+        bulk = BulkPacketStreamParser()
+        legacy_out, bulk_out = [], []
+        for offset in range(0, len(data), chunk):
+            piece = bytes(data[offset:offset + chunk])
+            legacy_out += [bytes(p) for p in legacy.feed_bytes(piece)]
+            bulk_out += bulk.feed_bytes(piece)
+        return legacy_out, bulk_out
+
+    def test_single_complete_packet(self):
+        pkt = _make_packet(TP_VOLLEYBALL, 20)
+        result = BulkPacketStreamParser().feed_bytes(bytes(pkt))
+        assert result == [bytes(pkt)]
+
+    def test_split_delivery(self):
+        pkt = bytes(_make_packet(TP_VOLLEYBALL, 20))
+        parser = BulkPacketStreamParser()
+        assert parser.feed_bytes(pkt[:7]) == []
+        assert parser.feed_bytes(pkt[7:]) == [pkt]
+
+    def test_accepts_lists_and_memoryviews(self):
+        pkt = _make_packet(TP_FOOTBALL, 15)
+        parser = BulkPacketStreamParser()
+        assert parser.feed_bytes(pkt[:4]) == []
+        assert parser.feed_bytes(memoryview(bytes(pkt[4:]))) == [bytes(pkt)]
+
+    def test_invalid_type_byte_is_consumed(self):
+        # The second STX is eaten as a bad type byte, so the frame after
+        # it is not recognised -- same as the byte-at-a-time parser.
+        pkt = _make_packet(TP_FOOTBALL, 15)
+        data = [STX] + pkt
+        legacy, bulk = self._feed_both(data, len(data))
+        assert legacy == bulk == []
+
+    def test_control_byte_inside_frame_resyncs(self):
+        pkt = _make_packet(TP_FOOTBALL, 15)
+        broken = pkt[:5] + [0x10] + pkt[5:]
+        legacy, bulk = self._feed_both(broken + pkt, 4)
+        assert legacy == bulk == [bytes(pkt)]
+
+    def test_counts_resyncs(self):
+        pkt = _make_packet(TP_FOOTBALL, 15)
+        parser = BulkPacketStreamParser()
+        parser.feed_bytes(bytes([STX, 0x41] + pkt[:5] + [0x10] + pkt))
+        assert parser.resyncs == 2
+
+    def test_matches_legacy_parser_on_random_streams(self):
+        import random
+
+        rng = random.Random(1234)
+        alphabet = [STX, CR, TP_BBALL_BASE_SOFT, TP_FOOTBALL, 0x01, 0x10,
+                    0x30, 0x3A, 0x41, 0xB0, 0xFF]
+        for _ in range(500):
+            data = [rng.choice(alphabet) for _ in range(rng.randint(0, 200))]
+            legacy, bulk = self._feed_both(data, rng.randint(1, 40))
+            assert legacy == bulk
+
+    def test_memoryview_chunks_match_bytes_chunks(self):
+        import random
+
+        rng = random.Random(99)
+        alphabet = [STX, CR, TP_BBALL_BASE_SOFT, TP_FOOTBALL, 0x10, 0x30, 0xB0]
+        for _ in range(200):
+            data = bytes(rng.choice(alphabet) for _ in range(rng.randint(0, 200)))
+            chunk = rng.randint(1, 40)
+            scratch = memoryview(bytearray(chunk))
+            by_bytes, by_view = BulkPacketStreamParser(), BulkPacketStreamParser()
+            out_bytes, out_view = [], []
+            for offset in range(0, len(data), chunk):
+                piece = data[offset:offset + chunk]
+                out_bytes += by_bytes.feed_bytes(piece)
+                scratch[:len(piece)] = piece  # reused, like a receive buffer
+                out_view += by_view.feed_bytes(scratch[:len(piece)])
+            assert out_bytes == out_view
+            assert by_bytes.resyncs == by_view.resyncs
+
+
+class TestCompiledDecoders:
+    def _packet(self, packet_type, length, **bytes_at):
+        pkt = [0x30] * length
+        pkt[0] = STX
+        pkt[1] = packet_type
+        pkt[-1] = CR
+        for offset, value in bytes_at.items():
+            pkt[int(offset[1:])] = value
+        return bytes(pkt)
+
+    def test_clock_and_scores_match_scalar_helpers(self):
+        import random
+
+        rng = random.Random(99)
+        values = [0x30, 0x31, 0x35, 0x39, 0x3A, 0xB0, 0xB5, 0xBA]
+        for _ in range(2000):
+            b = [rng.choice(values) for _ in range(9)]
+            pkt = self._packet(
+                TP_BBALL_BASE_SOFT, BBALL_LEN,
+                b2=b[0], b3=b[1], b4=b[2], b5=b[3], b7=b[4], b8=b[5], b9=b[6], b10=b[7],
+            )
+            result = parse_basketball_data(pkt)
+            assert result["game_clock"] == _decode_clock(
+                b[0] & 0x7F, b[1] & 0x7F, b[2] & 0x7F, b[3]
+            )
+            assert result["home_score"] == _decode_score(b[4], b[5])
+            assert result["visitor_score"] == _decode_score(b[6], b[7])
+
+    def test_basketball_overtime_fouls_and_bonus(self):
+        pkt = self._packet(
+            TP_BBALL_BASE_SOFT, BBALL_LEN,
+            b6=ord("5"), b13=0x3B, b14=0x3A, b16=0x32, b17=0x3D, b18=0x3A,
+        )
+        result = parse_basketball_data(pkt)
+        assert result["period"] == "OT"
+        assert result["home_fouls"] == "10"
+        assert result["visitor_fouls"] == " "
+        assert result["home_bonus"] is True
+        assert result["visitor_bonus"] is False
+        assert result["visitor_20_tol"] == 3
+        assert result["possession"] == "visitor"
+        assert result["shot_clock"] == " 0"
+
+    def test_superscript_period_reports_parse_error(self):
+        pkt = self._packet(TP_BBALL_BASE_SOFT, BBALL_LEN, b6=0xB2)
+        result = parse_basketball_data(pkt)
+        assert result == {
+            "error": "Basketball parse error: invalid literal for int() with base 10: '²'"
+        }
+
+    def test_short_packet_reports_parse_error(self):
+        result = parse_softball_data(bytes([STX, TP_BBALL_BASE_SOFT, 0x30, CR]))
+        assert result == {"error": "Softball parse error: index out of range"}
+
+    def test_lacrosse_penalties(self):
+        pkt = self._packet(
+            TP_LACROSSE_FH, LAX_LEN,
+            b22=0x3A, b23=ord("7"), b24=ord("1") | 0x80, b25=ord("3") | 0x80, b26=0x3A,
+            b27=ord("2"), b28=ord("4"), b29=ord("0"), b30=ord("4"), b31=ord("5"),
+        )
+        result = parse_lacrosse_data(pkt)
+        assert result["home_penalties"] == [
+            {"player": " 7", "time": " 13:"},
+            {"player": "24", "time": " 0:45"},
+        ]
+
+    def test_softball_last_play_and_batting_team(self):
+        base = {"b2": ord("1"), "b28": ord("E"), "b29": ord("6")}
+        result = parse_softball_data(self._packet(TP_BBALL_BASE_SOFT, SOFT_LEN, **base))
+        assert result["batting_team"] == "TOP"
+        assert result["last_play"] == " E6"
+
+        hit = parse_softball_data(self._packet(TP_BBALL_BASE_SOFT, SOFT_LEN, b28=0x49))
+        assert hit["batting_team"] == "BOT"
+        assert hit["last_play"] == "  H"
+
+        none = parse_softball_data(self._packet(TP_BBALL_BASE_SOFT, SOFT_LEN, b28=0x3A))
+        assert none["last_play"] == "N/A"
+
+    def test_output_key_order_is_stable(self):
+        pkt = self._packet(TP_BBALL_BASE_SOFT, BBALL_LEN)
+        assert list(parse_basketball_data(pkt)) == [
+            "game_clock", "period", "home_score", "visitor_score",
+            "home_full_tol", "visitor_full_tol", "home_20_tol", "visitor_20_tol",
+            "home_fouls", "visitor_fouls", "shot_clock", "home_bonus",
+            "visitor_bonus", "possession",
+        ]
@@ -1,4 +1,9 @@
+import socket
+import threading
+
+from website import trackman
 from website.trackman import (
+    _ingest_batch,
     _parse_trackman_payload,
     _parse_trackman_json,
     normalize_sport,
@@ -122,3 +127,62 @@ class TestParseTrackmanJson:
 
     def test_invalid_json(self):
         assert _parse_trackman_json("not json") == []
+
+
+class TestIngestBatch:
+    def setup_method(self):
+        with trackman.trackman_lock:
+            trackman.trackman_data["Baseball"] = {}
+            trackman.trackman_debug["Baseball"] = {"raw": "", "error": ""}
+
+    def test_newest_valid_datagram_wins(self):
+        _ingest_batch("Baseball", 20998, [
+            b'{"Pitch": {"Speed": 80.0}}',
+            b'{"Pitch": {"Speed": 91.0}}',
+            b"garbage",
+        ])
+        assert trackman.get_data("Baseball")["pitch_speed"] == 91.0
+        assert trackman.trackman_debug["Baseball"] == {
+            "raw": "garbage",
+            "error": "unable to parse json",
+        }
+
+    def test_get_data_returns_published_snapshot(self):
+        _ingest_batch("Baseball", 20998, [b'{"Pitch": {"Speed": 80.0}}'])
+        data = trackman.get_data("Baseball")
+        assert data is trackman.get_data("Baseball")
+        assert data.version == trackman.get_data_version("Baseball")
+        _ingest_batch("Baseball", 20998, [b'{"Pitch": {"Speed": 81.0}}'])
+        assert trackman.get_data("Baseball").version == data.version + 1
+        assert data["pitch_speed"] == 80.0
+
+    def test_batch_without_supported_fields_keeps_data(self):
+        _ingest_batch("Baseball", 20998, [b'{"Pitch": {"Speed": 80.0}}'])
+        version = trackman.get_data_version("Baseball")
+        _ingest_batch("Baseball", 20998, [b"[]", b""])
+        assert trackman.get_data_version("Baseball") == version
+        assert trackman.get_data("Baseball")["pitch_speed"] == 80.0
+        assert trackman.trackman_debug["Baseball"]["error"] == "unable to parse json"
+
+    def test_listener_receives_datagrams(self):
+        probe = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        probe.bind(("127.0.0.1", 0))
+        port = probe.getsockname()[1]
+        probe.close()
+        stop = threading.Event()
+        thread = threading.Thread(
+            target=trackman.trackman_listener, args=("Baseball", port, stop)
+        )
+        thread.start()
+        try:
+            sender = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+            for _ in range(50):
+                sender.sendto(b'{"Pitch": {"Speed": 95.0}}', ("127.0.0.1", port))
+                if trackman.get_data("Baseball").get("pitch_speed") == 95.0:
+                    break
+                threading.Event().wait(0.05)
+            sender.close()
+            assert trackman.get_data("Baseball")["pitch_speed"] == 95.0
+        finally:
+            stop.set()
+            thread.join(timeout=3)
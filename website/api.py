@@ -2,11 +2,12 @@ import json
 import os
 import platform
 import string
+import time
 from functools import wraps
 
 from flask import Blueprint, Response, jsonify, request, stream_with_context
 
-from . import ingestion, statcrew, trackman, virtius
+from . import cloud_relay, ingestion, statcrew, trackman, virtius
 from .config import CONFIG
 
 api = Blueprint("api", __name__)
@@ -32,6 +33,35 @@ def require_auth(f):
     return decorated_function
 
 
+# --- Conditional GET for the polled data endpoints ---
+# ETags come from the stores' update counters, never from hashing the body.
+# The per-process prefix keeps tags handed out before a restart (when the
+# counters start over) from ever matching again.
+_ETAG_EPOCH = f"{os.getpid():x}.{int(time.time()):x}"
+
+
+def _conditional_json(version, build):
+    """Return ``build()``'s JSON tagged with *version*, or an empty 304 if
+    the client's ``If-None-Match`` already names it.  ``build`` may return
+    already encoded bytes (the stores' ``get_*_json`` accessors).
+
+    *version* must be read before ``build`` runs, so a concurrent update can
+    only leave the tag older than the body (costing one extra 200 later).
+    """
+    etag = f"{_ETAG_EPOCH}-{version}"
+    if request.if_none_match.contains_weak(etag):
+        response = Response(status=304)
+    else:
+        body = build()
+        if isinstance(body, bytes):
+            response = Response(body, mimetype="application/json")
+        else:
+            response = jsonify(body)
+    response.set_etag(etag, weak=True)
+    # Let browsers keep the body but revalidate it on every poll.
+    response.headers["Cache-Control"] = "no-cache"
+    return response
+
 
 def _path_allowed(path):
     """Return True if path is under one of the allowed browse roots (Linux only)."""
@@ -127,6 +157,7 @@ def data_sources_endpoint():
         }
         ingestion.data_sources.append(entry)
 
+    ingestion.data_sources_changed()
     ingestion._save_data_sources()
     ingestion.start_tcp_client(entry)
 
@@ -151,6 +182,7 @@ def data_source_item(source_id):
         if not removed:
             return jsonify({"error": "source not found"}), 404
 
+        ingestion.data_sources_changed()
         ingestion.stop_tcp_client(source_id)
         ingestion._save_data_sources()
         return jsonify({"status": "deleted", "source": removed})
@@ -225,6 +257,7 @@ def data_source_item(source_id):
     if not updated:
         return jsonify({"error": "source not found"}), 404
 
+    ingestion.data_sources_changed()
     if host_port_changed:
         ingestion.stop_tcp_client(old_source_id)
         if updated.get("enabled", True):
@@ -248,7 +281,22 @@ def get_available_com_ports():
 @api.route("/get_raw_data/<sport>", methods=["GET"])
 def get_raw_data(sport):
     source_id = request.args.get("source")
-    return jsonify(ingestion.get_sport_data(sport, source_id))
+    since = request.args.get("since")
+    if since is None:
+        return _conditional_json(
+            ingestion.get_sport_data_version(sport, source_id),
+            lambda: ingestion.get_sport_data_json(sport, source_id),
+        )
+
+    # Incremental mode: only what changed after the client's last ``seq``.
+    try:
+        since = int(since)
+    except ValueError:
+        return jsonify({"error": "invalid since"}), 400
+    changes = ingestion.get_sport_changes(sport, since, source_id)
+    if changes is None:
+        return Response(status=304)
+    return jsonify(changes)
 
 
 @api.route("/get_trackman_data/<sport>", methods=["GET"])
@@ -256,7 +304,10 @@ def get_trackman_data(sport):
     sport_name = trackman.normalize_sport(sport)
     if not sport_name:
         return jsonify({}), 404
-    return jsonify(trackman.get_data(sport_name))
+    return _conditional_json(
+        trackman.get_data_version(sport_name),
+        lambda: trackman.get_data_json(sport_name),
+    )
 
 
 @api.route("/get_trackman_debug/<sport>", methods=["GET"])
@@ -287,12 +338,32 @@ def get_virtius_data(sport):
     sport_name = virtius.normalize_sport(sport)
     if not sport_name:
         return jsonify({}), 404
-    return jsonify(virtius.get_data(sport_name))
+    return _conditional_json(
+        virtius.get_data_version(sport_name),
+        lambda: virtius.get_data_json(sport_name),
+    )
 
 
 @api.route("/get_sources", methods=["GET"])
 def get_sources():
-    return jsonify({"sources": ingestion.get_sources_snapshot()})
+    # ``age_seconds`` grows without any update, so the tag also rolls over
+    # every second to keep revalidated copies at most a second behind.
+    return _conditional_json(
+        f"{ingestion.get_sources_version()}.{int(time.time())}",
+        lambda: {"sources": ingestion.get_sources_snapshot()},
+    )
+
+
+@api.route("/get_frame_stats", methods=["GET"])
+def get_frame_stats():
+    return jsonify(
+        {
+            "sources": ingestion.get_frame_stats(),
+            "tcp_listener": ingestion.get_tcp_listener_stats(),
+            "udp_listener": ingestion.get_udp_listener_stats(),
+            "cloud_relay": cloud_relay.get_cloud_relay_stats(),
+        }
+    )
 
 
 @api.route("/sse/clock/<sport>")
@@ -311,7 +382,9 @@ def sse_clock(sport):
             # Send retry interval on first message (1s reconnect)
             yield "retry: 1000\n\n"
             while True:
-                new_seq = ingestion.wait_for_clock_update(last_seq, timeout=15.0)
+                new_seq = ingestion.wait_for_clock_update(
+                    sport, last_seq, timeout=15.0, source_id=source_id
+                )
                 if new_seq == last_seq:
                     yield ": keepalive\n\n"
                     continue
@@ -339,6 +412,59 @@ def sse_clock(sport):
     )
 
 
+@api.route("/sse/data/<sport>")
+def sse_data(sport):
+    """Stream a sport's full state, then only what changed.
+
+    Events: ``state`` carries ``{seq, full: true, data}`` (sent first, and
+    again whenever the client must resync, e.g. Auto mode switched sources);
+    ``delta`` carries ``{seq, full: false, changes, removed, _meta}`` as
+    returned by ``ingestion.get_sport_changes``.
+    """
+    if sport not in ingestion.SUPPORTED_SPORTS:
+        return jsonify({"error": "unsupported sport"}), 404
+
+    source_id = request.args.get("source") or None
+
+    if not ingestion.sse_connection_acquire():
+        return jsonify({"error": "Too many SSE connections"}), 503
+
+    def generate():
+        try:
+            since = 0
+            yield "retry: 1000\n\n"
+            while True:
+                latest = ingestion.get_journal_seq()
+                update = ingestion.get_sport_changes(sport, since, source_id)
+                if update is None:
+                    # Nothing for this sport up to ``latest``; skip past it.
+                    since = latest
+                else:
+                    since = update["seq"]
+                    event = "state" if update["full"] else "delta"
+                    yield f"event: {event}\ndata: {json.dumps(update)}\n\n"
+                # Also re-check on timeout: Auto mode may have to switch to
+                # another source without any new journal entry.
+                if ingestion.wait_for_journal_update(
+                    sport, since, timeout=15.0, source_id=source_id
+                ) <= since:
+                    yield ": keepalive\n\n"
+        except GeneratorExit:
+            pass
+        finally:
+            ingestion.sse_connection_release()
+
+    return Response(
+        stream_with_context(generate()),
+        mimetype="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "X-Accel-Buffering": "no",
+            "Connection": "keep-alive",
+        },
+    )
+
+
 @api.route("/statcrew_config/<sport>", methods=["GET", "POST"])
 @require_auth
 def statcrew_config_endpoint(sport):
@@ -359,12 +485,23 @@ def get_statcrew_data(sport):
     sport_name = statcrew.normalize_sport(sport)
     if not sport_name:
         return jsonify({}), 404
-    return jsonify(statcrew.get_data(sport_name))
+    return _conditional_json(
+        statcrew.get_data_version(sport_name),
+        lambda: statcrew.get_data_json(sport_name),
+    )
 
 
 @api.route("/get_gymnastics_data", methods=["GET"])
 def get_gymnastics_data():
     source_id = request.args.get("source")
+    version = "{}.{}".format(
+        ingestion.get_sport_data_version("Gymnastics", source_id),
+        virtius.get_data_version("Gymnastics"),
+    )
+    return _conditional_json(version, lambda: _gymnastics_payload(source_id))
+
+
+def _gymnastics_payload(source_id):
     oes = ingestion.get_sport_data("Gymnastics", source_id)
     virtius_data = virtius.get_data("Gymnastics")
 
@@ -386,15 +523,13 @@ def get_gymnastics_data():
         key = first_away.get("tricode") or first_away.get("name") or "Team"
         away_team_color = team_colors.get(key)
 
-    return jsonify(
-        {
-            "clock": oes.get("game_clock"),
-            "oes": oes,
-            "virtius": virtius_data,
-            "away_team_color": away_team_color,
-            "team_colors": team_colors,
-        }
-    )
+    return {
+        "clock": oes.get("game_clock"),
+        "oes": oes,
+        "virtius": virtius_data,
+        "away_team_color": away_team_color,
+        "team_colors": team_colors,
+    }
 
 
 def _list_windows_drives():
@@ -0,0 +1,592 @@
+"""Optional single-event-loop server for the read-only API and SSE streams.
+
+Off by default. Enabled by `ASYNC_SERVER=1` (see main.py). The threaded
+Werkzeug server pins every SSE client to a thread, which is why
+``ingestion.SSE_MAX_CONNECTIONS`` exists; here each stream is a coroutine
+on one asyncio loop, so thousands of displays cost a few KB each.
+
+``AsyncApp`` is a plain ASGI application:
+
+- The polled data endpoints and both SSE streams are served natively on
+  the loop, with the same bodies, ETags and events as the Flask routes.
+- Everything else (pages, config endpoints, ...) is handed to the Flask
+  WSGI app on a small thread pool.
+
+Ingestion keeps running on its own threads. ``_ChannelBridge`` subscribes
+to ingestion's update channels and wakes waiting coroutines through
+``loop.call_soon_threadsafe``.
+
+``serve()`` runs the app on a minimal stdlib HTTP/1.1 server, so no extra
+dependency is needed. Any ASGI server works as well:
+``uvicorn --factory website.async_server:create_asgi_app``.
+"""
+from __future__ import annotations
+
+import asyncio
+import http
+import io
+import json
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, AsyncIterator, Callable
+from urllib.parse import parse_qs, unquote
+
+from werkzeug.http import parse_etags, quote_etag
+
+from . import api, ingestion, statcrew, trackman, virtius
+from .config import CONFIG
+from .json_cache import encode_json
+
+SSE_KEEPALIVE = 15.0
+WSGI_WORKERS = 8
+MAX_HEADER_BYTES = 64 * 1024
+
+_SSE_HEADERS = [
+    (b"content-type", b"text/event-stream; charset=utf-8"),
+    (b"cache-control", b"no-cache"),
+    (b"x-accel-buffering", b"no"),
+]
+
+_PAYLOAD_STORES = {
+    "get_statcrew_data": statcrew,
+    "get_trackman_data": trackman,
+    "get_virtius_data": virtius,
+}
+
+
+class _ChannelBridge:
+    """Async view of an ``ingestion._UpdateChannels`` instance.
+
+    Publishes happen on ingestion threads; the registered listener only
+    schedules ``_wake`` on the loop. All waiters of a channel share one
+    wake-up, and each waiter costs a future plus a timer handle.
+    """
+
+    def __init__(self, channels, loop: asyncio.AbstractEventLoop):
+        self._channels = channels
+        self._loop = loop
+        self._waiters: dict[tuple, set[asyncio.Future]] = {}
+        channels.add_listener(self._on_publish)
+
+    def close(self) -> None:
+        self._channels.remove_listener(self._on_publish)
+
+    def _on_publish(self, sport: str, source_id: str | None) -> None:
+        try:
+            self._loop.call_soon_threadsafe(self._wake, sport, source_id)
+        except RuntimeError:
+            pass  # loop already closed
+
+    def _wake(self, sport: str, source_id: str | None) -> None:
+        for key in ((sport, source_id), (sport, None)):
+            for fut in self._waiters.pop(key, ()):
+                if not fut.done():
+                    fut.set_result(None)
+
+    async def wait(
+        self, sport: str, last_seq: int, timeout: float, source_id: str | None = None
+    ) -> int:
+        """Async twin of ``_UpdateChannels.wait``."""
+        key = (sport, source_id)
+        deadline = self._loop.time() + timeout
+        while True:
+            # Checked on the loop, and _wake runs on the loop: a publish
+            # either shows up in latest() here or wakes the future below.
+            seq = self._channels.latest(sport, source_id)
+            remaining = deadline - self._loop.time()
+            if seq > last_seq or remaining <= 0:
+                return seq
+            fut = self._loop.create_future()
+            self._waiters.setdefault(key, set()).add(fut)
+            timer = self._loop.call_later(remaining, _resolve, fut)
+            try:
+                await fut
+            finally:
+                timer.cancel()
+                waiters = self._waiters.get(key)
+                if waiters is not None:
+                    waiters.discard(fut)
+                    if not waiters:
+                        del self._waiters[key]
+
+
+def _resolve(fut: asyncio.Future) -> None:
+    if not fut.done():
+        fut.set_result(None)
+
+
+class AsyncApp:
+    """ASGI application: native read-only routes, WSGI fallback for the rest."""
+
+    def __init__(self, wsgi_app, max_sse: int | None = None):
+        self.wsgi_app = wsgi_app
+        self.max_sse = CONFIG.async_sse_max_connections if max_sse is None else max_sse
+        self.sse_connections = 0
+        self._executor = ThreadPoolExecutor(
+            max_workers=WSGI_WORKERS, thread_name_prefix="async-wsgi"
+        )
+        self._clock: _ChannelBridge | None = None
+        self._journal: _ChannelBridge | None = None
+
+    def _bridges(self) -> tuple[_ChannelBridge, _ChannelBridge]:
+        if self._clock is None:
+            loop = asyncio.get_running_loop()
+            self._clock = _ChannelBridge(ingestion._clock_channels, loop)
+            self._journal = _ChannelBridge(ingestion._journal_channels, loop)
+        return self._clock, self._journal
+
+    def close(self) -> None:
+        for bridge in (self._clock, self._journal):
+            if bridge is not None:
+                bridge.close()
+        self._clock = self._journal = None
+        self._executor.shutdown(wait=False)
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] == "lifespan":
+            await self._lifespan(receive, send)
+        elif scope["type"] == "http":
+            await self._http(scope, receive, send)
+
+    async def _lifespan(self, receive, send) -> None:
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                self._bridges()
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                self.close()
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+
+    async def _http(self, scope, receive, send) -> None:
+        parts = scope["path"].strip("/").split("/")
+        if scope["method"] == "GET" and len(parts) <= 3:
+            query = parse_qs(
+                scope["query_string"].decode("latin-1"), keep_blank_values=True
+            )
+            args = {key: values[0] for key, values in query.items()}
+            headers = {
+                name.decode("latin-1"): value.decode("latin-1")
+                for name, value in scope["headers"]
+            }
+            route = self._route(parts, args, headers)
+            if route is not None:
+                await route(receive, send)
+                return
+        await self._wsgi(scope, receive, send)
+
+    def _route(self, parts, args, headers) -> Callable | None:
+        """Map a GET request to a native handler, or None for the WSGI app."""
+        if len(parts) == 3:
+            if parts[0] != "sse":
+                return None
+            stream, sport = parts[1], parts[2]
+            source_id = args.get("source") or None
+            if stream == "clock" and sport in ingestion.CLOCK_FIELDS:
+                return self._sse_route(self._clock_events(sport, source_id))
+            if stream == "clock":
+                return _json_route(404, {"error": "SSE not available for this sport"})
+            if stream == "data" and sport in ingestion.SUPPORTED_SPORTS:
+                return self._sse_route(self._data_events(sport, source_id))
+            if stream == "data":
+                return _json_route(404, {"error": "unsupported sport"})
+            return None
+
+        name, sport = parts[0], parts[1] if len(parts) == 2 else None
+        if_none_match = headers.get("if-none-match")
+        source_id = args.get("source")
+
+        if name == "get_sources" and sport is None:
+            return self._conditional(
+                if_none_match,
+                f"{ingestion.get_sources_version()}.{int(time.time())}",
+                lambda: encode_json({"sources": ingestion.get_sources_snapshot()}),
+            )
+        if sport is None:
+            return None
+        if name == "get_raw_data":
+            since = args.get("since")
+            if since is None:
+                return self._conditional(
+                    if_none_match,
+                    ingestion.get_sport_data_version(sport, source_id),
+                    lambda: ingestion.get_sport_data_json(sport, source_id),
+                )
+            try:
+                since = int(since)
+            except ValueError:
+                return _json_route(400, {"error": "invalid since"})
+            changes = ingestion.get_sport_changes(sport, since, source_id)
+            if changes is None:
+                return _empty_route(304)
+            return _json_route(200, changes)
+        if name in _PAYLOAD_STORES:
+            store = _PAYLOAD_STORES[name]
+            sport_name = store.normalize_sport(sport)
+            if not sport_name:
+                return _json_route(404, {})
+            return self._conditional(
+                if_none_match,
+                store.get_data_version(sport_name),
+                lambda: store.get_data_json(sport_name),
+            )
+        return None
+
+    def _conditional(self, if_none_match, version, build) -> Callable:
+        etag = f"{api._ETAG_EPOCH}-{version}"
+        extra = [
+            (b"etag", quote_etag(etag, weak=True).encode("latin-1")),
+            (b"cache-control", b"no-cache"),
+        ]
+        if if_none_match and parse_etags(if_none_match).contains_weak(etag):
+            return _empty_route(304, extra)
+        return _bytes_route(200, build(), extra)
+
+    # --- SSE ---
+
+    def _sse_route(self, events: AsyncIterator[str]) -> Callable:
+        async def route(receive, send):
+            if self.sse_connections >= self.max_sse:
+                await events.aclose()
+                await _json_route(503, {"error": "Too many SSE connections"})(receive, send)
+                return
+            self.sse_connections += 1
+            try:
+                await self._stream(events, receive, send)
+            finally:
+                self.sse_connections -= 1
+
+        return route
+
+    async def _stream(self, events: AsyncIterator[str], receive, send) -> None:
+        """Send *events* until the client goes away.
+
+        A watcher task waits for ``http.disconnect`` and cancels the stream,
+        so an idle subscriber is released at once instead of at its next
+        keepalive.
+        """
+        task = asyncio.current_task()
+        watcher = asyncio.ensure_future(_wait_for_disconnect(receive))
+        watcher.add_done_callback(lambda w: w.cancelled() or task.cancel())
+        try:
+            await send({"type": "http.response.start", "status": 200, "headers": _SSE_HEADERS})
+            async for chunk in events:
+                await send(
+                    {"type": "http.response.body", "body": chunk.encode(), "more_body": True}
+                )
+        except asyncio.CancelledError:
+            if not watcher.done() or watcher.cancelled():
+                raise  # cancelled from outside, not by the disconnect
+        except (ConnectionError, OSError):
+            pass
+        finally:
+            watcher.cancel()
+            await events.aclose()
+
+    async def _clock_events(self, sport: str, source_id: str | None) -> AsyncIterator[str]:
+        clock, _ = self._bridges()
+        last_seq = 0
+        yield "retry: 1000\n\n"
+        while True:
+            new_seq = await clock.wait(sport, last_seq, SSE_KEEPALIVE, source_id)
+            if new_seq == last_seq:
+                yield ": keepalive\n\n"
+                continue
+            last_seq = new_seq
+            snapshot = ingestion.get_clock_snapshot(sport)
+            if snapshot is None:
+                continue
+            if source_id and snapshot.get("_source") != source_id:
+                continue
+            yield f"event: clock\ndata: {json.dumps(snapshot)}\n\n"
+
+    async def _data_events(self, sport: str, source_id: str | None) -> AsyncIterator[str]:
+        _, journal = self._bridges()
+        since = 0
+        yield "retry: 1000\n\n"
+        while True:
+            latest = ingestion.get_journal_seq()
+            update = ingestion.get_sport_changes(sport, since, source_id)
+            if update is None:
+                since = latest
+            else:
+                since = update["seq"]
+                event = "state" if update["full"] else "delta"
+                yield f"event: {event}\ndata: {json.dumps(update)}\n\n"
+            if await journal.wait(sport, since, SSE_KEEPALIVE, source_id) <= since:
+                yield ": keepalive\n\n"
+
+    # --- everything else ---
+
+    async def _wsgi(self, scope, receive, send) -> None:
+        body = bytearray()
+        while True:
+            message = await receive()
+            if message["type"] == "http.disconnect":
+                return
+            body += message.get("body", b"")
+            if not message.get("more_body"):
+                break
+        loop = asyncio.get_running_loop()
+        status, headers, content = await loop.run_in_executor(
+            self._executor, _call_wsgi, self.wsgi_app, scope, bytes(body)
+        )
+        await send({"type": "http.response.start", "status": status, "headers": headers})
+        await send({"type": "http.response.body", "body": content})
+
+
+async def _wait_for_disconnect(receive) -> None:
+    while (await receive())["type"] != "http.disconnect":
+        pass
+
+
+def _json_route(status: int, payload: Any) -> Callable:
+    return _bytes_route(status, encode_json(payload))
+
+
+def _bytes_route(status: int, body: bytes, extra=()) -> Callable:
+    async def route(receive, send):
+        await send(
+            {
+                "type": "http.response.start",
+                "status": status,
+                "headers": [(b"content-type", b"application/json"), *extra],
+            }
+        )
+        await send({"type": "http.response.body", "body": body})
+
+    return route
+
+
+def _empty_route(status: int, extra=()) -> Callable:
+    async def route(receive, send):
+        await send({"type": "http.response.start", "status": status, "headers": list(extra)})
+        await send({"type": "http.response.body", "body": b""})
+
+    return route
+
+
+def _call_wsgi(wsgi_app, scope, body: bytes):
+    """Run one request through the WSGI app (on an executor thread)."""
+    server = scope.get("server") or ("localhost", 80)
+    client = scope.get("client") or ("", 0)
+    environ = {
+        "REQUEST_METHOD": scope["method"],
+        "SCRIPT_NAME": scope.get("root_path", ""),
+        "PATH_INFO": scope["path"].encode("utf-8").decode("latin-1"),
+        "QUERY_STRING": scope["query_string"].decode("latin-1"),
+        "SERVER_NAME": str(server[0]),
+        "SERVER_PORT": str(server[1]),
+        "SERVER_PROTOCOL": f"HTTP/{scope.get('http_version', '1.1')}",
+        "REMOTE_ADDR": str(client[0]),
+        "CONTENT_LENGTH": str(len(body)),
+        "wsgi.version": (1, 0),
+        "wsgi.url_scheme": scope.get("scheme", "http"),
+        "wsgi.input": io.BytesIO(body),
+        "wsgi.errors": sys.stderr,
+        "wsgi.multithread": True,
+        "wsgi.multiprocess": False,
+        "wsgi.run_once": False,
+    }
+    for name, value in scope["headers"]:
+        key = name.decode("latin-1").upper().replace("-", "_")
+        value = value.decode("latin-1")
+        if key == "CONTENT_TYPE":
+            environ["CONTENT_TYPE"] = value
+        elif key != "CONTENT_LENGTH":
+            key = f"HTTP_{key}"
+            environ[key] = f"{environ[key]},{value}" if key in environ else value
+
+    started = {}
+
+    def start_response(status, headers, exc_info=None):
+        started["status"] = int(status.split(" ", 1)[0])
+        started["headers"] = [
+            (name.lower().encode("latin-1"), value.encode("latin-1"))
+            for name, value in headers
+        ]
+
+    result = wsgi_app(environ, start_response)
+    try:
+        content = b"".join(result)
+    finally:
+        close = getattr(result, "close", None)
+        if close is not None:
+            close()
+    return started["status"], started["headers"], content
+
+
+# --- Minimal HTTP/1.1 server ---
+
+
+class _Connection:
+    """One client connection: parses requests and drives the ASGI app."""
+
+    def __init__(self, app, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.app = app
+        self.reader = reader
+        self.writer = writer
+        self.client = writer.get_extra_info("peername")
+        self.server = writer.get_extra_info("sockname")
+
+    async def run(self) -> None:
+        try:
+            while await self._handle_one():
+                pass
+        except (ConnectionError, asyncio.IncompleteReadError, asyncio.LimitOverrunError):
+            pass
+        finally:
+            self.writer.close()
+
+    async def _handle_one(self) -> bool:
+        """Serve one request; returns True to keep the connection open."""
+        head = await self.reader.readuntil(b"\r\n\r\n")
+        lines = head[:-4].decode("latin-1").split("\r\n")
+        try:
+            method, target, version = lines[0].split(" ")
+        except ValueError:
+            await self._simple_response(400)
+            return False
+        headers = []
+        length = 0
+        keep_alive = version == "HTTP/1.1"
+        for line in lines[1:]:
+            name, _, value = line.partition(":")
+            name, value = name.strip().lower(), value.strip()
+            headers.append((name.encode("latin-1"), value.encode("latin-1")))
+            if name == "content-length":
+                if not (value.isascii() and value.isdigit()):
+                    await self._simple_response(400)
+                    return False
+                length = int(value)
+            elif name == "transfer-encoding":
+                await self._simple_response(411)
+                return False
+            elif name == "connection" and value.lower() == "close":
+                keep_alive = False
+        body = await self.reader.readexactly(length) if length else b""
+
+        path, _, query = target.partition("?")
+        scope = {
+            "type": "http",
+            "asgi": {"version": "3.0", "spec_version": "2.3"},
+            "http_version": version[len("HTTP/"):],
+            "method": method,
+            "scheme": "http",
+            "path": unquote(path),
+            "raw_path": path.encode("latin-1"),
+            "query_string": query.encode("latin-1"),
+            "root_path": "",
+            "headers": headers,
+            "client": self.client[:2] if self.client else None,
+            "server": self.server[:2] if self.server else None,
+        }
+        state = {"body_read": False, "started": False, "close": not keep_alive}
+
+        async def receive():
+            if not state["body_read"]:
+                state["body_read"] = True
+                return {"type": "http.request", "body": body, "more_body": False}
+            # Nothing more is expected from the client: wait for it to leave.
+            state["close"] = True
+            while await self.reader.read(65536):
+                pass
+            return {"type": "http.disconnect"}
+
+        async def send(message):
+            if self.writer.is_closing():
+                raise ConnectionResetError("client disconnected")
+            if message["type"] == "http.response.start":
+                state["started"] = True
+                response_headers = list(message.get("headers", []))
+                if not any(name.lower() == b"content-length" for name, _ in response_headers):
+                    # Streamed body: delimit it by closing the connection.
+                    state["close"] = True
+                    response_headers.append((b"connection", b"close"))
+                self._write_head(message["status"], response_headers)
+            elif message["type"] == "http.response.body":
+                if method != "HEAD":
+                    self.writer.write(message.get("body", b""))
+                await self.writer.drain()
+
+        await self.app(scope, receive, _with_content_length(send))
+        if not state["started"]:
+            await self._simple_response(500)
+            return False
+        return not state["close"]
+
+    def _write_head(self, status: int, headers) -> None:
+        try:
+            reason = http.HTTPStatus(status).phrase
+        except ValueError:
+            reason = ""
+        lines = [f"HTTP/1.1 {status} {reason}"]
+        lines += [f"{name.decode('latin-1')}: {value.decode('latin-1')}" for name, value in headers]
+        self.writer.write(("\r\n".join(lines) + "\r\n\r\n").encode("latin-1"))
+
+    async def _simple_response(self, status: int) -> None:
+        self._write_head(status, [(b"content-length", b"0"), (b"connection", b"close")])
+        await self.writer.drain()
+
+
+def _with_content_length(send):
+    """Buffer the start message so single-chunk bodies get a Content-Length
+    (and the connection can be kept alive); streamed bodies pass through."""
+    pending = []
+
+    async def wrapped(message):
+        if message["type"] == "http.response.start":
+            pending.append(message)
+            return
+        if pending:
+            start = pending.pop()
+            headers = start.get("headers", [])
+            if not message.get("more_body") and not any(
+                name.lower() == b"content-length" for name, _ in headers
+            ):
+                body = message.get("body", b"")
+                start = dict(start)
+                start["headers"] = [*headers, (b"content-length", str(len(body)).encode())]
+            await send(start)
+        await send(message)
+
+    return wrapped
+
+
+async def start_server(app, host: str, port: int, backlog: int = 1024) -> asyncio.AbstractServer:
+    async def handle(reader, writer):
+        await _Connection(app, reader, writer).run()
+
+    return await asyncio.start_server(
+        handle, host, port, backlog=backlog, limit=MAX_HEADER_BYTES
+    )
+
+
+async def serve(app, host: str, port: int) -> None:
+    server = await start_server(app, host, port)
+    print(f"Async server listening on {host}:{port}")
+    async with server:
+        await server.serve_forever()
+
+
+def create_asgi_app(wsgi_app=None) -> AsyncApp:
+    """ASGI factory (e.g. ``uvicorn --factory``); builds the Flask app if
+    none is given."""
+    if wsgi_app is None:
+        from . import create_app
+
+        wsgi_app = create_app()
+    return AsyncApp(wsgi_app)
+
+
+def run(wsgi_app, host: str, port: int) -> None:
+    """Blocking entry point used by main.py when ``ASYNC_SERVER`` is set."""
+    app = create_asgi_app(wsgi_app)
+    try:
+        asyncio.run(serve(app, host, port))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        app.close()
@@ -0,0 +1,86 @@
+"""Change notifications for consumers that mirror the data stores.
+
+After every write the stores (ingestion, statcrew, trackman, virtius) call
+``store_changes.publish(kind, sport)`` with the key of what changed:
+
+  ("sport", sport)      ingestion.get_sport_data(sport)
+  ("clock", sport)      ingestion.get_clock_snapshot(sport)
+  ("trackman", sport)   trackman.get_data(sport), likewise statcrew/virtius
+  ("sources", None)     ingestion.get_sources_snapshot()
+
+A subscriber (the cloud relay) collects the keys published since it last
+looked and re-reads only those through the regular getters.  Keys carry
+no values, so a subscriber always reads the latest state and can never
+act on a stale one; several writes to the same key before it wakes
+collapse into one.
+"""
+
+import threading
+
+
+class Subscription:
+    """Keys published since the last ``wait``; see ``ChangeFeed.subscribe``."""
+
+    def __init__(self, feed):
+        self._feed = feed
+        self._cond = threading.Condition()
+        self._pending = set()
+        self._closed = False
+
+    def post(self, key):
+        """Queue *key* for this subscriber only, as if it had been published."""
+        with self._cond:
+            if not self._pending:
+                self._cond.notify()
+            self._pending.add(key)
+
+    def wait(self, timeout):
+        """Block until a key is published, the subscription is closed, or
+        *timeout* seconds pass; return (and forget) the pending keys."""
+        with self._cond:
+            if not self._pending and not self._closed:
+                self._cond.wait(timeout)
+            pending, self._pending = self._pending, set()
+            return pending
+
+    @property
+    def closed(self):
+        return self._closed
+
+    def close(self):
+        """Stop receiving keys and wake a blocked ``wait``."""
+        self._feed._unsubscribe(self)
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+
+
+class ChangeFeed:
+    """Fans change keys out to every open ``Subscription``.
+
+    ``publish`` is cheap enough to call on every write: with nobody
+    subscribed it only iterates an empty tuple.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._subscriptions = ()
+
+    def subscribe(self):
+        subscription = Subscription(self)
+        with self._lock:
+            self._subscriptions = self._subscriptions + (subscription,)
+        return subscription
+
+    def _unsubscribe(self, subscription):
+        with self._lock:
+            self._subscriptions = tuple(
+                s for s in self._subscriptions if s is not subscription
+            )
+
+    def publish(self, kind, sport=None):
+        for subscription in self._subscriptions:
+            subscription.post((kind, sport))
+
+
+store_changes = ChangeFeed()
@@ -5,25 +5,73 @@ in-memory state through the regular accessor functions; never modifies
 any on-prem behavior, locks, or threads.
 
 Wire protocol: see docs/plan.md and the edge repo's `edge/wire.py`.
-Frames are state-replace, not events. The relay re-samples fresh state
-every poll cycle and only emits a frame when the value differs from the
+Frames are state-replace, not events. The stores announce which keys
+changed on `change_feed.store_changes`; the relay wakes on those, re-reads
+just those keys and only emits a frame when the value differs from the
 last one sent — so a slow socket can never replay a stale value once a
-newer one is available.
+newer one is available. Sport, clock and payload getters return read-only
+snapshots stamped with a version, so "differs" is a version comparison
+rather than a deep dict comparison.
+
+Protocol version 2 (offered as ``max_version`` in ``hello``, used once the
+edge answers with its own ``hello`` at version 2): every sport, clock and
+payload frame carries a per-connection ``seq`` and the edge acknowledges
+with ``{"type": "ack", "seq": n}`` (everything up to *n* applied).  Full
+frames become keyframes; in between the relay sends ``delta`` frames
+(see ``relay_delta``) against the last acknowledged value for the key,
+plus a keyframe every ``CLOUD_RELAY_KEYFRAME_EVERY`` frames of a key.
+``{"type": "resync"}`` from the edge, or a reconnect, starts over from a
+full snapshot.  A version-1 edge never answers ``hello`` and keeps
+receiving full frames.
+
+``CLOUD_RELAY_URL`` may list several edges (primary, backup, a local
+stand-in).  One sampling thread reads the stores for all of them; each
+edge is an ``_Endpoint`` with its own connection, reconnect backoff,
+protocol state and last-sent cache.  The sampler queues frames in each
+endpoint's bounded outbox, which holds at most one frame per key (a newer
+frame replaces an unsent one, so a slow uplink delays the edge but never
+makes it replay stale values), and the endpoint's writer thread sends
+whatever is queued.  ``stats()`` reports queue depth, coalesced frames
+and send latency per endpoint.
+
+``hello`` also offers ``features``, independent of the version: with
+"batch" accepted, the frames the writer finds queued together go out as
+a single ``{"type": "batch", "frames": [...]}`` message; with "zlib", every later
+message is a binary one carrying the next piece of a single zlib stream
+per connection, sync-flushed so each message decompresses to exactly one
+JSON frame (permessage-deflate with context takeover, which
+websocket-client does not implement).  Sharing the stream is what makes
+small, repetitive frames compress well.  The relay waits up to
+``CLOUD_RELAY_HELLO_TIMEOUT`` for the edge's ``hello`` before sending the
+initial state, so the snapshot can already use them.
 """
 from __future__ import annotations
 
+import contextlib
 import json
 import logging
 import threading
 import time
+import zlib
+from collections import OrderedDict
 from typing import Any, Callable
 
 from . import ingestion, statcrew, trackman, virtius
+from .change_feed import store_changes
+from .relay_delta import make_delta
 from .config import CONFIG
+from .snapshot import Snapshot
 
 log = logging.getLogger(__name__)
 
 PROTOCOL_VERSION = 1
+DELTA_PROTOCOL_VERSION = 2
+
+ZLIB_LEVEL = 6
+
+# Unacknowledged frames per key before the relay stops building deltas
+# against an ever-older base and sends a keyframe instead.
+MAX_INFLIGHT = 8
 
 RELAY_SPORTS: tuple[str, ...] = (
     "Basketball",
@@ -46,162 +94,728 @@ PAYLOAD_KINDS: dict[str, tuple[str, ...]] = {
     "virtius": ("Gymnastics",),
 }
 
-PAYLOAD_GETTERS: dict[str, Callable[[str], dict]] = {
+PAYLOAD_GETTERS: dict[str, Callable[[str], Snapshot]] = {
     "trackman": trackman.get_data,
     "statcrew": statcrew.get_data,
     "virtius": virtius.get_data,
 }
 
+SOURCES_KEY = ("sources", None)
+SNAPSHOT_KEY = ("snapshot", None)
+RESYNC_KEY = ("resync", None)  # posted to the pump when an endpoint needs a sync
 
-class CloudRelay:
-    """Background WSS publisher.
+# Every (kind, sport) the relay mirrors, in the order a full resample sends
+# them.  Same keys as `change_feed.store_changes` publishes.
+RELAY_KEYS: tuple[tuple[str, str | None], ...] = (
+    *((kind, sport) for sport in RELAY_SPORTS for kind in ("sport", "clock")),
+    *((kind, sport) for kind, sports in PAYLOAD_KINDS.items() for sport in sports),
+    SOURCES_KEY,
+)
+
+# Smallest outbox: one frame per key plus the snapshot, so a full sync
+# always fits and coalescing alone keeps the outbox from filling.
+MIN_QUEUE_SIZE = len(RELAY_KEYS) + 1
+
+
+class _KeyStream:
+    """Protocol-2 bookkeeping for one (kind, sport) on one connection."""
+
+    __slots__ = ("base_seq", "base", "inflight", "since_keyframe")
+
+    def __init__(self):
+        self.base_seq = None  # seq of the last frame the edge acknowledged
+        self.base = None  # ...and the value it carried
+        self.inflight = []  # (seq, value) sent since, oldest first
+        self.since_keyframe = 0  # deltas sent since the last keyframe
+
+    def ack(self, seq):
+        acked = 0
+        while acked < len(self.inflight) and self.inflight[acked][0] <= seq:
+            acked += 1
+        if acked:
+            self.base_seq, self.base = self.inflight[acked - 1]
+            del self.inflight[:acked]
+
+
+class _SendStats:
+    """Outbound counters, kept across connections."""
+
+    __slots__ = (
+        "lock", "coalesced", "dropped", "max_depth", "frames_sent", "messages_sent",
+        "latency_total", "latency_max", "latency_last",
+    )
 
-    One thread owns the connection, the sampling loop, and the socket
-    writes — so no write lock is needed. ``start()`` is idempotent;
-    ``stop()`` joins the thread and closes the socket.
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.coalesced = 0  # frames replaced by a newer one before sending
+        self.dropped = 0  # frames refused by a full outbox
+        self.max_depth = 0
+        self.frames_sent = 0
+        self.messages_sent = 0
+        self.latency_total = 0.0  # seconds from queueing to sent, summed
+        self.latency_max = 0.0
+        self.latency_last = 0.0
+
+    def record_sent(self, latencies, messages):
+        with self.lock:
+            self.messages_sent += messages
+            for latency in latencies:
+                self.frames_sent += 1
+                self.latency_total += latency
+                self.latency_max = max(self.latency_max, latency)
+                self.latency_last = latency
+
+
+class _Outbox:
+    """Frames waiting for the writer thread, at most one per key.
+
+    ``put`` for a key that is already queued replaces the frame (keeping
+    the time it was first queued, and moving it to the back so it still
+    follows anything queued since, such as a snapshot).  ``put`` never
+    waits, so a slow edge cannot stall the shared sampler: a frame for a
+    new key that finds the outbox full is refused.  While ``holding``, the writer
+    waits for the frames of one resample to be queued (or the outbox to
+    fill) so they go out together.
     """
 
-    def __init__(self, config=CONFIG, ws_factory=None, sleep=None):
-        self._config = config
-        self._ws_factory = ws_factory or _default_ws_factory
-        self._sleep = sleep or (lambda secs: self._stop.wait(secs))
-        self._stop = threading.Event()
+    def __init__(self, maxsize, stats):
+        self._cond = threading.Condition()
+        self._frames = OrderedDict()  # key -> (frame, queued_at)
+        self._maxsize = max(1, maxsize)
+        self._stats = stats
+        self._closed = False
+        self._held = 0
+        self.error: BaseException | None = None  # why the writer gave up
+
+    @contextlib.contextmanager
+    def holding(self):
+        with self._cond:
+            self._held += 1
+        try:
+            yield
+        finally:
+            with self._cond:
+                self._held -= 1
+                self._cond.notify_all()
+
+    def put(self, key, frame) -> bool:
+        """Queue *frame* for *key*; False if the outbox was full."""
+        with self._cond:
+            if self._closed:
+                return True
+            entry = self._frames.pop(key, None)
+            if entry is not None:
+                queued_at = entry[1]
+                with self._stats.lock:
+                    self._stats.coalesced += 1
+            elif len(self._frames) >= self._maxsize:
+                with self._stats.lock:
+                    self._stats.dropped += 1
+                return False
+            else:
+                queued_at = time.monotonic()
+            self._frames[key] = (frame, queued_at)
+            depth = len(self._frames)
+            with self._stats.lock:
+                self._stats.max_depth = max(self._stats.max_depth, depth)
+            self._cond.notify_all()
+            return True
+
+    def take(self, timeout=None) -> list[tuple[dict[str, Any], float]]:
+        """Wait for frames and return all of them, oldest first, as
+        ``(frame, queued_at)``; ``[]`` once closed or after *timeout*."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            while not self._closed and (
+                not self._frames or (self._held and len(self._frames) < self._maxsize)
+            ):
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    break
+                self._cond.wait(remaining)
+            entries = list(self._frames.values())
+            self._frames.clear()
+            self._cond.notify_all()
+            return entries
+
+    def depth(self) -> int:
+        with self._cond:
+            return len(self._frames)
+
+    def clear(self) -> None:
+        with self._cond:
+            self._frames.clear()
+            self._cond.notify_all()
+
+    def fail(self, exc: BaseException) -> None:
+        with self._cond:
+            self.error = exc
+            self._closed = True
+            self._cond.notify_all()
+
+    def close(self) -> None:
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+
+
+class _Endpoint:
+    """One edge the relay publishes to.
+
+    Owns everything per connection: a thread that connects and reconnects
+    with its own backoff, a reader for what the edge sends back (protocol
+    negotiation, acks), a writer draining the outbox, and the protocol
+    state and last-sent cache for that edge.  Frames are built on the
+    relay's sampling thread through ``sync`` and ``offer``; the endpoint
+    asks for a ``sync`` after connecting and when the edge sends
+    ``resync``.  Only the writer touches the socket after ``hello``, so no
+    write lock is needed.
+    """
+
+    def __init__(self, relay: CloudRelay, url: str, token: str):
+        self.url = url
+        self._relay = relay
+        self._config = relay._config
+        self._token = token
         self._thread: threading.Thread | None = None
         self._ws_lock = threading.Lock()
         self._ws = None
+        self._ended: threading.Event | None = None  # set when the session is over
+        # (kind, sport) -> version of the last snapshot queued; the sources
+        # list has no version and is stored (and compared) by value.
         self._last_sent: dict[tuple[str, str | None], Any] = {}
+        # Per-connection protocol state; the reader thread updates it.
+        self._protocol = PROTOCOL_VERSION
+        self._streams_lock = threading.Lock()
+        self._streams: dict[tuple[str, str | None], _KeyStream] = {}
+        self._frame_seq = 0
+        self._resync = threading.Event()  # needs the full state
+        self._hello = threading.Event()  # edge answered our hello
+        self._features: frozenset[str] = frozenset()
+        self._deflate = None  # per-connection zlib stream, once accepted
+        self._outbox: _Outbox | None = None  # while connected
+        self._send_stats = _SendStats()
+
+    @property
+    def connected(self) -> bool:
+        return self._outbox is not None
 
     def start(self) -> None:
-        if not self._config.cloud_relay_enabled:
-            log.info("cloud relay disabled (CLOUD_RELAY_ENABLED=0)")
-            return
-        if not self._config.cloud_relay_url:
-            log.warning("cloud relay enabled but CLOUD_RELAY_URL is empty; not starting")
-            return
-        if not self._config.cloud_relay_token:
-            log.warning("cloud relay enabled but CLOUD_RELAY_TOKEN is empty; not starting")
-            return
-        if self._thread is not None and self._thread.is_alive():
-            return
-        self._stop.clear()
-        self._thread = threading.Thread(target=self._run, name="cloud-relay", daemon=True)
+        self._thread = threading.Thread(target=self._run, name="cloud-relay-endpoint", daemon=True)
         self._thread.start()
-        log.info("cloud relay started → %s", self._config.cloud_relay_url)
 
-    def stop(self, timeout: float = 5.0) -> None:
-        self._stop.set()
+    def close(self) -> None:
+        """End the current session; ``_run`` exits once the relay stops."""
+        self._hello.set()  # don't sit out the hello timeout
+        outbox = self._outbox
+        if outbox is not None:
+            outbox.close()  # release the writer
         with self._ws_lock:
-            ws = self._ws
+            ws, ended = self._ws, self._ended
+        if ended is not None:
+            ended.set()
         if ws is not None:
             try:
                 ws.close()
             except Exception:
                 pass
+
+    def join(self, timeout: float) -> None:
         if self._thread is not None:
             self._thread.join(timeout=timeout)
             self._thread = None
 
     def _run(self) -> None:
+        relay = self._relay
         backoff = self._config.cloud_relay_reconnect_min
-        while not self._stop.is_set():
+        while not relay._stop.is_set():
             try:
-                self._connect_and_pump()
+                self._connect_and_serve()
                 backoff = self._config.cloud_relay_reconnect_min
             except Exception as exc:  # noqa: BLE001 — log and retry
-                log.warning("cloud relay session ended: %s", exc)
-            if self._stop.is_set():
+                log.warning("cloud relay session to %s ended: %s", self.url, exc)
+            if relay._stop.is_set():
                 break
-            if self._sleep(backoff):
+            if relay._sleep(backoff):
                 break
             backoff = min(backoff * 2.0, self._config.cloud_relay_reconnect_max)
 
-    def _connect_and_pump(self) -> None:
-        ws = self._ws_factory(
-            self._config.cloud_relay_url,
-            self._config.cloud_relay_token,
-            self._config.cloud_relay_publisher_name,
-        )
+    def _connect_and_serve(self) -> None:
+        relay = self._relay
+        ws = relay._ws_factory(self.url, self._token, self._config.cloud_relay_publisher_name)
+        outbox = _Outbox(max(self._config.cloud_relay_queue_size, MIN_QUEUE_SIZE), self._send_stats)
+        ended = threading.Event()
+        self._hello.clear()
         with self._ws_lock:
-            self._ws = ws
+            self._ws, self._ended = ws, ended
+        reader = writer = None
         try:
-            self._last_sent.clear()
+            if relay._stop.is_set():  # close() ran before the socket was stored
+                return
+            self._protocol = PROTOCOL_VERSION
+            self._features = frozenset()
+            self._deflate = None
+            with self._streams_lock:
+                self._streams.clear()
+                self._frame_seq = 0
             self._send_hello(ws)
-            self._send_initial_state(ws)
-            poll = max(0.05, float(self._config.cloud_relay_poll_interval))
-            while not self._stop.is_set():
-                if self._sleep(poll):
-                    return
-                self._tick(ws)
+            reader = threading.Thread(
+                target=self._read_edge, args=(ws, ended), name="cloud-relay-reader", daemon=True
+            )
+            reader.start()
+            self._hello.wait(max(0.0, float(self._config.cloud_relay_hello_timeout)))
+            writer = threading.Thread(
+                target=self._write, args=(ws, outbox, ended), name="cloud-relay-writer", daemon=True
+            )
+            writer.start()
+            self._outbox = outbox
+            self._request_sync()
+            ended.wait()
+            if outbox.error is not None:
+                raise outbox.error
+            if not relay._stop.is_set():
+                raise ConnectionError("edge closed the connection")
         finally:
+            self._outbox = None
+            outbox.close()
             with self._ws_lock:
-                self._ws = None
+                self._ws = self._ended = None
             try:
                 ws.close()
             except Exception:
                 pass
+            for thread in (writer, reader):
+                if thread is not None:
+                    thread.join(timeout=1.0)
+
+    def _request_sync(self) -> None:
+        """Have the sampling thread send this edge the full state."""
+        self._resync.set()
+        changes = self._relay._changes
+        if changes is not None:
+            changes.post(RESYNC_KEY)
+
+    def take_sync(self) -> bool:
+        """True (once) when a connected endpoint asked for the full state."""
+        if self._outbox is None or not self._resync.is_set():
+            return False
+        self._resync.clear()
+        return True
 
     def _send_hello(self, ws) -> None:
         self._send(ws, {
             "type": "hello",
             "publisher": self._config.cloud_relay_publisher_name,
             "version": PROTOCOL_VERSION,
+            "max_version": DELTA_PROTOCOL_VERSION,
+            "features": sorted(self._offered_features()),
         })
 
-    def _send_initial_state(self, ws) -> None:
+    def _offered_features(self) -> set[str]:
+        features = set()
+        if self._config.cloud_relay_batch:
+            features.add("batch")
+        if self._config.cloud_relay_compress:
+            features.add("zlib")
+        return features
+
+    def _read_edge(self, ws, ended: threading.Event) -> None:
+        """Handle frames from the edge until the socket closes."""
+        idle = _recv_timeouts()
+        try:
+            while True:
+                try:
+                    raw = ws.recv()
+                except idle:
+                    continue
+                except Exception:
+                    return
+                if not raw:
+                    return
+                try:
+                    message = json.loads(raw)
+                except ValueError:
+                    log.debug("cloud relay: ignoring non-JSON frame from edge")
+                    continue
+                if isinstance(message, dict):
+                    self._handle_edge_frame(message)
+        finally:
+            ended.set()
+
+    def _handle_edge_frame(self, message: dict[str, Any]) -> None:
+        kind = message.get("type")
+        if kind == "hello":
+            if message.get("version") == DELTA_PROTOCOL_VERSION:
+                self._protocol = DELTA_PROTOCOL_VERSION
+                log.info(
+                    "cloud relay: %s speaks protocol %d, sending deltas", self.url, DELTA_PROTOCOL_VERSION
+                )
+            features = message.get("features")
+            if isinstance(features, list):
+                self._features = frozenset(self._offered_features().intersection(features))
+            self._hello.set()
+        elif kind == "ack":
+            seq = message.get("seq")
+            if isinstance(seq, int):
+                with self._streams_lock:
+                    for stream in self._streams.values():
+                        stream.ack(seq)
+        elif kind == "resync":
+            with self._streams_lock:
+                self._streams.clear()
+            self._request_sync()
+
+    def sync(self, sports_state: dict[str, Snapshot], samples) -> None:
+        """Replace what the edge holds: a ``snapshot`` of *sports_state*,
+        then a full frame for each ``(key, value)`` in *samples*."""
+        outbox = self._outbox
+        if outbox is not None:
+            outbox.clear()  # frames against the state being replaced
+        self._last_sent.clear()
+        with self._streams_lock:
+            self._streams.clear()
+        with self._holding():
+            self._emit(SNAPSHOT_KEY, {"type": "snapshot", "state": sports_state})
+            for sport, data in sports_state.items():
+                self._last_sent[("sport", sport)] = data.version
+            for key, value in samples:
+                self._emit(key, _full_frame(key, value))
+                self._last_sent[key] = value if key == SOURCES_KEY else value.version
+
+    def offer(self, samples) -> None:
+        """Queue a frame for each ``(key, value)`` in *samples* that this
+        edge has not been sent yet."""
+        with self._holding():
+            for key, value in samples:
+                if key == SOURCES_KEY:
+                    if value != self._last_sent.get(key):
+                        self._emit(key, _full_frame(key, value))
+                        self._last_sent[key] = value
+                elif value and value.version != self._last_sent.get(key):
+                    frame = _full_frame(key, value)
+                    if self._protocol >= DELTA_PROTOCOL_VERSION:
+                        frame = self._encode(key, value, frame)
+                    if frame is not None:
+                        self._emit(key, frame)
+                    self._last_sent[key] = value.version
+
+    def _encode(self, key, value, frame: dict[str, Any]) -> dict[str, Any] | None:
+        """Protocol-2 form of *frame*: a keyframe (the same frame plus a
+        ``seq``) or a ``delta`` against the last value the edge acknowledged
+        for *key*.  ``None`` when nothing the edge holds differs."""
+        with self._streams_lock:
+            stream = self._streams.get(key)
+            if stream is None:
+                stream = self._streams[key] = _KeyStream()
+            ops = None
+            if (
+                stream.base is not None
+                and len(stream.inflight) < MAX_INFLIGHT
+                and stream.since_keyframe + 1 < self._config.cloud_relay_keyframe_every
+            ):
+                ops = make_delta(stream.base, [sent for _seq, sent in stream.inflight], value)
+                if ops == ([], []):
+                    return None
+            self._frame_seq += 1
+            seq = self._frame_seq
+            stream.inflight.append((seq, value))
+            if ops is None:
+                stream.since_keyframe = 0
+                return {**frame, "seq": seq}
+            stream.since_keyframe += 1
+            base_seq = stream.base_seq
+        set_ops, unset_ops = ops
+        delta = {"type": "delta", "kind": key[0], "sport": key[1], "seq": seq, "base": base_seq}
+        if set_ops:
+            delta["set"] = set_ops
+        if unset_ops:
+            delta["unset"] = unset_ops
+        return delta
+
+    def _holding(self):
+        outbox = self._outbox
+        return outbox.holding() if outbox is not None else contextlib.nullcontext()
+
+    def _emit(self, key, frame: dict[str, Any]) -> None:
+        """Queue *frame* as the latest for *key* (dropped when not connected).
+
+        A frame the full outbox refused leaves the edge behind, so the
+        endpoint asks for a full sync."""
+        outbox = self._outbox
+        if outbox is not None and not outbox.put(key, frame):
+            self._request_sync()
+
+    def _write(self, ws, outbox: _Outbox, ended: threading.Event) -> None:
+        """Writer thread: send queued frames until the outbox closes."""
+        try:
+            while True:
+                entries = outbox.take()
+                if not entries:
+                    return
+                self._send_frames(ws, entries)
+        except Exception as exc:  # noqa: BLE001 — ends the session
+            outbox.fail(exc)
+            ended.set()
+
+    def _send_frames(self, ws, entries) -> None:
+        """Send ``(frame, queued_at)`` entries, as one batch if accepted."""
+        frames = [frame for frame, _queued_at in entries]
+        if len(frames) > 1 and "batch" in self._features:
+            self._transmit(ws, {"type": "batch", "frames": frames})
+            messages = 1
+        else:
+            for frame in frames:
+                self._transmit(ws, frame)
+            messages = len(frames)
+        sent_at = time.monotonic()
+        self._send_stats.record_sent([sent_at - queued_at for _frame, queued_at in entries], messages)
+
+    def _transmit(self, ws, frame: dict[str, Any]) -> None:
+        """Send *frame*, through the zlib stream if the edge accepted it."""
+        text = json.dumps(frame, default=_json_default)
+        if "zlib" not in self._features:
+            ws.send(text)
+            return
+        if self._deflate is None:
+            self._deflate = zlib.compressobj(ZLIB_LEVEL)
+        deflate = self._deflate
+        ws.send_binary(deflate.compress(text.encode()) + deflate.flush(zlib.Z_SYNC_FLUSH))
+
+    @staticmethod
+    def _send(ws, frame: dict[str, Any]) -> None:
+        ws.send(json.dumps(frame, default=_json_default))
+
+    def stats(self) -> dict[str, Any]:
+        """Connection and outbound-queue metrics."""
+        outbox = self._outbox
+        depth = outbox.depth() if outbox is not None else 0
+        stats = self._send_stats
+        with stats.lock:
+            sent = stats.frames_sent
+            return {
+                "url": self.url,
+                "connected": outbox is not None,
+                "protocol": self._protocol,
+                "features": sorted(self._features),
+                "queue_depth": depth,
+                "queue_max_depth": stats.max_depth,
+                "coalesced": stats.coalesced,
+                "dropped": stats.dropped,
+                "frames_sent": sent,
+                "messages_sent": stats.messages_sent,
+                "send_latency_ms": {
+                    "avg": round(1000 * stats.latency_total / sent, 3) if sent else 0.0,
+                    "max": round(1000 * stats.latency_max, 3),
+                    "last": round(1000 * stats.latency_last, 3),
+                },
+            }
+
+
+class CloudRelay:
+    """Background WSS publisher to one or more edges.
+
+    One thread samples: it waits on the store change feed, reads each
+    announced key once and offers the value to every connected
+    ``_Endpoint``, which turns it into a frame for its own edge (full or
+    delta, depending on what that edge holds) and queues it.  Endpoints
+    connect, reconnect and write on their own threads, so a dead edge does
+    not hold up the others and another endpoint adds no sampling.
+    ``start()`` is idempotent; ``stop()`` joins the threads and closes the
+    sockets.
+    """
+
+    def __init__(self, config=CONFIG, ws_factory=None, sleep=None):
+        self._config = config
+        self._ws_factory = ws_factory or _default_ws_factory
+        self._sleep = sleep or (lambda secs: self._stop.wait(secs))
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._changes = None  # change_feed Subscription while running
+        urls, tokens = _endpoint_settings(config)
+        self._endpoints = [_Endpoint(self, url, token) for url, token in zip(urls, tokens)]
+
+    def start(self) -> None:
+        if not self._config.cloud_relay_enabled:
+            log.info("cloud relay disabled (CLOUD_RELAY_ENABLED=0)")
+            return
+        urls, tokens = _endpoint_settings(self._config)
+        if not urls:
+            log.warning("cloud relay enabled but CLOUD_RELAY_URL is empty; not starting")
+            return
+        if not all(tokens):
+            log.warning("cloud relay enabled but CLOUD_RELAY_TOKEN is empty; not starting")
+            return
+        if len(tokens) != len(urls):
+            log.warning(
+                "cloud relay: CLOUD_RELAY_TOKEN lists %d tokens for %d URLs; not starting",
+                len(tokens), len(urls),
+            )
+            return
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="cloud-relay", daemon=True)
+        self._thread.start()
+        log.info("cloud relay started → %s", ", ".join(urls))
+
+    def stop(self, timeout: float = 5.0) -> None:
+        self._stop.set()
+        changes = self._changes
+        if changes is not None:
+            changes.close()  # wake the pump
+        for endpoint in self._endpoints:
+            endpoint.close()
+        if self._thread is not None:
+            self._thread.join(timeout=timeout)
+            self._thread = None
+
+    def _run(self) -> None:
+        self._changes = store_changes.subscribe()
+        if self._stop.is_set():  # stop() ran before the subscription existed
+            self._changes.close()
+        for endpoint in self._endpoints:
+            endpoint.start()
+        try:
+            while not self._stop.is_set():
+                try:
+                    self._pump()
+                except Exception:  # noqa: BLE001 — resample from scratch
+                    log.exception("cloud relay sampling failed; resending full state")
+                    for endpoint in self._endpoints:
+                        endpoint._resync.set()
+                    if self._sleep(self._config.cloud_relay_reconnect_min):
+                        break
+        finally:
+            self._changes.close()
+            for endpoint in self._endpoints:
+                endpoint.close()
+            for endpoint in self._endpoints:
+                endpoint.join(timeout=2.0)
+            self._changes = None
+
+    def _pump(self) -> None:
+        """Sample changes until stopped.
+
+        Keys announced by the stores are resampled as soon as they arrive.
+        The sources list is refreshed at most once per poll interval:
+        every write touches it and its ``age_seconds`` never stops
+        changing.  Every resync interval a full resample also picks up
+        anything that changed without being announced.  Endpoints that
+        just connected, or whose edge asked for it, get the full state.
+        """
+        poll = max(0.05, float(self._config.cloud_relay_poll_interval))
+        resync = max(poll, float(self._config.cloud_relay_resync_interval))
+        now = time.monotonic()
+        next_resync = now + resync
+        next_sources = now + poll
+        sources_pending = False
+        while not self._stop.is_set():
+            deadline = min(next_resync, next_sources) if sources_pending else next_resync
+            keys = self._changes.wait(max(0.0, deadline - time.monotonic()))
+            if self._stop.is_set():
+                return
+            keys.discard(RESYNC_KEY)
+            syncing = [endpoint for endpoint in self._endpoints if endpoint.take_sync()]
+            if syncing:
+                self._send_initial_state(syncing)
+            now = time.monotonic()
+            if now >= next_resync:
+                self._tick()
+                next_resync = now + resync
+                next_sources = now + poll
+                sources_pending = False
+                continue
+            if SOURCES_KEY in keys:
+                keys.discard(SOURCES_KEY)
+                sources_pending = True
+            if sources_pending and now >= next_sources:
+                keys.add(SOURCES_KEY)
+                sources_pending = False
+                next_sources = now + poll
+            if keys:
+                self._tick(keys)
+
+    def _send_initial_state(self, endpoints) -> None:
+        """Sample the full state once and ``sync`` each of *endpoints*."""
         sports_state = {}
         for sport in RELAY_SPORTS:
             data = ingestion.get_sport_data(sport)
             if data:
                 sports_state[sport] = data
-                self._last_sent[("sport", sport)] = data
-        self._send(ws, {"type": "snapshot", "state": sports_state})
-
+        samples = []
         for sport in RELAY_SPORTS:
             clock = ingestion.get_clock_snapshot(sport)
             if clock:
-                self._send(ws, {"type": "clock", "sport": sport, "clock": clock})
-                self._last_sent[("clock", sport)] = clock
-
+                samples.append((("clock", sport), clock))
         for kind, sports in PAYLOAD_KINDS.items():
             getter = PAYLOAD_GETTERS[kind]
             for sport in sports:
                 payload = getter(sport)
                 if payload:
-                    self._send(ws, {"type": kind, "sport": sport, "payload": payload})
-                    self._last_sent[(kind, sport)] = payload
-
-        sources = ingestion.get_sources_snapshot()
-        self._send(ws, {"type": "sources", "sources": sources})
-        self._last_sent[("sources", None)] = sources
-
-    def _tick(self, ws) -> None:
-        for sport in RELAY_SPORTS:
-            data = ingestion.get_sport_data(sport)
-            if data and data != self._last_sent.get(("sport", sport)):
-                self._send(ws, {"type": "sport", "sport": sport, "state": data})
-                self._last_sent[("sport", sport)] = data
-
-            clock = ingestion.get_clock_snapshot(sport)
-            if clock and clock != self._last_sent.get(("clock", sport)):
-                self._send(ws, {"type": "clock", "sport": sport, "clock": clock})
-                self._last_sent[("clock", sport)] = clock
-
-        for kind, sports in PAYLOAD_KINDS.items():
-            getter = PAYLOAD_GETTERS[kind]
-            for sport in sports:
-                payload = getter(sport)
-                if payload and payload != self._last_sent.get((kind, sport)):
-                    self._send(ws, {"type": kind, "sport": sport, "payload": payload})
-                    self._last_sent[(kind, sport)] = payload
+                    samples.append(((kind, sport), payload))
+        samples.append((SOURCES_KEY, ingestion.get_sources_snapshot()))
+        for endpoint in endpoints:
+            endpoint.sync(sports_state, samples)
+
+    def _tick(self, keys=None) -> None:
+        """Sample every key in *keys* (default: all of ``RELAY_KEYS``) once
+        and offer the values to the connected endpoints."""
+        endpoints = [endpoint for endpoint in self._endpoints if endpoint.connected]
+        if not endpoints:
+            return
+        samples = [(key, _sample(key)) for key in RELAY_KEYS if keys is None or key in keys]
+        for endpoint in endpoints:
+            endpoint.offer(samples)
+
+    def stats(self) -> dict[str, Any]:
+        """Metrics per endpoint."""
+        return {"endpoints": [endpoint.stats() for endpoint in self._endpoints]}
+
+
+def _sample(key):
+    """Current value for *key*: a ``Snapshot``, or the sources list."""
+    kind, sport = key
+    if kind == "sources":
+        return ingestion.get_sources_snapshot()
+    if kind == "sport":
+        return ingestion.get_sport_data(sport)
+    if kind == "clock":
+        return ingestion.get_clock_snapshot(sport)
+    return PAYLOAD_GETTERS[kind](sport)
+
+
+def _full_frame(key, value) -> dict[str, Any]:
+    kind, sport = key
+    if kind == "sources":
+        return {"type": "sources", "sources": value}
+    if kind == "sport":
+        return {"type": "sport", "sport": sport, "state": value}
+    if kind == "clock":
+        return {"type": "clock", "sport": sport, "clock": value}
+    return {"type": kind, "sport": sport, "payload": value}
+
+
+def _endpoint_settings(config) -> tuple[list[str], list[str]]:
+    """URLs and tokens of the edges to publish to.
+
+    ``CLOUD_RELAY_URL`` may list several URLs separated by commas;
+    ``CLOUD_RELAY_TOKEN`` is either one token for all of them or one per
+    URL, in the same order.
+    """
+    urls = [url.strip() for url in config.cloud_relay_url.split(",") if url.strip()]
+    tokens = [token.strip() for token in config.cloud_relay_token.split(",")]
+    if len(tokens) == 1:
+        tokens *= len(urls)
+    return urls, tokens
 
-        sources = ingestion.get_sources_snapshot()
-        if sources != self._last_sent.get(("sources", None)):
-            self._send(ws, {"type": "sources", "sources": sources})
-            self._last_sent[("sources", None)] = sources
 
-    @staticmethod
-    def _send(ws, frame: dict[str, Any]) -> None:
-        ws.send(json.dumps(frame, default=_json_default))
+def _recv_timeouts() -> tuple[type[BaseException], ...]:
+    """Exceptions a ``recv`` raises when the edge was merely quiet."""
+    try:
+        from websocket import WebSocketTimeoutException
+    except ImportError:
+        return (TimeoutError,)
+    return (TimeoutError, WebSocketTimeoutException)
 
 
 def _json_default(value):
@@ -232,6 +846,12 @@ _relay: CloudRelay | None = None
 _relay_lock = threading.Lock()
 
 
+def get_cloud_relay_stats() -> dict[str, Any] | None:
+    """Metrics of the global relay (``None`` if not running)."""
+    relay = _relay
+    return relay.stats() if relay is not None else None
+
+
 def start_cloud_relay() -> CloudRelay | None:
     """Start the global relay if enabled. Safe no-op when disabled."""
     global _relay
@@ -49,6 +49,12 @@ class AppConfig:
     flask_secret_key: str
     scoreboard_tcp_port: int
     scoreboard_udp_port: int
+    scoreboard_tcp_max_connections: int
+    scoreboard_tcp_backlog: int
+    scoreboard_tcp_idle_timeout: float
+    scoreboard_tcp_max_buffer: int
+    scoreboard_udp_max_peers: int
+    scoreboard_udp_peer_idle_timeout: float
     scoreboard_sources_file: str
     browse_roots: list[str]
     admin_user: str
@@ -58,9 +64,16 @@ class AppConfig:
     cloud_relay_token: str
     cloud_relay_publisher_name: str
     cloud_relay_poll_interval: float
+    cloud_relay_resync_interval: float
+    cloud_relay_keyframe_every: int
+    cloud_relay_batch: bool
+    cloud_relay_compress: bool
+    cloud_relay_hello_timeout: float
     cloud_relay_queue_size: int
     cloud_relay_reconnect_min: float
     cloud_relay_reconnect_max: float
+    async_server: bool
+    async_sse_max_connections: int
 
 
 def load_config():
@@ -73,6 +86,14 @@ def load_config():
 
     tcp_port = _to_int(os.environ.get("SCOREBOARD_TCP_PORT", "5001"), 5001)
     udp_port = _to_int(os.environ.get("SCOREBOARD_UDP_PORT", "5002"), 5002)
+    tcp_max_connections = _to_int(os.environ.get("SCOREBOARD_TCP_MAX_CONNECTIONS", "64"), 64)
+    tcp_backlog = _to_int(os.environ.get("SCOREBOARD_TCP_BACKLOG", "16"), 16)
+    tcp_idle_timeout = _to_float(os.environ.get("SCOREBOARD_TCP_IDLE_TIMEOUT", "60"), 60.0)
+    tcp_max_buffer = _to_int(os.environ.get("SCOREBOARD_TCP_MAX_BUFFER", "65536"), 65536)
+    udp_max_peers = _to_int(os.environ.get("SCOREBOARD_UDP_MAX_PEERS", "64"), 64)
+    udp_peer_idle_timeout = _to_float(
+        os.environ.get("SCOREBOARD_UDP_PEER_IDLE_TIMEOUT", "300"), 300.0
+    )
     sources_file = _resolve_path(
         os.environ.get("SCOREBOARD_SOURCES_FILE", "data_sources.json"),
         base_dir,
@@ -90,10 +111,20 @@ def load_config():
     cloud_relay_token = os.environ.get("CLOUD_RELAY_TOKEN", "")
     cloud_relay_publisher_name = os.environ.get("CLOUD_RELAY_PUBLISHER_NAME", "onprem").strip() or "onprem"
     cloud_relay_poll_interval = _to_float(os.environ.get("CLOUD_RELAY_POLL_INTERVAL", "0.5"), 0.5)
+    cloud_relay_resync_interval = _to_float(os.environ.get("CLOUD_RELAY_RESYNC_INTERVAL", "30.0"), 30.0)
+    cloud_relay_keyframe_every = _to_int(os.environ.get("CLOUD_RELAY_KEYFRAME_EVERY", "100"), 100)
+    cloud_relay_batch = _to_bool(os.environ.get("CLOUD_RELAY_BATCH"), default=True)
+    cloud_relay_compress = _to_bool(os.environ.get("CLOUD_RELAY_COMPRESS"), default=True)
+    cloud_relay_hello_timeout = _to_float(os.environ.get("CLOUD_RELAY_HELLO_TIMEOUT", "1.0"), 1.0)
     cloud_relay_queue_size = _to_int(os.environ.get("CLOUD_RELAY_QUEUE_SIZE", "256"), 256)
     cloud_relay_reconnect_min = _to_float(os.environ.get("CLOUD_RELAY_RECONNECT_MIN", "1.0"), 1.0)
     cloud_relay_reconnect_max = _to_float(os.environ.get("CLOUD_RELAY_RECONNECT_MAX", "30.0"), 30.0)
 
+    async_server = _to_bool(os.environ.get("ASYNC_SERVER"), default=False)
+    async_sse_max_connections = _to_int(
+        os.environ.get("ASYNC_SSE_MAX_CONNECTIONS", "5000"), 5000
+    )
+
     return AppConfig(
         flask_host=host,
         flask_port=port,
@@ -101,6 +132,12 @@ def load_config():
         flask_secret_key=secret_key,
         scoreboard_tcp_port=tcp_port,
         scoreboard_udp_port=udp_port,
+        scoreboard_tcp_max_connections=tcp_max_connections,
+        scoreboard_tcp_backlog=tcp_backlog,
+        scoreboard_tcp_idle_timeout=tcp_idle_timeout,
+        scoreboard_tcp_max_buffer=tcp_max_buffer,
+        scoreboard_udp_max_peers=udp_max_peers,
+        scoreboard_udp_peer_idle_timeout=udp_peer_idle_timeout,
         scoreboard_sources_file=sources_file,
         browse_roots=browse_roots,
         admin_user=admin_user,
@@ -110,9 +147,16 @@ def load_config():
         cloud_relay_token=cloud_relay_token,
         cloud_relay_publisher_name=cloud_relay_publisher_name,
         cloud_relay_poll_interval=cloud_relay_poll_interval,
+        cloud_relay_resync_interval=cloud_relay_resync_interval,
+        cloud_relay_keyframe_every=cloud_relay_keyframe_every,
+        cloud_relay_batch=cloud_relay_batch,
+        cloud_relay_compress=cloud_relay_compress,
+        cloud_relay_hello_timeout=cloud_relay_hello_timeout,
         cloud_relay_queue_size=cloud_relay_queue_size,
         cloud_relay_reconnect_min=cloud_relay_reconnect_min,
         cloud_relay_reconnect_max=cloud_relay_reconnect_max,
+        async_server=async_server,
+        async_sse_max_connections=async_sse_max_connections,
     )
 
 
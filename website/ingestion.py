@@ -1,19 +1,32 @@
+import errno
 import json
 import os
+import selectors
 import socket
 import threading
 import time
+from collections import OrderedDict, deque
 
 import serial
 import serial.tools.list_ports
 
+from .change_feed import store_changes
 from .config import CONFIG
-from .protocol import PacketStreamParser, identify_and_parse
+from .json_cache import JsonCache, encode_json
+from .protocol import BulkPacketStreamParser, identify_and_parse
+from .snapshot import Snapshot, freeze
+from .udp_batch import DatagramReceiver
 
 # --- Environment config ---
 
 DEFAULT_TCP_PORT = CONFIG.scoreboard_tcp_port
 DEFAULT_UDP_PORT = CONFIG.scoreboard_udp_port
+DEFAULT_TCP_MAX_CONNECTIONS = CONFIG.scoreboard_tcp_max_connections
+DEFAULT_TCP_BACKLOG = CONFIG.scoreboard_tcp_backlog
+DEFAULT_TCP_IDLE_TIMEOUT = CONFIG.scoreboard_tcp_idle_timeout
+DEFAULT_TCP_MAX_BUFFER = CONFIG.scoreboard_tcp_max_buffer
+DEFAULT_UDP_MAX_PEERS = CONFIG.scoreboard_udp_max_peers
+DEFAULT_UDP_PEER_IDLE_TIMEOUT = CONFIG.scoreboard_udp_peer_idle_timeout
 DATA_SOURCES_FILE = CONFIG.scoreboard_sources_file
 
 # --- Shared state ---
@@ -34,6 +47,9 @@ parsed_data = {
 
 parsed_data_by_source = {}
 last_seen_by_source = {}
+# Serializes writers.  Stored snapshots are copy-on-write: a writer builds a
+# new dict and swaps it in, never mutating one that has been published, so
+# readers (get_sport_data and friends) look them up without taking the lock.
 parsed_data_lock = threading.Lock()
 
 # --- Auto-mode source stickiness ---
@@ -42,6 +58,10 @@ parsed_data_lock = threading.Lock()
 # Key: sport name → source_id that Auto mode is currently locked onto.
 _auto_sticky_source = {}
 _AUTO_STICKY_TTL = 10  # seconds before a sticky source is considered stale
+# Key: sport name → OrderedDict of the sources with data for it, least
+# recently seen first, so Auto mode finds the freshest source without a
+# scan.  Kept in step with last_seen_by_source by _mark_seen_locked().
+_sources_by_freshness = {}
 
 SUPPORTED_SPORTS = set(parsed_data.keys())
 
@@ -58,13 +78,140 @@ CLOCK_FIELDS = {
     "Volleyball": ["game_clock", "period"],
 }
 
+
+class _UpdateChannels:
+    """Per-(sport, source) wakeup channels for SSE subscribers.
+
+    Publishing an update for ``(sport, source_id)`` wakes only subscribers
+    of that source and subscribers of the sport as a whole (``source_id``
+    ``None``, i.e. Auto mode), instead of every SSE generator.  Each channel
+    remembers the highest sequence number published to it, so an update
+    that lands while a subscriber is busy is seen on its next wait rather
+    than missed.
+
+    Listeners registered with ``add_listener`` are called as
+    ``listener(sport, source_id)`` after every publish, from the publishing
+    thread; the async server uses this to wake its event loop.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._seqs = {}     # (sport, source_id | None) -> latest published seq
+        self._waiters = {}  # (sport, source_id | None) -> [Condition, count]
+        self._listeners = []
+
+    def add_listener(self, listener):
+        with self._lock:
+            self._listeners = self._listeners + [listener]
+
+    def remove_listener(self, listener):
+        with self._lock:
+            self._listeners = [l for l in self._listeners if l is not listener]
+
+    def publish(self, sport, source_id, seq):
+        with self._lock:
+            for key in ((sport, source_id), (sport, None)):
+                if seq > self._seqs.get(key, 0):
+                    self._seqs[key] = seq
+                waiters = self._waiters.get(key)
+                if waiters is not None:
+                    waiters[0].notify_all()
+            listeners = self._listeners
+        for listener in listeners:
+            listener(sport, source_id)
+
+    def latest(self, sport, source_id=None):
+        """Latest seq published to the ``(sport, source_id)`` channel."""
+        return self._seqs.get((sport, source_id), 0)
+
+    def wait(self, sport, last_seq, timeout, source_id=None):
+        """Block until the channel's seq passes *last_seq* or *timeout*
+        expires; returns the channel's latest seq."""
+        key = (sport, source_id)
+        with self._lock:
+            waiters = self._waiters.get(key)
+            if waiters is None:
+                waiters = self._waiters[key] = [threading.Condition(self._lock), 0]
+            waiters[1] += 1
+            try:
+                while self._seqs.get(key, 0) <= last_seq:
+                    if not waiters[0].wait(timeout=timeout):
+                        break  # timeout -> send keepalive
+            finally:
+                waiters[1] -= 1
+                if not waiters[1]:
+                    del self._waiters[key]
+            return self._seqs.get(key, 0)
+
+
 _clock_seq = 0
-_clock_condition = threading.Condition()
+_clock_channels = _UpdateChannels()
 _clock_snapshots = {}   # sport -> {field: val, ..., "_seq": N, "_source": source_id}
 _sse_connection_count = 0
 _sse_connection_lock = threading.Lock()
 SSE_MAX_CONNECTIONS = 50
 
+# --- Duplicate-frame short-circuit ---
+# OES controllers resend the same frame several times a second while nothing
+# on the board changes.  Remember the last raw frame per source and frame
+# kind (type byte + length, which determines the sport) so an identical
+# resend only refreshes the source's timestamps instead of being decoded,
+# remapped and stored again.
+_last_frame_by_source = {}   # source_id -> {(type, len): (frame, sport)}
+_frame_stats_by_source = {}  # source_id -> _FrameStats
+_frame_cache_generation = 0  # bumped by data_sources_changed()
+
+# --- Change journal ---
+# record_packet diffs each packet against the previous value for the same
+# (source, sport) and appends the changed fields here, so consumers can ship
+# deltas instead of whole snapshots.  Sequence numbers are global and
+# strictly increasing; the journal keeps the most recent _JOURNAL_SIZE
+# entries, so a consumer that falls further behind must resync from a full
+# snapshot.
+_JOURNAL_SIZE = 4096
+
+
+class _JournalEntry:
+    """One change-journal record; ``as_dict()`` is its public form."""
+
+    __slots__ = ("seq", "source", "sport", "changes", "removed", "received_at")
+
+    def __init__(self, seq, source, sport, changes, removed, received_at):
+        self.seq = seq
+        self.source = source
+        self.sport = sport
+        self.changes = changes
+        self.removed = removed
+        self.received_at = received_at
+
+    def as_dict(self):
+        return {
+            "seq": self.seq,
+            "source": self.source,
+            "sport": self.sport,
+            "changes": self.changes,
+            "removed": self.removed,
+            "received_at": self.received_at,
+        }
+
+
+_journal_seq = 0
+_change_journal = deque(maxlen=_JOURNAL_SIZE)
+_last_change_seq = {}     # (source_id, sport) -> seq of its latest journal entry
+_auto_locked_at_seq = {}  # sport -> _journal_seq when Auto mode last (re)locked
+_journal_channels = _UpdateChannels()  # published after new journal entries
+
+# --- Data versions (HTTP ETags) ---
+# Every write to a stored snapshot stamps it with the next value of one
+# global counter, so a version identifies a snapshot uniquely even when Auto
+# mode switches between sources.  Key ``(None, sport)`` tracks
+# ``parsed_data[sport]`` (the no-source fallback).  ``_sources_version``
+# changes whenever the output of get_sources_snapshot() would.
+_data_version_seq = 0
+_data_versions = {}  # (source_id | None, sport) -> version of latest write
+_sources_version = 0
+_json_cache = JsonCache()  # (source_id | None, sport) -> encoded snapshot
+
 # --- Accessor functions ---
 
 _STALE_TTL = 3600  # 1 hour
@@ -77,20 +224,28 @@ _STALE_TTL = 3600  # 1 hour
 # TOP/BOT.  Instead we track outs transitions:
 #   TOP  ──outs==3──▸ MID  ──outs<3──▸ BOT  ──outs==3──▸ END  ──outs<3──▸ TOP(+1)
 
+class _BaseballState:
+    """Inning state machine of one source."""
+
+    __slots__ = ("half", "inning", "prev_outs", "initialized")
+
+    def __init__(self, half="TOP", inning=1, prev_outs=None, initialized=False):
+        self.half = half
+        self.inning = inning
+        self.prev_outs = prev_outs
+        self.initialized = initialized
+
+
 _baseball_states = {}
 
 
 def _get_baseball_state(source_id):
     """Return (creating if needed) the baseball state for a given source."""
     key = source_id or "__default__"
-    if key not in _baseball_states:
-        _baseball_states[key] = {
-            "half": "TOP",
-            "inning": 1,
-            "prev_outs": None,
-            "initialized": False,
-        }
-    return _baseball_states[key]
+    state = _baseball_states.get(key)
+    if state is None:
+        state = _baseball_states[key] = _BaseballState()
+    return state
 
 
 def _ordinal(n):
@@ -119,7 +274,7 @@ def _bootstrap_baseball_state(parsed):
         inning = max(away_count + 1, 1)
         half = "MID" if outs == 3 else "TOP"
 
-    return {"half": half, "inning": inning, "prev_outs": outs, "initialized": True}
+    return _BaseballState(half, inning, outs, initialized=True)
 
 
 def _update_baseball_inning(parsed, source_id):
@@ -133,12 +288,11 @@ def _update_baseball_inning(parsed, source_id):
     outs_raw = str(parsed.get("outs", "")).strip()
     outs = int(outs_raw) if outs_raw.isdigit() else None
 
-    if not state["initialized"]:
-        bootstrapped = _bootstrap_baseball_state(parsed)
-        state.update(bootstrapped)
+    if not state.initialized:
+        state = _baseball_states[source_id or "__default__"] = _bootstrap_baseball_state(parsed)
     elif outs is not None:
-        half = state["half"]
-        inning = state["inning"]
+        half = state.half
+        inning = state.inning
 
         if outs == 3:
             # Half-inning just ended
@@ -154,11 +308,11 @@ def _update_baseball_inning(parsed, source_id):
                 half = "TOP"
                 inning += 1
 
-        state["half"] = half
-        state["inning"] = inning
-        state["prev_outs"] = outs
+        state.half = half
+        state.inning = inning
+        state.prev_outs = outs
 
-    return state["half"], state["inning"]
+    return state.half, state.inning
 
 
 def reset_baseball_state(source_id=None):
@@ -169,18 +323,33 @@ def reset_baseball_state(source_id=None):
     with parsed_data_lock:
         if source_id is not None:
             _baseball_states.pop(source_id or "__default__", None)
+            _last_frame_by_source.pop(source_id or "unknown", None)
         else:
             _baseball_states.clear()
+            _last_frame_by_source.clear()
 
 
-def record_packet(sport, parsed, source_id):
-    """Thread-safe: store a parsed packet in the global data stores."""
+def record_packet(sport, parsed, source_id, frame=None, frame_generation=None):
+    """Thread-safe: store a parsed packet in the global data stores.
+
+    *frame* is the raw packet the data was decoded from; when given it is
+    remembered so identical resends can skip decoding (see
+    ``_touch_duplicate_frame``).  *frame_generation* is the value of
+    ``_frame_cache_generation`` read before sport overrides were applied;
+    the frame is only cached if the source config has not changed since.
+    """
     received_at = time.time()
     if source_id is None:
         source_id = "unknown"
 
-    should_notify = False
+    clock_seq = journal_seq = None
     with parsed_data_lock:
+        if frame is not None:
+            if frame_generation == _frame_cache_generation:
+                _last_frame_by_source.setdefault(source_id, {})[
+                    (frame[1], len(frame))
+                ] = (frame, sport)
+            _frame_stats_locked(source_id).decoded += 1
         if sport not in parsed_data:
             parsed_data[sport] = {}
         # Baseball inning enrichment
@@ -193,17 +362,25 @@ def record_packet(sport, parsed, source_id):
                 "inning_display": f"{half} {_ordinal(inning)}",
             }
 
-        parsed_with_meta = {
-            **parsed,
-            "_meta": {
-                "source": source_id,
-                "received_at": received_at,
+        parsed_with_meta = Snapshot(
+            {
+                **parsed,
+                "_meta": {
+                    "source": source_id,
+                    "received_at": received_at,
+                },
             },
-        }
+            _data_version_seq + 1,  # what _bump_data_version() assigns below
+        )
+
+        previous = parsed_data_by_source.get(source_id, {}).get(sport)
+        if _journal_changes(sport, source_id, previous, parsed, received_at):
+            journal_seq = _journal_seq
 
         parsed_data[sport] = parsed_with_meta
         parsed_data_by_source.setdefault(source_id, {})[sport] = parsed_with_meta
-        last_seen_by_source[source_id] = received_at
+        _mark_seen_locked(source_id, received_at)
+        _bump_data_version(source_id, sport)
 
         # Clock SSE notification
         clock_keys = CLOCK_FIELDS.get(sport)
@@ -217,100 +394,330 @@ def record_packet(sport, parsed, source_id):
                 global _clock_seq
                 _clock_seq += 1
                 new_clock["_seq"] = _clock_seq
-                _clock_snapshots[sport] = new_clock
-                should_notify = True
+                _clock_snapshots[sport] = Snapshot(new_clock, _clock_seq)
+                clock_seq = _clock_seq
 
     # Notify outside parsed_data_lock to avoid nested lock acquisition
-    if should_notify:
-        with _clock_condition:
-            _clock_condition.notify_all()
+    if clock_seq is not None:
+        _clock_channels.publish(sport, source_id, clock_seq)
+        store_changes.publish("clock", sport)
+    if journal_seq is not None:
+        _journal_channels.publish(sport, source_id, journal_seq)
+    store_changes.publish("sport", sport)
+    store_changes.publish("sources")
+
+
+def _journal_changes(sport, source_id, previous, parsed, received_at):
+    """Append the fields of *parsed* that differ from *previous* to the
+    change journal; returns True if an entry was added.  Must be called
+    under parsed_data_lock."""
+    global _journal_seq
+    if previous is None:
+        previous = {}
+    changes = {
+        key: value
+        for key, value in parsed.items()
+        if key not in previous or previous[key] != value
+    }
+    removed = [key for key in previous if key != "_meta" and key not in parsed]
+    if not changes and not removed:
+        return False
+
+    _journal_seq += 1
+    _last_change_seq[(source_id, sport)] = _journal_seq
+    _change_journal.append(
+        _JournalEntry(_journal_seq, source_id, sport, changes, removed, received_at)
+    )
+    return True
+
+
+def _bump_data_version(source_id, sport):
+    """Stamp a new version on the stored *sport* snapshot of *source_id*
+    (and on the fallback copy).  Must be called under parsed_data_lock."""
+    global _data_version_seq, _sources_version
+    _data_version_seq += 1
+    _data_versions[(source_id, sport)] = _data_version_seq
+    _data_versions[(None, sport)] = _data_version_seq
+    _sources_version += 1
+
+
+def get_sport_data_version(sport, source_id=None):
+    """Thread-safe: version of what ``get_sport_data(sport, source_id)``
+    returns; changes whenever that result does.  Read it *before* the data so
+    a concurrent write can only make the version older than the data."""
+    sid = _select_source(sport, source_id)
+    return _data_versions.get((sid, sport), 0)
+
+
+def get_sources_version():
+    """Version of the source list behind ``get_sources_snapshot()``, not
+    counting the ever-growing ``age_seconds``."""
+    return _sources_version
+
+
+def get_journal_seq():
+    """Sequence number of the newest change journal entry (0 if none)."""
+    return _journal_seq
+
+
+def wait_for_journal_update(sport, last_seq, timeout=15.0, source_id=None):
+    """Block until a journal entry for *sport* (from *source_id*, or from
+    any source when ``None``) lands after *last_seq*, or *timeout* expires.
+    Returns the seq of the newest such entry."""
+    return _journal_channels.wait(sport, last_seq, timeout, source_id)
+
+
+def _journal_covers_locked(seq):
+    """True if every journal entry after *seq* is still retained."""
+    return seq <= _journal_seq and (
+        not _change_journal or _change_journal[0].seq <= seq + 1
+    )
+
+
+def _changes_since_locked(seq, sport=None, source_id=None):
+    """Journal entries newer than *seq* plus the completeness flag.
+
+    Must be called under parsed_data_lock.
+    """
+    complete = _journal_covers_locked(seq)
+    entries = []
+    for entry in reversed(_change_journal):
+        if entry.seq <= seq:
+            break
+        if sport is not None and entry.sport != sport:
+            continue
+        if source_id is not None and entry.source != source_id:
+            continue
+        entries.append(entry)
+    entries.reverse()
+    return entries, complete
+
+
+def get_changes_since(seq, sport=None, source_id=None):
+    """Thread-safe: journal entries newer than *seq*, oldest first.
+
+    Optionally filtered by *sport* and/or *source_id*.  Returns
+    ``(entries, latest_seq, complete)`` where *complete* is False when
+    entries after *seq* have already been evicted from the bounded journal,
+    or *seq* is from the future (e.g. issued before a restart); the caller
+    must then resync from a full snapshot.  Each entry is a dict with
+    ``seq``, ``source``, ``sport``, ``changes``, ``removed`` and
+    ``received_at``; its ``changes`` and ``removed`` are shared, so treat
+    them as read-only.
+    """
+    with parsed_data_lock:
+        entries, complete = _changes_since_locked(seq, sport, source_id)
+        latest = _journal_seq
+    return [entry.as_dict() for entry in entries], latest, complete
+
+
+def _mark_seen_locked(source_id, received_at):
+    """Record that *source_id* was just heard from.  Must be called under
+    parsed_data_lock, after its data has been stored.
+
+    ``last_seen_by_source`` is per source, not per sport, so the source
+    becomes the freshest one for every sport it has data for.
+    """
+    last_seen_by_source[source_id] = received_at
+    for sport in parsed_data_by_source.get(source_id, ()):
+        order = _sources_by_freshness.get(sport)
+        if order is None:
+            order = _sources_by_freshness[sport] = OrderedDict()
+        order[source_id] = None
+        order.move_to_end(source_id)
+
+
+def _freshest_source_locked(sport):
+    """Most recently seen source with *sport* data, or None.  Must be
+    called under parsed_data_lock."""
+    order = _sources_by_freshness.get(sport)
+    if not order:
+        return None
+    return next(reversed(order))
+
+
+def _select_source(sport, source_id=None):
+    """Lock-free front end of ``_select_source_locked``.
+
+    While Auto mode's sticky source is still fresh the answer only depends
+    on a few dict lookups, so no lock is taken; choosing (or re-choosing) a
+    source falls back to the locked path.
+    """
+    if source_id:
+        return source_id
+    sticky_sid = _auto_sticky_source.get(sport)
+    if (
+        sticky_sid
+        and parsed_data_by_source.get(sticky_sid, {}).get(sport)
+        and time.time() - last_seen_by_source.get(sticky_sid, 0) < _AUTO_STICKY_TTL
+    ):
+        return sticky_sid
+    with parsed_data_lock:
+        return _select_source_locked(sport)
+
+
+def _select_source_locked(sport, source_id=None):
+    """Return the source whose *sport* data should be served, or None.
+
+    Must be called under parsed_data_lock.  An explicit *source_id* is
+    returned as-is.  When *source_id* is ``None`` (Auto mode) and multiple
+    sources broadcast the same sport, we stick to whichever source was
+    previously returned for up to ``_AUTO_STICKY_TTL`` seconds.  This
+    prevents rapid flipping between two OES controllers (e.g. men's &
+    women's basketball during concurrent practices).
+    """
+    if source_id:
+        return source_id
+
+    # --- Auto mode with source stickiness ---
+    now = time.time()
+    sticky_sid = _auto_sticky_source.get(sport)
+
+    # Check if the sticky source is still alive and has data for this sport
+    if sticky_sid:
+        sticky_ts = last_seen_by_source.get(sticky_sid, 0)
+        sticky_data = parsed_data_by_source.get(sticky_sid, {}).get(sport)
+        if sticky_data and (now - sticky_ts) < _AUTO_STICKY_TTL:
+            return sticky_sid
+        # Sticky source went stale — release it
+        _auto_sticky_source.pop(sport, None)
+
+    # No sticky source (or it expired). Pick the freshest source for
+    # this sport and lock onto it.
+    best_sid = _freshest_source_locked(sport)
+    if best_sid:
+        _auto_sticky_source[sport] = best_sid
+        _auto_locked_at_seq[sport] = _journal_seq
+    return best_sid
 
 
 def get_sport_data(sport, source_id=None):
     """Thread-safe: retrieve latest data for a sport.
 
-    When *source_id* is ``None`` (Auto mode) and multiple sources broadcast
-    the same sport, we stick to whichever source was previously returned
-    for up to ``_AUTO_STICKY_TTL`` seconds.  This prevents rapid flipping
-    between two OES controllers (e.g. men's & women's basketball during
-    concurrent practices).
+    Returns the stored read-only ``Snapshot`` itself, not a copy; its
+    ``version`` is what ``get_sport_data_version`` reports for it.  See
+    ``_select_source_locked`` for how Auto mode (``source_id=None``) picks
+    a source.
     """
-    with parsed_data_lock:
-        if source_id:
-            return dict(parsed_data_by_source.get(source_id, {}).get(sport, {}))
+    sid = _select_source(sport, source_id)
+    if sid is None:
+        return freeze(parsed_data.get(sport))
+    return freeze(parsed_data_by_source.get(sid, {}).get(sport))
 
-        # --- Auto mode with source stickiness ---
-        now = time.time()
-        sticky_sid = _auto_sticky_source.get(sport)
-
-        # Check if the sticky source is still alive and has data for this sport
-        if sticky_sid:
-            sticky_ts = last_seen_by_source.get(sticky_sid, 0)
-            sticky_data = parsed_data_by_source.get(sticky_sid, {}).get(sport)
-            if sticky_data and (now - sticky_ts) < _AUTO_STICKY_TTL:
-                return dict(sticky_data)
-            # Sticky source went stale — release it
-            _auto_sticky_source.pop(sport, None)
-
-        # No sticky source (or it expired). Pick the freshest source for
-        # this sport and lock onto it.
-        best_sid = None
-        best_ts = 0
-        for sid, src_data in parsed_data_by_source.items():
-            if sport in src_data:
-                ts = last_seen_by_source.get(sid, 0)
-                if ts > best_ts:
-                    best_ts = ts
-                    best_sid = sid
-
-        if best_sid:
-            _auto_sticky_source[sport] = best_sid
-            return dict(parsed_data_by_source[best_sid][sport])
-
-        return dict(parsed_data.get(sport, {}))
+
+def get_sport_data_json(sport, source_id=None):
+    """Thread-safe: ``get_sport_data(sport, source_id)`` as JSON bytes.
+
+    Each stored snapshot is encoded at most once, by the first reader after
+    it was replaced; everyone else polling it gets the same bytes.
+    """
+    sid = _select_source(sport, source_id)
+    key = (sid, sport)
+    version = _data_versions.get(key, 0)
+    if sid is None:
+        data = parsed_data.get(sport, {})
+    else:
+        data = parsed_data_by_source.get(sid, {}).get(sport, {})
+    if not version:
+        # Nothing recorded under this key (e.g. an unknown ?source=); don't
+        # let arbitrary client-supplied ids grow the cache.
+        return encode_json(data)
+    return _json_cache.get(key, version, data)
+
+
+def get_sport_changes(sport, since, source_id=None):
+    """Thread-safe: what changed in ``get_sport_data(sport, source_id)``
+    after journal sequence *since*.
+
+    Returns ``None`` when nothing changed.  Otherwise returns a dict with
+    the new ``seq`` (pass it back as *since* next time) and either
+    ``{"full": True, "data": {...}}`` when the caller must replace its copy
+    (first request, journal gap, or Auto mode switched sources) or
+    ``{"full": False, "changes": {...}, "removed": [...], "_meta": {...}}``.
+    """
+    with parsed_data_lock:
+        sid = _select_source_locked(sport, source_id)
+        latest = _journal_seq
+        data = parsed_data_by_source.get(sid, {}).get(sport) if sid else None
+
+        last_change = _last_change_seq.get((sid, sport))
+        if last_change is None and not _journal_covers_locked(since):
+            # History for this pair was pruned after the caller's cursor.
+            last_change = latest + 1
+        if (
+            since > 0
+            and since <= latest
+            and _auto_locked_at_seq.get(sport, 0) <= since
+            and (last_change or 0) <= since
+        ):
+            return None
+
+        entries, complete = _changes_since_locked(since, sport, sid)
+        if since <= 0 or not complete or sid is None or (
+            source_id is None and _auto_locked_at_seq.get(sport, 0) > since
+        ):
+            if data is None:
+                # Only Auto mode falls back to the merged view; an explicit
+                # source without data has none, as in get_sport_data().
+                data = parsed_data.get(sport, {}) if source_id is None else {}
+            return {"seq": latest, "full": True, "data": dict(data)}
+
+        changes = {}
+        removed = set()
+        for entry in entries:
+            changes.update(entry.changes)
+            removed.difference_update(entry.changes)
+            for key in entry.removed:
+                changes.pop(key, None)
+                removed.add(key)
+        return {
+            "seq": latest,
+            "full": False,
+            "changes": changes,
+            "removed": sorted(removed),
+            "_meta": dict((data or {}).get("_meta", {})),
+        }
 
 
 def get_sources_snapshot():
     """Thread-safe: return list of source info dicts.
 
     Includes a friendly ``name`` for each source by cross-referencing the
-    configured ``data_sources`` list.  Lock ordering: ``data_sources_lock``
-    first, then ``parsed_data_lock`` (no existing code acquires them in
-    reverse order).
+    configured ``data_sources`` list.  Reads the stores without
+    ``parsed_data_lock``: ``list()`` of a dict is a single C-level step, so
+    it cannot observe a half-applied write.
     """
     now = time.time()
     with data_sources_lock:
         name_by_id = {s["id"]: s.get("name", s["id"]) for s in data_sources}
-    with parsed_data_lock:
-        return [
-            {
-                "source": source_id,
-                "name": name_by_id.get(source_id, source_id),
-                "last_seen": last_seen,
-                "age_seconds": round(now - last_seen, 3),
-                "sports": list(parsed_data_by_source.get(source_id, {}).keys()),
-            }
-            for source_id, last_seen in last_seen_by_source.items()
-        ]
+    return [
+        {
+            "source": source_id,
+            "name": name_by_id.get(source_id, source_id),
+            "last_seen": last_seen,
+            "age_seconds": round(now - last_seen, 3),
+            "sports": list(parsed_data_by_source.get(source_id, {})),
+        }
+        for source_id, last_seen in list(last_seen_by_source.items())
+    ]
 
 
 def get_clock_snapshot(sport):
-    """Return latest clock snapshot for a sport (or None)."""
+    """Return latest clock snapshot for a sport (or None).  Its version is
+    its ``_seq``."""
     snap = _clock_snapshots.get(sport)
-    return dict(snap) if snap else None
+    return freeze(snap) if snap else None
 
 
 def get_clock_seq():
     return _clock_seq
 
 
-def wait_for_clock_update(last_seq, timeout=15.0):
-    """Block until clock seq advances past last_seq, or timeout (for keepalive)."""
-    with _clock_condition:
-        while _clock_seq <= last_seq:
-            if not _clock_condition.wait(timeout=timeout):
-                break  # timeout -> send keepalive
-        return _clock_seq
+def wait_for_clock_update(sport, last_seq, timeout=15.0, source_id=None):
+    """Block until *sport*'s clock (as set by *source_id*, or by any source
+    when ``None``) changes after seq *last_seq*, or timeout (for keepalive).
+    Returns the seq of that latest change."""
+    return _clock_channels.wait(sport, last_seq, timeout, source_id)
 
 
 def sse_connection_acquire():
@@ -330,22 +737,126 @@ def sse_connection_release():
 
 def purge_stale_sources():
     """Remove sources not seen within _STALE_TTL seconds."""
+    global _sources_version
     cutoff = time.time() - _STALE_TTL
     with parsed_data_lock:
         stale = [sid for sid, ts in last_seen_by_source.items() if ts < cutoff]
+        now = time.time()
+        removed = []  # (sport, source_id, journal seq) to publish
+        changed_sports = set()
+        if stale:
+            _sources_version += 1
         for sid in stale:
             last_seen_by_source.pop(sid, None)
-            parsed_data_by_source.pop(sid, None)
+            for sport, data in parsed_data_by_source.pop(sid, {}).items():
+                changed_sports.add(sport)
+                order = _sources_by_freshness.get(sport)
+                if order is not None:
+                    order.pop(sid, None)
+                if _journal_changes(sport, sid, data, {}, now):
+                    removed.append((sport, sid, _journal_seq))
+                _data_versions.pop((sid, sport), None)
+                _json_cache.discard((sid, sport))
+            _last_frame_by_source.pop(sid, None)
+            _frame_stats_by_source.pop(sid, None)
+        # Forget change sequences of departed sources once the journal no
+        # longer holds their history (get_sport_changes then resyncs).
+        for key, seq in list(_last_change_seq.items()):
+            if key[0] not in parsed_data_by_source and not _journal_covers_locked(seq):
+                del _last_change_seq[key]
+    for sport, sid, seq in removed:
+        _journal_channels.publish(sport, sid, seq)
+    for sport in changed_sports:
+        store_changes.publish("sport", sport)
+    if stale:
+        store_changes.publish("sources")
+
+
+class _FrameStats:
+    """Per-source counts of decoded vs. deduplicated frames."""
+
+    __slots__ = ("decoded", "deduplicated")
+
+    def __init__(self):
+        self.decoded = 0
+        self.deduplicated = 0
+
+    def as_dict(self):
+        return {"decoded": self.decoded, "deduplicated": self.deduplicated}
+
+
+def _frame_stats_locked(source_id):
+    """Return (creating if needed) the frame counters of a source.  Must be
+    called under parsed_data_lock."""
+    stats = _frame_stats_by_source.get(source_id)
+    if stats is None:
+        stats = _frame_stats_by_source[source_id] = _FrameStats()
+    return stats
+
+
+def _touch_duplicate_frame(frame, source_id):
+    """Refresh timestamps if *frame* repeats the source's last frame of its kind.
+
+    Returns True when the frame was a duplicate and has been fully handled.
+    Falls back to a normal decode whenever the short-circuit could change
+    what readers see: nothing stored yet for that sport, or another source
+    has taken over the sport's clock snapshot since.
+    """
+    if len(frame) < 3:
+        return False
+
+    with parsed_data_lock:
+        cached = _last_frame_by_source.get(source_id, {}).get((frame[1], len(frame)))
+        if cached is None or cached[0] != frame:
+            return False
+
+        sport = cached[1]
+        stored = parsed_data_by_source.get(source_id, {}).get(sport)
+        if stored is None:
+            return False
+        clock = _clock_snapshots.get(sport)
+        if clock is not None and clock.get("_source") != source_id:
+            return False
+
+        received_at = time.time()
+        # Publish a new snapshot: readers may be encoding the old one.
+        stored = Snapshot(
+            {**stored, "_meta": {"source": source_id, "received_at": received_at}},
+            _data_version_seq + 1,
+        )
+        parsed_data_by_source[source_id][sport] = stored
+        parsed_data[sport] = stored
+        _mark_seen_locked(source_id, received_at)
+        _bump_data_version(source_id, sport)
+        _frame_stats_locked(source_id).deduplicated += 1
+    store_changes.publish("sport", sport)
+    store_changes.publish("sources")
+    return True
+
+
+def get_frame_stats():
+    """Thread-safe: per-source counts of decoded vs. deduplicated frames."""
+    with parsed_data_lock:
+        return {sid: stats.as_dict() for sid, stats in _frame_stats_by_source.items()}
 
 
 # --- handle_serial_packet ---
 
 
 def handle_serial_packet(packet, source_id=None):
-    sport, parsed = identify_and_parse(packet)
+    if source_id is None:
+        source_id = "unknown"
+    frame = bytes(packet)
+    if _touch_duplicate_frame(frame, source_id):
+        return
+
+    generation = _frame_cache_generation
+    sport, parsed = identify_and_parse(frame)
     if sport and parsed is not None:
         sport, parsed = _apply_sport_overrides(sport, parsed, source_id)
-        record_packet(sport, parsed, source_id)
+        record_packet(
+            sport, parsed, source_id, frame=frame, frame_generation=generation
+        )
 
 
 # --- Serial reader ---
@@ -361,7 +872,7 @@ def serial_port_reader(port, stop_event):
         print(f"Failed to open serial port {port}: {exc}")
         return
 
-    parser = PacketStreamParser()
+    parser = BulkPacketStreamParser()
 
     try:
         while not stop_event.is_set():
@@ -403,79 +914,230 @@ def stop_serial_reader():
 
 # --- TCP client (outbound connections to OES controllers) ---
 
-tcp_client_threads = {}
-tcp_client_events = {}
-tcp_clients_lock = threading.Lock()
+_TCP_CONNECT_TIMEOUT = 5.0
+_TCP_BACKOFF_MIN = 1.0
+_TCP_BACKOFF_MAX = 10.0
+_TCP_RECV_SIZE = 4096
+
+
+class _TcpClient:
+    """Connection state of one outbound data source (owned by the mux thread)."""
+
+    __slots__ = ("source_id", "address", "parser", "backoff", "sock", "connected", "deadline")
 
+    def __init__(self, source):
+        self.source_id = source["id"]
+        self.address = (source["host"], source["port"])
+        self.parser = BulkPacketStreamParser()
+        self.backoff = _TCP_BACKOFF_MIN
+        self.sock = None
+        self.connected = False
+        self.deadline = 0.0  # connect timeout, or end of backoff when sock is None
 
-def tcp_client_worker(source):
-    source_id = source["id"]
-    host = source["host"]
-    port = source["port"]
 
-    stop_event = tcp_client_events[source_id]
-    parser = PacketStreamParser()
-    backoff = 1.0
+class _TcpClientMux:
+    """Drives every outbound TCP data source from one ``selectors`` loop.
+
+    Per source the behaviour matches the old thread-per-source worker:
+    connect with a 5 s timeout, read 4096-byte chunks into a parser that
+    survives reconnects, and after any failure or disconnect wait ``backoff``
+    seconds (1 s, doubling up to 10 s, reset on connect) before retrying.
+    The loop sleeps in ``select()`` until a socket is ready or the next
+    deadline, so idle sources cost no wakeups.  ``start``/``stop`` are
+    thread-safe and take effect via a wakeup socket.
+
+    Host names are resolved on the loop thread; data sources are normally
+    configured by IP address.
+    """
 
-    while not stop_event.is_set():
-        conn = None
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._commands = deque()
+        self._clients = {}  # source_id -> _TcpClient (mux thread only)
+        self._selector = None
+        self._wake_r = self._wake_w = None
+        self._thread = None
+        self._recv_buffer = memoryview(bytearray(_TCP_RECV_SIZE))  # mux thread only
+        self.wakeups = 0
+
+    def start(self, source):
+        self._submit(("start", source, None))
+
+    def stop(self, source_id, timeout=2.0):
+        """Disconnect *source_id*; waits until its socket has been closed."""
+        done = threading.Event()
+        self._submit(("stop", source_id, done))
+        done.wait(timeout)
+
+    def source_ids(self):
+        with self._lock:
+            return set(self._clients)
+
+    def _submit(self, command):
+        with self._lock:
+            if self._thread is None:
+                self._selector = selectors.DefaultSelector()
+                self._wake_r, self._wake_w = socket.socketpair()
+                self._wake_r.setblocking(False)
+                self._selector.register(self._wake_r, selectors.EVENT_READ, None)
+                self._thread = threading.Thread(
+                    target=self._run, name="tcp-clients", daemon=True
+                )
+                self._thread.start()
+            self._commands.append(command)
         try:
-            conn = socket.create_connection((host, port), timeout=5)
-            conn.settimeout(1.0)
-            print(f"Connected to TCP source {source_id}")
-            backoff = 1.0
+            self._wake_w.send(b"\0")
+        except OSError:
+            pass  # wakeup buffer full: the loop is already due to run
 
-            while not stop_event.is_set():
-                try:
-                    data = conn.recv(4096)
-                except socket.timeout:
-                    continue
-                except Exception as exc:
-                    print(f"TCP read error from {source_id}: {exc}")
-                    break
+    def _run(self):
+        while True:
+            try:
+                self._run_once()
+            except Exception as exc:
+                # Whatever went wrong, the thread serves every source: keep it.
+                print(f"TCP client loop error: {exc}")
+                time.sleep(0.1)
+
+    def _run_once(self):
+        now = time.monotonic()
+        deadlines = [c.deadline for c in self._clients.values() if not c.connected]
+        timeout = max(0.0, min(deadlines) - now) if deadlines else None
+        events = self._selector.select(timeout)
+        self.wakeups += 1
+        for key, _mask in events:
+            client = key.data
+            if client is None:
+                self._drain_commands()
+                continue
+            if self._clients.get(client.source_id) is not client:
+                continue  # stopped by a command earlier in this batch
+            try:
+                if client.connected:
+                    self._read(client)
+                else:
+                    self._finish_connect(client)
+            except Exception as exc:
+                self._fail(client, f"TCP error for {client.source_id}: {exc}")
+        now = time.monotonic()
+        for client in list(self._clients.values()):
+            if client.connected or client.deadline > now:
+                continue
+            if client.sock is None:
+                self._connect(client)
+            else:
+                self._fail(client, f"TCP connect error for {client.source_id}: timed out")
 
-                if not data:
-                    break
+    def _drain_commands(self):
+        try:
+            while self._wake_r.recv(4096):
+                pass
+        except (BlockingIOError, InterruptedError):
+            pass
+        while True:
+            with self._lock:
+                if not self._commands:
+                    return
+                action, arg, done = self._commands.popleft()
+            if action == "start":
+                if arg["id"] not in self._clients:
+                    try:
+                        client = _TcpClient(arg)
+                    except Exception as exc:
+                        print(f"Invalid TCP source {arg.get('id')}: {exc}")
+                        continue
+                    with self._lock:
+                        self._clients[client.source_id] = client
+                    self._connect(client)
+            else:
+                with self._lock:
+                    client = self._clients.pop(arg, None)
+                if client is not None:
+                    self._close(client)
+                done.set()
+
+    def _connect(self, client):
+        sock = None
+        try:
+            family, type_, proto, _name, addr = socket.getaddrinfo(
+                *client.address, type=socket.SOCK_STREAM
+            )[0]
+            sock = socket.socket(family, type_, proto)
+            sock.setblocking(False)
+            err = sock.connect_ex(addr)
+        except Exception as exc:  # OSError, or UnicodeError for a bad host name
+            print(f"TCP connect error for {client.source_id}: {exc}")
+            if sock is not None:
+                sock.close()
+            self._retry_later(client)
+            return
+        client.sock = sock
+        client.deadline = time.monotonic() + _TCP_CONNECT_TIMEOUT
+        if err in (0, errno.EINPROGRESS, errno.EWOULDBLOCK, errno.EALREADY):
+            self._selector.register(sock, selectors.EVENT_WRITE, client)
+        else:
+            self._fail(client, f"TCP connect error for {client.source_id}: {os.strerror(err)}")
 
-                for packet in parser.feed_bytes(data):
-                    handle_serial_packet(packet, source_id=source_id)
+    def _finish_connect(self, client):
+        err = client.sock.getsockopt(socket.SOL_SOCKET, socket.SO_ERROR)
+        if err:
+            self._fail(client, f"TCP connect error for {client.source_id}: {os.strerror(err)}")
+            return
+        client.connected = True
+        client.backoff = _TCP_BACKOFF_MIN
+        self._selector.modify(client.sock, selectors.EVENT_READ, client)
+        print(f"Connected to TCP source {client.source_id}")
+
+    def _read(self, client):
+        try:
+            nbytes = client.sock.recv_into(self._recv_buffer)
+        except (BlockingIOError, InterruptedError):
+            return
+        except OSError as exc:
+            self._fail(client, f"TCP read error from {client.source_id}: {exc}")
+            return
+        if not nbytes:
+            self._fail(client, None)
+            return
+        try:
+            for packet in client.parser.feed_bytes(self._recv_buffer[:nbytes]):
+                handle_serial_packet(packet, source_id=client.source_id)
         except Exception as exc:
-            print(f"TCP connect error for {source_id}: {exc}")
-        finally:
-            if conn is not None:
-                try:
-                    conn.close()
-                except Exception:
-                    pass
+            self._fail(client, f"TCP handler error for {client.source_id}: {exc}")
 
-        if stop_event.is_set():
-            break
+    def _fail(self, client, message):
+        if message:
+            print(message)
+        self._close(client)
+        self._retry_later(client)
+
+    def _retry_later(self, client):
+        client.deadline = time.monotonic() + client.backoff
+        client.backoff = min(client.backoff * 2, _TCP_BACKOFF_MAX)
+
+    def _close(self, client):
+        if client.sock is not None:
+            try:
+                self._selector.unregister(client.sock)
+            except (KeyError, ValueError):
+                pass
+            try:
+                client.sock.close()
+            except Exception:
+                pass
+        client.sock = None
+        client.connected = False
 
-        if stop_event.wait(backoff):
-            break
-        backoff = min(backoff * 2, 10.0)
+
+_tcp_clients = _TcpClientMux()
 
 
 def start_tcp_client(source):
-    source_id = source["id"]
-    with tcp_clients_lock:
-        if source_id in tcp_client_threads:
-            return
-        stop_event = threading.Event()
-        tcp_client_events[source_id] = stop_event
-        thread = threading.Thread(target=tcp_client_worker, args=(source,), daemon=True)
-        tcp_client_threads[source_id] = thread
-        thread.start()
+    _tcp_clients.start(source)
 
 
 def stop_tcp_client(source_id):
-    with tcp_clients_lock:
-        event = tcp_client_events.pop(source_id, None)
-        thread = tcp_client_threads.pop(source_id, None)
-    if event:
-        event.set()
-    if thread:
-        thread.join(timeout=2)
+    _tcp_clients.stop(source_id)
 
 
 # --- Network listeners (inbound TCP server + UDP) ---
@@ -483,61 +1145,289 @@ def stop_tcp_client(source_id):
 _network_stop_event = threading.Event()
 _tcp_thread = None
 _udp_thread = None
-_tcp_server_socket = None
+_tcp_server = None
 _udp_socket = None
+_udp_peers = None
+
+
+class _UdpPeer:
+    """Stream parser and counters of one UDP sender."""
+
+    __slots__ = ("source_id", "parser", "frames", "last_seen")
+
+    def __init__(self, addr):
+        self.source_id = f"udp:{addr[0]}:{addr[1]}"
+        self.parser = BulkPacketStreamParser()
+        self.frames = 0
+        self.last_seen = 0.0
+
+
+class _UdpPeers:
+    """Per-``(addr, port)`` parsers for the UDP listener, least recently
+    heard first.
+
+    Datagrams from different controllers must not share a partial-frame
+    buffer.  At most ``max_peers`` senders are tracked: a new sender evicts
+    the least recently heard one, and ``expire`` drops senders silent for
+    ``idle_timeout`` seconds.  Only the listener thread calls ``feed`` and
+    ``expire``; the lock keeps ``stats`` consistent.
+    """
+
+    def __init__(
+        self, max_peers=DEFAULT_UDP_MAX_PEERS, idle_timeout=DEFAULT_UDP_PEER_IDLE_TIMEOUT
+    ):
+        self.max_peers = max(1, max_peers)
+        self.idle_timeout = idle_timeout
+        self.evicted = 0
+        self._peers = OrderedDict()
+        self._lock = threading.Lock()
+
+    def feed(self, addr, data):
+        """Parse *data* from *addr*; returns ``(source_id, packets)``."""
+        now = time.monotonic()
+        with self._lock:
+            peer = self._peers.get(addr)
+            if peer is None:
+                if len(self._peers) >= self.max_peers:
+                    self._peers.popitem(last=False)
+                    self.evicted += 1
+                peer = self._peers[addr] = _UdpPeer(addr)
+            else:
+                self._peers.move_to_end(addr)
+            peer.last_seen = now
+        packets = peer.parser.feed_bytes(data)
+        peer.frames += len(packets)
+        return peer.source_id, packets
+
+    def expire(self):
+        if not self.idle_timeout:
+            return
+        cutoff = time.monotonic() - self.idle_timeout
+        with self._lock:
+            while self._peers:
+                addr, peer = next(iter(self._peers.items()))
+                if peer.last_seen >= cutoff:
+                    break
+                del self._peers[addr]
+                self.evicted += 1
+
+    def stats(self):
+        with self._lock:
+            return {
+                "tracked": len(self._peers),
+                "evicted": self.evicted,
+                "peers": {
+                    peer.source_id: {"frames": peer.frames, "resyncs": peer.parser.resyncs}
+                    for peer in self._peers.values()
+                },
+            }
 
 
 def udp_listener(port, stop_event):
-    global _udp_socket
-    parser = PacketStreamParser()
+    global _udp_socket, _udp_peers
+    peers = _UdpPeers()
 
     try:
         _udp_socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
         _udp_socket.bind(("0.0.0.0", port))
-        _udp_socket.settimeout(1.0)
+        receiver = DatagramReceiver(_udp_socket, slot_size=4096)
         print(f"UDP listener bound to 0.0.0.0:{port}")
     except Exception as exc:
         print(f"Failed to start UDP listener on {port}: {exc}")
         return
+    _udp_peers = peers
 
+    next_expire = time.monotonic() + 1.0
     try:
         while not stop_event.is_set():
+            if time.monotonic() >= next_expire:
+                peers.expire()
+                next_expire = time.monotonic() + 1.0
             try:
-                data, _addr = _udp_socket.recvfrom(4096)
-            except socket.timeout:
-                continue
+                batch = receiver.receive(1.0)
             except Exception as exc:
                 print(f"UDP receive error: {exc}")
                 break
 
-            for packet in parser.feed_bytes(data):
-                handle_serial_packet(packet, source_id=f"udp:{_addr[0]}:{_addr[1]}")
+            for data, addr in batch:
+                source_id, packets = peers.feed(addr, data)
+                for packet in packets:
+                    handle_serial_packet(packet, source_id=source_id)
     finally:
+        receiver.close()
         try:
             _udp_socket.close()
         except Exception:
             pass
 
 
-def tcp_connection_reader(conn, addr, stop_event):
-    parser = PacketStreamParser()
-    conn.settimeout(1.0)
-    try:
-        while not stop_event.is_set():
+def get_udp_listener_stats():
+    """Per-sender frame/resync counters of the UDP listener (``None`` if not running)."""
+    peers = _udp_peers
+    return peers.stats() if peers is not None else None
+
+
+class _TcpServer:
+    """Inbound TCP server: one ``selectors`` loop for the listening socket
+    and every accepted connection.
+
+    At most ``max_connections`` peers are served; further connections are
+    accepted and closed straight away so they do not sit in the backlog.
+    A peer is dropped when it sends nothing for ``idle_timeout`` seconds or
+    when more than ``max_buffer`` bytes pile up without completing a frame.
+    The loop wakes at least once per second to check the stop event and
+    idle deadlines, however many peers are connected.
+    """
+
+    def __init__(
+        self,
+        port,
+        max_connections=DEFAULT_TCP_MAX_CONNECTIONS,
+        backlog=DEFAULT_TCP_BACKLOG,
+        idle_timeout=DEFAULT_TCP_IDLE_TIMEOUT,
+        max_buffer=DEFAULT_TCP_MAX_BUFFER,
+    ):
+        self.port = port
+        self.max_connections = max_connections
+        self.backlog = backlog
+        self.idle_timeout = idle_timeout
+        self.max_buffer = max_buffer
+        self.sock = None
+        self._selector = None
+        self._conns = {}  # socket -> [source_id, parser, last_activity]
+        self._recv_buffer = memoryview(bytearray(4096))
+        self._lock = threading.Lock()
+        self._stats = {
+            "connections": 0,
+            "peak": 0,
+            "accepted": 0,
+            "rejected": 0,
+            "idle_closed": 0,
+            "overflow_closed": 0,
+        }
+
+    def bind(self):
+        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        try:
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+            sock.bind(("0.0.0.0", self.port))
+            sock.listen(self.backlog)
+            sock.setblocking(False)
+        except Exception:
+            sock.close()
+            raise
+        self.sock = sock
+        self.port = sock.getsockname()[1]
+        self._selector = selectors.DefaultSelector()
+        self._selector.register(sock, selectors.EVENT_READ, None)
+
+    def stats(self):
+        with self._lock:
+            return dict(self._stats)
+
+    def serve(self, stop_event):
+        try:
+            while not stop_event.is_set():
+                try:
+                    events = self._selector.select(1.0)
+                except OSError as exc:
+                    print(f"TCP accept error: {exc}")
+                    break
+                for key, _mask in events:
+                    if key.data is None:
+                        if not self._accept():
+                            return
+                    else:
+                        self._read(key.fileobj, key.data)
+                self._close_idle()
+        finally:
+            self.close()
+
+    def close(self):
+        for conn in list(self._conns):
+            self._drop(conn)
+        if self._selector is not None:
+            self._selector.close()
+        if self.sock is not None:
             try:
-                data = conn.recv(4096)
-            except socket.timeout:
-                continue
-            except Exception as exc:
-                print(f"TCP read error from {addr}: {exc}")
-                break
+                self.sock.close()
+            except Exception:
+                pass
 
-            if not data:
-                break
+    def _accept(self):
+        try:
+            conn, addr = self.sock.accept()
+        except (BlockingIOError, InterruptedError):
+            return True
+        except OSError as exc:
+            print(f"TCP accept error: {exc}")
+            return False
+        with self._lock:
+            if len(self._conns) >= self.max_connections:
+                self._stats["rejected"] += 1
+                full = True
+            else:
+                full = False
+        if full:
+            print(f"TCP listener full ({self.max_connections}), rejecting {addr}")
+            conn.close()
+            return True
+        conn.setblocking(False)
+        state = [f"tcp:{addr[0]}:{addr[1]}", BulkPacketStreamParser(), time.monotonic()]
+        self._selector.register(conn, selectors.EVENT_READ, state)
+        with self._lock:
+            self._conns[conn] = state
+            count = len(self._conns)
+            self._stats["connections"] = count
+            self._stats["accepted"] += 1
+            self._stats["peak"] = max(self._stats["peak"], count)
+        return True
 
-            for packet in parser.feed_bytes(data):
-                handle_serial_packet(packet, source_id=f"tcp:{addr[0]}:{addr[1]}")
-    finally:
+    def _read(self, conn, state):
+        source_id, parser, _last = state
+        try:
+            nbytes = conn.recv_into(self._recv_buffer)
+        except (BlockingIOError, InterruptedError):
+            return
+        except OSError as exc:
+            print(f"TCP read error from {source_id}: {exc}")
+            self._drop(conn)
+            return
+        if not nbytes:
+            self._drop(conn)
+            return
+        state[2] = time.monotonic()
+        try:
+            for packet in parser.feed_bytes(self._recv_buffer[:nbytes]):
+                handle_serial_packet(packet, source_id=source_id)
+        except Exception as exc:
+            # One peer's bad frame must not take the listener down with it.
+            print(f"TCP handler error from {source_id}, closing: {exc}")
+            self._drop(conn)
+            return
+        if parser.buffered > self.max_buffer:
+            print(f"TCP buffer limit exceeded by {source_id}, closing")
+            self._drop(conn, "overflow_closed")
+
+    def _close_idle(self):
+        if not self.idle_timeout:
+            return
+        cutoff = time.monotonic() - self.idle_timeout
+        for conn, state in list(self._conns.items()):
+            if state[2] < cutoff:
+                print(f"TCP connection from {state[0]} idle, closing")
+                self._drop(conn, "idle_closed")
+
+    def _drop(self, conn, reason=None):
+        with self._lock:
+            self._conns.pop(conn, None)
+            self._stats["connections"] = len(self._conns)
+            if reason:
+                self._stats[reason] += 1
+        try:
+            self._selector.unregister(conn)
+        except (KeyError, ValueError):
+            pass
         try:
             conn.close()
         except Exception:
@@ -545,38 +1435,23 @@ def tcp_connection_reader(conn, addr, stop_event):
 
 
 def tcp_listener(port, stop_event):
-    global _tcp_server_socket
+    global _tcp_server
 
+    server = _TcpServer(port)
     try:
-        _tcp_server_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-        _tcp_server_socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
-        _tcp_server_socket.bind(("0.0.0.0", port))
-        _tcp_server_socket.listen(5)
-        _tcp_server_socket.settimeout(1.0)
+        server.bind()
         print(f"TCP listener bound to 0.0.0.0:{port}")
     except Exception as exc:
         print(f"Failed to start TCP listener on {port}: {exc}")
         return
+    _tcp_server = server
+    server.serve(stop_event)
 
-    try:
-        while not stop_event.is_set():
-            try:
-                conn, addr = _tcp_server_socket.accept()
-            except socket.timeout:
-                continue
-            except Exception as exc:
-                print(f"TCP accept error: {exc}")
-                break
 
-            thread = threading.Thread(
-                target=tcp_connection_reader, args=(conn, addr, stop_event), daemon=True
-            )
-            thread.start()
-    finally:
-        try:
-            _tcp_server_socket.close()
-        except Exception:
-            pass
+def get_tcp_listener_stats():
+    """Connection counters of the inbound TCP listener (``None`` if not running)."""
+    server = _tcp_server
+    return server.stats() if server is not None else None
 
 
 def start_network_listeners(tcp_port, udp_port, mode):
@@ -597,16 +1472,9 @@ def start_network_listeners(tcp_port, udp_port, mode):
 
 
 def stop_network_listeners():
-    global _tcp_thread, _udp_thread, _tcp_server_socket, _udp_socket
+    global _tcp_thread, _udp_thread, _tcp_server, _udp_socket, _udp_peers
     _network_stop_event.set()
 
-    if _tcp_server_socket is not None:
-        try:
-            _tcp_server_socket.close()
-        except Exception:
-            pass
-        _tcp_server_socket = None
-
     if _udp_socket is not None:
         try:
             _udp_socket.close()
@@ -617,10 +1485,12 @@ def stop_network_listeners():
     if _tcp_thread is not None:
         _tcp_thread.join(timeout=2)
         _tcp_thread = None
+    _tcp_server = None
 
     if _udp_thread is not None:
         _udp_thread.join(timeout=2)
         _udp_thread = None
+    _udp_peers = None
 
 
 # --- Data source management ---
@@ -656,15 +1526,28 @@ def normalize_sport_overrides(overrides):
     return normalized
 
 
+# source_id -> {from_sport: to_sport} for sources with overrides.  Never
+# mutated: data_sources_changed() builds a new dict and swaps the reference,
+# so the per-packet lookup reads it without taking data_sources_lock.
+_override_index = {}
+
+
+def _rebuild_override_index():
+    global _override_index
+    with data_sources_lock:
+        index = {
+            source["id"]: dict(source["sport_overrides"])
+            for source in data_sources
+            if source.get("sport_overrides")
+        }
+    _override_index = index
+
+
 def _get_source_override(source_id, sport):
-    if not source_id or not sport:
+    overrides = _override_index.get(source_id)
+    if not overrides:
         return None
-    with data_sources_lock:
-        for source in data_sources:
-            if source.get("id") == source_id:
-                overrides = source.get("sport_overrides", {})
-                return overrides.get(sport)
-    return None
+    return overrides.get(sport)
 
 
 def _apply_sport_overrides(sport, parsed, source_id):
@@ -678,6 +1561,21 @@ def _apply_sport_overrides(sport, parsed, source_id):
     return override, parsed
 
 
+def data_sources_changed():
+    """Call after mutating ``data_sources``: republishes the sport override
+    index and drops cached per-source state that was derived from the old
+    configuration (e.g. sport overrides)."""
+    global _frame_cache_generation, _sources_version
+    # Publish the new overrides before bumping the generation, so a frame
+    # decoded with the old ones carries the old generation and is not cached.
+    _rebuild_override_index()
+    with parsed_data_lock:
+        _frame_cache_generation += 1
+        _last_frame_by_source.clear()
+        _sources_version += 1  # source names come from the config
+    store_changes.publish("sources")
+
+
 def _normalize_source_entry(entry):
     if not isinstance(entry, dict):
         return None
@@ -759,6 +1657,7 @@ def start_configured_sources():
     loaded = _load_data_sources()
     with data_sources_lock:
         data_sources = loaded
+    data_sources_changed()
 
     for source in loaded:
         if source.get("enabled", True):
@@ -0,0 +1,49 @@
+"""Encode-once cache for the JSON bodies of polled data snapshots.
+
+Each data store (ingestion, statcrew, trackman, virtius) stamps its
+snapshots with an update counter that only ever grows.  A ``JsonCache``
+remembers the encoded bytes of the latest version it has seen per key, so
+every poller of an unchanged snapshot shares a single ``json.dumps``; a
+replaced snapshot carries a new version and is re-encoded by the first
+reader that asks for it.
+"""
+
+import json
+
+
+def encode_json(obj):
+    """Encode *obj* exactly as Flask's ``jsonify`` does (compact separators,
+    sorted keys, ASCII only, trailing newline)."""
+    return (
+        json.dumps(obj, separators=(",", ":"), sort_keys=True) + "\n"
+    ).encode("ascii")
+
+
+class JsonCache:
+    """Maps key -> (version, encoded bytes).
+
+    Relies on single dict operations being atomic, so lookups never take a
+    lock.  Two readers racing on a new version may both encode it; the
+    result is identical and either copy is kept.
+    """
+
+    def __init__(self):
+        self._entries = {}
+
+    def get(self, key, version, data):
+        """Return the encoded bytes of *data*, the snapshot stored at *key*
+        with *version*.  *data* is only encoded on a cache miss."""
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] == version:
+            return entry[1]
+        body = encode_json(data)
+        entry = self._entries.get(key)
+        if entry is None or entry[0] < version:
+            self._entries[key] = (version, body)
+        return body
+
+    def discard(self, key):
+        self._entries.pop(key, None)
+
+    def clear(self):
+        self._entries.clear()
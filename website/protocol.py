@@ -1,3 +1,5 @@
+import re
+
 # Serial protocol constants (mirrors C# implementation)
 STX = 0x02
 CR = 0x0D
@@ -58,7 +60,87 @@ class PacketStreamParser:
         return packets
 
 
+# One match per state-machine "episode": an STX followed either by a valid
+# type byte, a printable run and the control byte that ends it, or by the
+# invalid type byte that gets discarded.  ``finditer`` resumes after each
+# match, so bytes are consumed exactly as PacketStreamParser consumes them.
+_PACKET_TYPES = re.escape(bytes([
+    TP_BBALL_BASE_SOFT,
+    TP_FOOTBALL,
+    TP_VOLLEYBALL,
+    TP_LACROSSE_FH,
+    TP_WRESTLING,
+    TP_SOCCER,
+]))
+_FRAME_SCAN = re.compile(
+    rb"\x02(?:[" + _PACKET_TYPES + rb"][\x20-\xff]*[\x00-\x1f]|[^" + _PACKET_TYPES + rb"])"
+)
+
+
+_STX_SCAN = re.compile(b"\x02")
+
+
+class BulkPacketStreamParser:
+    """Drop-in replacement for :class:`PacketStreamParser`.
+
+    Buffers input in a ``bytearray`` and locates frame boundaries with a
+    precompiled byte pattern instead of stepping through a Python state
+    machine per byte.  Emits ``bytes`` frames (STX through CR inclusive)
+    with the same resync behaviour on bad bytes: an invalid type byte or a
+    control byte inside a frame is consumed and scanning resumes after it.
+    ``resyncs`` counts those abandoned frames.
+    """
+
+    __slots__ = ("_buffer", "resyncs")
+
+    def __init__(self):
+        self._buffer = bytearray()
+        self.resyncs = 0
+
+    @property
+    def buffered(self):
+        """Bytes held back waiting for the rest of an incomplete frame."""
+        return len(self._buffer)
+
+    def feed_bytes(self, data):
+        buf = self._buffer
+        if buf or not isinstance(data, (bytes, memoryview)):
+            buf.extend(data)
+            data = buf
+        # With nothing pending, ``bytes``/``memoryview`` input (e.g. a slice
+        # of a reader's receive buffer) is scanned in place and only the
+        # trailing partial frame is copied into the buffer.
+        packets = []
+        consumed = 0
+
+        # A ``search`` loop rather than ``finditer``: same matches, without
+        # allocating a scanner object on every call.
+        search = _FRAME_SCAN.search
+        match = search(data)
+        while match is not None:
+            start, consumed = match.span()
+            if consumed - start > 2 and data[consumed - 1] == CR:
+                packets.append(bytes(data[start:consumed]))
+            else:
+                self.resyncs += 1
+            match = search(data, consumed)
+
+        # Anything left is noise before the next STX or a partial frame.
+        tail = _STX_SCAN.search(data, consumed)
+        if data is not buf:
+            if tail is not None:
+                buf.extend(data[tail.start():])
+        elif tail is None:
+            buf.clear()
+        elif tail.start():
+            del buf[:tail.start()]
+        return packets
+
+
 # --- Decoder helpers ---
+#
+# Scalar reference versions of the rules the sport layouts encode.  The
+# compiled decoders below use the lookup tables instead.
 
 def _decode_score(tens_byte, ones_byte):
     if tens_byte >= 176:
@@ -82,560 +164,380 @@ def _decode_clock(min_tens, min_ones, sec_tens, sec_ones):
     return f"{chr(min_tens)}{chr(min_ones)}:{chr(sec_tens)}{chr(sec_ones)}"
 
 
-def _decode_shot_clock(ms_byte, ls_byte):
-    ms = 0x20 if ms_byte == 0x3A else ms_byte
-    return f"{chr(ms)}{chr(ls_byte)}"
+# --- Decoder lookup tables ---
+#
+# Every byte-to-text rule the sport layouts use, precomputed for all 256
+# byte values so the compiled decoders below never call chr() per packet.
+
+_CHR = tuple(chr(b) for b in range(256))
+_CHR7 = tuple(chr(b & 0x7F) for b in range(256))
+_BLANK = tuple(" " if b == 0x3A else chr(b) for b in range(256))
+_ZERO = tuple("0" if b == 0x3A else chr(b) for b in range(256))
+_BLANK7 = tuple(" " if b & 0x7F == 0x3A else chr(b & 0x7F) for b in range(256))
+_TENTHS_MIN = tuple(
+    " 0" if b & 0x7F == 0x3A else f" {chr(b & 0x7F)}" for b in range(256)
+)
+_SCORE_TENS = tuple(
+    f"1{chr(b & 0x7F)}" if b >= 176 else _BLANK[b] for b in range(256)
+)
+# Indexed by ``tens_byte >= 176``: triple-digit scores mask the ones byte.
+_SCORE_ONES = (_CHR, _CHR7)
+_FOULS = tuple(
+    "10" if b > 0x3A else (" " if b == 0x3A else chr(b)) for b in range(256)
+)
+_POSS_BIT = tuple((b - 0x30) & 0x01 for b in range(256))
+_BONUS = tuple(((b - 0x30) & 0x02) > 0 for b in range(256))
+_TOL_20 = tuple(((b - 0x30) & 0x0C) // 4 for b in range(256))
+
+
+def _period_table(ot_after):
+    """Period text per byte; "" marks bytes whose int() conversion fails."""
+    table = []
+    for b in range(256):
+        period = chr(b)
+        if period.isdigit():
+            try:
+                if int(period) > ot_after:
+                    period = "OT"
+            except ValueError:
+                period = ""
+        table.append(period)
+    return tuple(table)
+
+
+def _invalid_period(byte):
+    # Superscript digits pass isdigit() but not int(); raise the same
+    # ValueError the hand-written parsers did.
+    return int(chr(byte))
+
+
+_DECODER_GLOBALS = {
+    "CHR": _CHR,
+    "CHR7": _CHR7,
+    "BLANK": _BLANK,
+    "ZERO": _ZERO,
+    "BLANK7": _BLANK7,
+    "TENTHS_MIN": _TENTHS_MIN,
+    "SCORE_TENS": _SCORE_TENS,
+    "SCORE_ONES": _SCORE_ONES,
+    "FOULS": _FOULS,
+    "POSS_BIT": _POSS_BIT,
+    "BONUS": _BONUS,
+    "TOL_20": _TOL_20,
+    "PERIOD_3": _period_table(3),
+    "PERIOD_4": _period_table(4),
+    "_invalid_period": _invalid_period,
+}
+
+
+# --- Field kinds ---
+#
+# Each kind turns a layout spec ``(kind, *args)`` into a Python expression
+# over the packet ``p``.  Offsets are absolute byte positions in the frame.
+
+def _expr_text(*parts):
+    return " + ".join(
+        repr(part) if isinstance(part, str) else _expr(part) for part in parts
+    )
+
+
+def _expr_score(tens, ones):
+    return f"SCORE_TENS[p[{tens}]] + SCORE_ONES[p[{tens}] >= 176][p[{ones}]]"
+
+
+def _expr_clock(min_tens, min_ones, sec_tens, sec_ones):
+    return (
+        f"(TENTHS_MIN[p[{min_tens}]] + CHR7[p[{min_ones}]] + '.' + CHR7[p[{sec_tens}]]"
+        f" if p[{sec_ones}] == 0x3A else "
+        f"BLANK7[p[{min_tens}]] + CHR7[p[{min_ones}]] + ':' + CHR7[p[{sec_tens}]]"
+        f" + CHR[p[{sec_ones}]])"
+    )
+
+
+def _expr_penalty_time(minute, sec_tens, sec_ones):
+    return (
+        f"(' ' + CHR7[p[{minute}]] + CHR7[p[{sec_tens}]] + ':'"
+        f" if p[{sec_ones}] == 0x3A else "
+        f"' ' + CHR7[p[{minute}]] + ':' + CHR7[p[{sec_tens}]] + CHR[p[{sec_ones}]])"
+    )
+
+
+def _expr_simple_time(minute, sec_tens, sec_ones):
+    return f"CHR7[p[{minute}]] + ':' + CHR7[p[{sec_tens}]] + CHR[p[{sec_ones}]]"
+
+
+def _expr_period(offset, ot_after):
+    return f"(PERIOD_{ot_after}[p[{offset}]] or _invalid_period(p[{offset}]))"
+
+
+def _expr_possession(kind, home, visitor):
+    if kind == "bit":
+        home_test, visitor_test = f"POSS_BIT[p[{home}]]", f"POSS_BIT[p[{visitor}]]"
+    else:  # "arrow": the possession byte lights 0xB8
+        home_test, visitor_test = f"p[{home}] == 0xB8", f"p[{visitor}] == 0xB8"
+    return f"('home' if {home_test} else 'visitor' if {visitor_test} else None)"
+
+
+def _expr_last_play(play_type, play_pos):
+    return (
+        f"('N/A' if p[{play_type}] == 0x3A else '  H' if p[{play_type}] == 0x49"
+        f" else '  E' if p[{play_pos}] == 0x3A else ' E' + CHR[p[{play_pos}]])"
+    )
+
+
+def _expr_list(*items):
+    return "[" + ", ".join(_expr(item) for item in items) + "]"
+
+
+def _expr_dict(*fields):
+    return "{" + ", ".join(f"{key!r}: {_expr(spec)}" for key, spec in fields) + "}"
+
+
+_FIELD_KINDS = {
+    "chr": lambda offset: f"CHR[p[{offset}]]",
+    "chr7": lambda offset: f"CHR7[p[{offset}]]",
+    "blank": lambda offset: f"BLANK[p[{offset}]]",
+    "zero": lambda offset: f"ZERO[p[{offset}]]",
+    "fouls": lambda offset: f"FOULS[p[{offset}]]",
+    "bonus": lambda offset: f"BONUS[p[{offset}]]",
+    "tol_20": lambda offset: f"TOL_20[p[{offset}]]",
+    "equals": lambda offset, value, yes, no: f"({yes!r} if p[{offset}] == {value} else {no!r})",
+    "text": _expr_text,
+    "score": _expr_score,
+    "clock": _expr_clock,
+    "shot_clock": lambda ms, ls: f"BLANK[p[{ms}]] + CHR[p[{ls}]]",
+    "penalty_time": _expr_penalty_time,
+    "simple_time": _expr_simple_time,
+    "period": _expr_period,
+    "possession": _expr_possession,
+    "last_play": _expr_last_play,
+    "list": _expr_list,
+    "dict": _expr_dict,
+}
 
 
-def _decode_penalty_time(min_byte, sec_tens_byte, sec_ones_byte):
-    if sec_ones_byte == 0x3A:
-        return f" {chr(min_byte)}{chr(sec_tens_byte)}{chr(sec_ones_byte)}"
-    return f" {chr(min_byte)}:{chr(sec_tens_byte)}{chr(sec_ones_byte)}"
+def _expr(spec):
+    kind, *args = spec
+    return _FIELD_KINDS[kind](*args)
 
 
-def _decode_simple_time(min_byte, sec_tens_byte, sec_ones_byte):
-    return f"{chr(min_byte)}:{chr(sec_tens_byte)}{chr(sec_ones_byte)}"
+def _compile_layout(sport, layout):
+    """Compile a field layout into a ``decode(packet) -> dict`` function.
+
+    The generated function builds the result dict in a single literal, in
+    layout order, and reports failures as ``{"error": "<Sport> parse
+    error: ..."}`` like the hand-written parsers it replaces.
+    """
+    fields = ",\n".join(f"            {key!r}: {_expr(spec)}" for key, spec in layout)
+    source = (
+        "def decode(p):\n"
+        "    try:\n"
+        "        return {\n"
+        f"{fields},\n"
+        "        }\n"
+        "    except Exception as exc:\n"
+        f"        return {{'error': f'{sport} parse error: {{exc}}'}}\n"
+    )
+    namespace = dict(_DECODER_GLOBALS)
+    exec(compile(source, f"<{sport} decoder>", "exec"), namespace)
+    decode = namespace["decode"]
+    decode.__name__ = f"parse_{sport.lower()}_data"
+    decode.__qualname__ = decode.__name__
+    decode.__doc__ = f"Decode a {sport} frame (compiled from its field layout)."
+    return decode
+
+
+# --- Sport layouts ---
+#
+# (field name, (kind, *args)) in output order.
+
+_GAME_CLOCK = ("game_clock", ("clock", 2, 3, 4, 5))
+
+
+def _penalty(player_tens, player_ones, minute, sec_tens, sec_ones):
+    return ("dict",
+            ("player", ("text", ("blank", player_tens), ("chr", player_ones))),
+            ("time", ("penalty_time", minute, sec_tens, sec_ones)))
+
+
+BASKETBALL_LAYOUT = (
+    _GAME_CLOCK,
+    ("period", ("period", 6, 4)),
+    ("home_score", ("score", 7, 8)),
+    ("visitor_score", ("score", 9, 10)),
+    ("home_full_tol", ("chr7", 11)),
+    ("visitor_full_tol", ("chr7", 12)),
+    ("home_20_tol", ("tol_20", 16)),
+    ("visitor_20_tol", ("tol_20", 17)),
+    ("home_fouls", ("fouls", 13)),
+    ("visitor_fouls", ("fouls", 14)),
+    ("shot_clock", ("shot_clock", 18, 19)),
+    ("home_bonus", ("bonus", 16)),
+    ("visitor_bonus", ("bonus", 17)),
+    ("possession", ("possession", "bit", 16, 17)),
+)
+
+FOOTBALL_LAYOUT = (
+    _GAME_CLOCK,
+    ("quarter", ("period", 6, 4)),
+    ("home_score", ("score", 7, 8)),
+    ("visitor_score", ("score", 9, 10)),
+    ("home_full_tol", ("chr7", 11)),
+    ("visitor_full_tol", ("chr7", 12)),
+    ("shot_clock", ("shot_clock", 20, 21)),
+    ("down", ("chr", 15)),
+    ("yards_to_go", ("text", ("blank", 16), ("chr", 17))),
+    ("ball_on", ("text", ("blank", 18), ("chr", 19))),
+    ("possession", ("possession", "arrow", 13, 14)),
+)
+
+VOLLEYBALL_LAYOUT = (
+    _GAME_CLOCK,
+    ("period", ("chr", 6)),
+    ("home_score", ("score", 7, 8)),
+    ("visitor_score", ("score", 9, 10)),
+    ("home_full_tol", ("chr7", 11)),
+    ("visitor_full_tol", ("chr7", 12)),
+    ("home_sets_won", ("chr", 18)),
+    ("visitor_sets_won", ("chr", 19)),
+    ("home_set_scores", ("list", *(("score", i, i + 1) for i in range(20, 30, 2)))),
+    ("visitor_set_scores", ("list", *(("score", i, i + 1) for i in range(30, 40, 2)))),
+    ("possession", ("possession", "bit", 16, 17)),
+)
+
+SOCCER_LAYOUT = (
+    _GAME_CLOCK,
+    ("period", ("chr", 6)),
+    ("home_score", ("score", 7, 8)),
+    ("visitor_score", ("score", 9, 10)),
+    ("home_shots", ("score", 11, 12)),
+    ("home_saves", ("score", 13, 14)),
+    ("home_corners", ("score", 15, 16)),
+    ("home_penalties", ("score", 17, 18)),
+    ("visitor_shots", ("score", 19, 20)),
+    ("visitor_saves", ("score", 21, 22)),
+    ("visitor_corners", ("score", 23, 24)),
+    ("visitor_penalties", ("score", 25, 26)),
+)
+
+_HOME_PENALTIES = ("list", _penalty(22, 23, 24, 25, 26), _penalty(27, 28, 29, 30, 31))
+_VISITOR_PENALTIES = ("list", _penalty(32, 33, 34, 35, 36), _penalty(37, 38, 39, 40, 41))
+
+LACROSSE_LAYOUT = (
+    _GAME_CLOCK,
+    ("period", ("chr", 6)),
+    ("home_score", ("score", 7, 8)),
+    ("visitor_score", ("score", 9, 10)),
+    ("home_full_tol", ("chr7", 16)),
+    ("visitor_full_tol", ("chr7", 17)),
+    ("home_shots", ("score", 18, 19)),
+    ("visitor_shots", ("score", 20, 21)),
+    ("home_penalties", _HOME_PENALTIES),
+    ("visitor_penalties", _VISITOR_PENALTIES),
+    ("shot_clock", ("shot_clock", 42, 43)),
+)
+
+HOCKEY_LAYOUT = (
+    _GAME_CLOCK,
+    ("period", ("chr", 6)),
+    ("home_score", ("score", 7, 8)),
+    ("visitor_score", ("score", 9, 10)),
+    ("home_saves", ("text", ("blank", 11), ("zero", 12))),
+    ("visitor_saves", ("text", ("blank", 13), ("zero", 14))),
+    ("home_shots", ("score", 18, 19)),
+    ("visitor_shots", ("score", 20, 21)),
+    ("home_penalties", _HOME_PENALTIES),
+    ("visitor_penalties", _VISITOR_PENALTIES),
+    ("home_corners", ("text", ("blank", 42), ("zero", 43))),
+    ("visitor_corners", ("text", ("blank", 44), ("zero", 45))),
+)
+
+WRESTLING_LAYOUT = (
+    _GAME_CLOCK,
+    ("period", ("period", 6, 3)),
+    ("home_score", ("score", 7, 8)),
+    ("visitor_score", ("score", 9, 10)),
+    ("home_team_points", ("score", 18, 19)),
+    ("visitor_team_points", ("score", 20, 21)),
+    ("match_weight_class", ("text", ("chr", 22), ("chr", 23), ("chr", 24))),
+    ("home_adv_time", ("simple_time", 25, 26, 27)),
+    ("visitor_adv_time", ("simple_time", 28, 29, 30)),
+    ("home_inj_time", ("simple_time", 34, 35, 36)),
+    ("visitor_inj_time", ("simple_time", 37, 38, 39)),
+)
+
+BASEBALL_LAYOUT = (
+    ("away_innings", ("list", *(("blank", i) for i in (2, 3, 4, *range(17, 24))))),
+    ("home_innings", ("list", *(("blank", i) for i in (5, 6, 7, *range(24, 31))))),
+    ("balls", ("chr", 10)),
+    ("strikes", ("chr", 31)),
+    ("outs", ("chr", 43)),
+    ("batter_num", ("text", ("blank", 8), ("blank", 9))),
+    ("pitch_speed", ("text", ("zero", 46), ("zero", 47), ("zero", 48))),
+    ("away_runs", ("text", ("blank", 33), ("chr", 34))),
+    ("away_hits", ("text", ("blank", 35), ("chr", 36))),
+    ("away_errors", ("text", " ", ("chr", 37))),
+    ("home_runs", ("text", ("blank", 38), ("chr", 39))),
+    ("home_hits", ("text", ("blank", 40), ("chr", 41))),
+    ("home_errors", ("text", " ", ("chr", 42))),
+)
+
+SOFTBALL_LAYOUT = (
+    ("inning", ("text", ("blank", 3), ("blank", 4))),
+    ("batting_team", ("equals", 2, 0x31, "TOP", "BOT")),
+    ("batter_num", ("text", ("blank", 5), ("zero", 6))),
+    ("batter_avg", ("text", ("zero", 7), ("zero", 8), ("zero", 9))),
+    ("pitcher_num", ("text", ("blank", 10), ("zero", 11))),
+    ("pitcher_count", ("text", ("blank", 71), ("blank", 12), ("zero", 13))),
+    ("pitch_speed", ("text", ("zero", 22), ("zero", 23), ("zero", 24))),
+    ("balls", ("chr", 25)),
+    ("strikes", ("chr", 26)),
+    ("outs", ("chr", 27)),
+    ("last_play", ("last_play", 28, 29)),
+    ("away_runs", ("text", ("blank", 30), ("chr", 31))),
+    ("away_hits", ("text", ("blank", 32), ("chr", 33))),
+    ("away_errors", ("text", " ", ("chr", 34))),
+    ("home_runs", ("text", ("blank", 35), ("chr", 36))),
+    ("home_hits", ("text", ("blank", 37), ("chr", 38))),
+    ("home_errors", ("text", " ", ("chr", 39))),
+    ("away_innings", ("list", *(("blank", i) for i in range(40, 50)))),
+    ("home_innings", ("list", *(("blank", i) for i in range(50, 60)))),
+)
 
 
 # --- Sport parsers ---
 
-def parse_basketball_data(packet):
-    try:
-        game_clock = _decode_clock(
-            packet[2] & 0x7F, packet[3] & 0x7F, packet[4] & 0x7F, packet[5]
-        )
-        period = chr(packet[6])
-        if period.isdigit() and int(period) > 4:
-            period = "OT"
-
-        home_score = _decode_score(packet[7], packet[8])
-        visitor_score = _decode_score(packet[9], packet[10])
-
-        hm_values = packet[16] - 0x30
-        vs_values = packet[17] - 0x30
-        hm_poss = hm_values & 0x01
-        vs_poss = vs_values & 0x01
-        hm_bonus = (hm_values & 0x02) > 0
-        vs_bonus = (vs_values & 0x02) > 0
-        hm_20_tol = (hm_values & 0x0C) // 4
-        vs_20_tol = (vs_values & 0x0C) // 4
-
-        hm_tol = chr(packet[11] & 0x7F)
-        vs_tol = chr(packet[12] & 0x7F)
-
-        hm_fouls = packet[13]
-        if hm_fouls > 0x3A:
-            hm_fouls_str = "10"
-        elif hm_fouls == 0x3A:
-            hm_fouls_str = " "
-        else:
-            hm_fouls_str = chr(hm_fouls)
-
-        vs_fouls = packet[14]
-        if vs_fouls > 0x3A:
-            vs_fouls_str = "10"
-        elif vs_fouls == 0x3A:
-            vs_fouls_str = " "
-        else:
-            vs_fouls_str = chr(vs_fouls)
-
-        shot_clock = _decode_shot_clock(packet[18], packet[19])
-
-        possession = None
-        if hm_poss == 0x01:
-            possession = "home"
-        elif vs_poss == 0x01:
-            possession = "visitor"
-
-        return {
-            "game_clock": game_clock,
-            "period": period,
-            "home_score": home_score,
-            "visitor_score": visitor_score,
-            "home_full_tol": hm_tol,
-            "visitor_full_tol": vs_tol,
-            "home_20_tol": hm_20_tol,
-            "visitor_20_tol": vs_20_tol,
-            "home_fouls": hm_fouls_str,
-            "visitor_fouls": vs_fouls_str,
-            "shot_clock": shot_clock,
-            "home_bonus": hm_bonus,
-            "visitor_bonus": vs_bonus,
-            "possession": possession,
-        }
-    except Exception as exc:
-        return {"error": f"Basketball parse error: {exc}"}
-
-
-def parse_football_data(packet):
-    try:
-        game_clock = _decode_clock(
-            packet[2] & 0x7F, packet[3] & 0x7F, packet[4] & 0x7F, packet[5]
-        )
-        quarter = chr(packet[6])
-        if quarter.isdigit() and int(quarter) > 4:
-            quarter = "OT"
-
-        home_score = _decode_score(packet[7], packet[8])
-        visitor_score = _decode_score(packet[9], packet[10])
-
-        hm_poss = packet[13]
-        vs_poss = packet[14]
-
-        hm_tol = chr(packet[11] & 0x7F)
-        vs_tol = chr(packet[12] & 0x7F)
-
-        shot_clock = _decode_shot_clock(packet[20], packet[21])
-        down = chr(packet[15])
-
-        ytg10s = packet[16]
-        ytg1s = packet[17]
-        if ytg10s == 0x3A:
-            ytg10s = 0x20
-        yards_to_go = f"{chr(ytg10s)}{chr(ytg1s)}"
-
-        ball_on10s = packet[18]
-        ball_on1s = packet[19]
-        if ball_on10s == 0x3A:
-            ball_on10s = 0x20
-        ball_on = f"{chr(ball_on10s)}{chr(ball_on1s)}"
-
-        possession = None
-        if hm_poss == 0xB8:
-            possession = "home"
-        elif vs_poss == 0xB8:
-            possession = "visitor"
-
-        return {
-            "game_clock": game_clock,
-            "quarter": quarter,
-            "home_score": home_score,
-            "visitor_score": visitor_score,
-            "home_full_tol": hm_tol,
-            "visitor_full_tol": vs_tol,
-            "shot_clock": shot_clock,
-            "down": down,
-            "yards_to_go": yards_to_go,
-            "ball_on": ball_on,
-            "possession": possession,
-        }
-    except Exception as exc:
-        return {"error": f"Football parse error: {exc}"}
-
-
-def parse_volleyball_data(packet):
-    try:
-        game_clock = _decode_clock(
-            packet[2] & 0x7F, packet[3] & 0x7F, packet[4] & 0x7F, packet[5]
-        )
-        period = chr(packet[6])
-        home_score = _decode_score(packet[7], packet[8])
-        visitor_score = _decode_score(packet[9], packet[10])
-        hm_tol = chr(packet[11] & 0x7F)
-        vs_tol = chr(packet[12] & 0x7F)
-
-        hm_values = packet[16] - 0x30
-        vs_values = packet[17] - 0x30
-        hm_poss = hm_values & 0x01
-        vs_poss = vs_values & 0x01
-
-        hm_sets_won = chr(packet[18])
-        vs_sets_won = chr(packet[19])
-
-        hm_set_scores = [
-            _decode_score(packet[20], packet[21]),
-            _decode_score(packet[22], packet[23]),
-            _decode_score(packet[24], packet[25]),
-            _decode_score(packet[26], packet[27]),
-            _decode_score(packet[28], packet[29]),
-        ]
-
-        vs_set_scores = [
-            _decode_score(packet[30], packet[31]),
-            _decode_score(packet[32], packet[33]),
-            _decode_score(packet[34], packet[35]),
-            _decode_score(packet[36], packet[37]),
-            _decode_score(packet[38], packet[39]),
-        ]
-
-        possession = None
-        if hm_poss == 0x01:
-            possession = "home"
-        elif vs_poss == 0x01:
-            possession = "visitor"
-
-        return {
-            "game_clock": game_clock,
-            "period": period,
-            "home_score": home_score,
-            "visitor_score": visitor_score,
-            "home_full_tol": hm_tol,
-            "visitor_full_tol": vs_tol,
-            "home_sets_won": hm_sets_won,
-            "visitor_sets_won": vs_sets_won,
-            "home_set_scores": hm_set_scores,
-            "visitor_set_scores": vs_set_scores,
-            "possession": possession,
-        }
-    except Exception as exc:
-        return {"error": f"Volleyball parse error: {exc}"}
-
-
-def parse_soccer_data(packet):
-    try:
-        game_clock = _decode_clock(
-            packet[2] & 0x7F, packet[3] & 0x7F, packet[4] & 0x7F, packet[5]
-        )
-        period = chr(packet[6])
-        home_score = _decode_score(packet[7], packet[8])
-        visitor_score = _decode_score(packet[9], packet[10])
-
-        hm_shots = _decode_score(packet[11], packet[12])
-        hm_saves = _decode_score(packet[13], packet[14])
-        hm_corners = _decode_score(packet[15], packet[16])
-        hm_penalties = _decode_score(packet[17], packet[18])
-
-        vs_shots = _decode_score(packet[19], packet[20])
-        vs_saves = _decode_score(packet[21], packet[22])
-        vs_corners = _decode_score(packet[23], packet[24])
-        vs_penalties = _decode_score(packet[25], packet[26])
-
-        return {
-            "game_clock": game_clock,
-            "period": period,
-            "home_score": home_score,
-            "visitor_score": visitor_score,
-            "home_shots": hm_shots,
-            "home_saves": hm_saves,
-            "home_corners": hm_corners,
-            "home_penalties": hm_penalties,
-            "visitor_shots": vs_shots,
-            "visitor_saves": vs_saves,
-            "visitor_corners": vs_corners,
-            "visitor_penalties": vs_penalties,
-        }
-    except Exception as exc:
-        return {"error": f"Soccer parse error: {exc}"}
-
-
-def parse_lacrosse_data(packet):
-    try:
-        game_clock = _decode_clock(
-            packet[2] & 0x7F, packet[3] & 0x7F, packet[4] & 0x7F, packet[5]
-        )
-        period = chr(packet[6])
-        home_score = _decode_score(packet[7], packet[8])
-        visitor_score = _decode_score(packet[9], packet[10])
-        home_tol = chr(packet[16] & 0x7F)
-        visitor_tol = chr(packet[17] & 0x7F)
-
-        home_shots = _decode_score(packet[18], packet[19])
-        visitor_shots = _decode_score(packet[20], packet[21])
-
-        hm_pen1_player = (
-            f"{(' ' if packet[22] == 0x3A else chr(packet[22]))}{chr(packet[23])}"
-        )
-        hm_pen1_time = _decode_penalty_time(
-            packet[24] & 0x7F, packet[25] & 0x7F, packet[26]
-        )
-        hm_pen2_player = (
-            f"{(' ' if packet[27] == 0x3A else chr(packet[27]))}{chr(packet[28])}"
-        )
-        hm_pen2_time = _decode_penalty_time(
-            packet[29] & 0x7F, packet[30] & 0x7F, packet[31]
-        )
-
-        vs_pen1_player = (
-            f"{(' ' if packet[32] == 0x3A else chr(packet[32]))}{chr(packet[33])}"
-        )
-        vs_pen1_time = _decode_penalty_time(
-            packet[34] & 0x7F, packet[35] & 0x7F, packet[36]
-        )
-        vs_pen2_player = (
-            f"{(' ' if packet[37] == 0x3A else chr(packet[37]))}{chr(packet[38])}"
-        )
-        vs_pen2_time = _decode_penalty_time(
-            packet[39] & 0x7F, packet[40] & 0x7F, packet[41]
-        )
-
-        shot_clock = _decode_shot_clock(packet[42], packet[43])
-
-        return {
-            "game_clock": game_clock,
-            "period": period,
-            "home_score": home_score,
-            "visitor_score": visitor_score,
-            "home_full_tol": home_tol,
-            "visitor_full_tol": visitor_tol,
-            "home_shots": home_shots,
-            "visitor_shots": visitor_shots,
-            "home_penalties": [
-                {"player": hm_pen1_player, "time": hm_pen1_time},
-                {"player": hm_pen2_player, "time": hm_pen2_time},
-            ],
-            "visitor_penalties": [
-                {"player": vs_pen1_player, "time": vs_pen1_time},
-                {"player": vs_pen2_player, "time": vs_pen2_time},
-            ],
-            "shot_clock": shot_clock,
-        }
-    except Exception as exc:
-        return {"error": f"Lacrosse parse error: {exc}"}
-
-
-def parse_hockey_data(packet):
-    try:
-        game_clock = _decode_clock(
-            packet[2] & 0x7F, packet[3] & 0x7F, packet[4] & 0x7F, packet[5]
-        )
-        period = chr(packet[6])
-        home_score = _decode_score(packet[7], packet[8])
-        visitor_score = _decode_score(packet[9], packet[10])
-
-        home_saves = f"{(' ' if packet[11] == 0x3A else chr(packet[11]))}{('0' if packet[12] == 0x3A else chr(packet[12]))}"
-        visitor_saves = f"{(' ' if packet[13] == 0x3A else chr(packet[13]))}{('0' if packet[14] == 0x3A else chr(packet[14]))}"
-
-        home_shots = _decode_score(packet[18], packet[19])
-        visitor_shots = _decode_score(packet[20], packet[21])
-
-        hm_pen1_player = (
-            f"{(' ' if packet[22] == 0x3A else chr(packet[22]))}{chr(packet[23])}"
-        )
-        hm_pen1_time = _decode_penalty_time(
-            packet[24] & 0x7F, packet[25] & 0x7F, packet[26]
-        )
-        hm_pen2_player = (
-            f"{(' ' if packet[27] == 0x3A else chr(packet[27]))}{chr(packet[28])}"
-        )
-        hm_pen2_time = _decode_penalty_time(
-            packet[29] & 0x7F, packet[30] & 0x7F, packet[31]
-        )
-
-        vs_pen1_player = (
-            f"{(' ' if packet[32] == 0x3A else chr(packet[32]))}{chr(packet[33])}"
-        )
-        vs_pen1_time = _decode_penalty_time(
-            packet[34] & 0x7F, packet[35] & 0x7F, packet[36]
-        )
-        vs_pen2_player = (
-            f"{(' ' if packet[37] == 0x3A else chr(packet[37]))}{chr(packet[38])}"
-        )
-        vs_pen2_time = _decode_penalty_time(
-            packet[39] & 0x7F, packet[40] & 0x7F, packet[41]
-        )
-
-        home_corners = f"{(' ' if packet[42] == 0x3A else chr(packet[42]))}{('0' if packet[43] == 0x3A else chr(packet[43]))}"
-        visitor_corners = f"{(' ' if packet[44] == 0x3A else chr(packet[44]))}{('0' if packet[45] == 0x3A else chr(packet[45]))}"
-
-        return {
-            "game_clock": game_clock,
-            "period": period,
-            "home_score": home_score,
-            "visitor_score": visitor_score,
-            "home_saves": home_saves,
-            "visitor_saves": visitor_saves,
-            "home_shots": home_shots,
-            "visitor_shots": visitor_shots,
-            "home_penalties": [
-                {"player": hm_pen1_player, "time": hm_pen1_time},
-                {"player": hm_pen2_player, "time": hm_pen2_time},
-            ],
-            "visitor_penalties": [
-                {"player": vs_pen1_player, "time": vs_pen1_time},
-                {"player": vs_pen2_player, "time": vs_pen2_time},
-            ],
-            "home_corners": home_corners,
-            "visitor_corners": visitor_corners,
-        }
-    except Exception as exc:
-        return {"error": f"Hockey parse error: {exc}"}
-
-
-def parse_wrestling_data(packet):
-    try:
-        game_clock = _decode_clock(
-            packet[2] & 0x7F, packet[3] & 0x7F, packet[4] & 0x7F, packet[5]
-        )
-        period = chr(packet[6])
-        if period.isdigit() and int(period) > 3:
-            period = "OT"
-        home_score = _decode_score(packet[7], packet[8])
-        visitor_score = _decode_score(packet[9], packet[10])
-
-        home_team_points = _decode_score(packet[18], packet[19])
-        visitor_team_points = _decode_score(packet[20], packet[21])
-
-        weight_class = f"{chr(packet[22])}{chr(packet[23])}{chr(packet[24])}"
-
-        home_adv_time = _decode_simple_time(
-            packet[25] & 0x7F, packet[26] & 0x7F, packet[27]
-        )
-        visitor_adv_time = _decode_simple_time(
-            packet[28] & 0x7F, packet[29] & 0x7F, packet[30]
-        )
-        home_inj_time = _decode_simple_time(
-            packet[34] & 0x7F, packet[35] & 0x7F, packet[36]
-        )
-        visitor_inj_time = _decode_simple_time(
-            packet[37] & 0x7F, packet[38] & 0x7F, packet[39]
-        )
-
-        return {
-            "game_clock": game_clock,
-            "period": period,
-            "home_score": home_score,
-            "visitor_score": visitor_score,
-            "home_team_points": home_team_points,
-            "visitor_team_points": visitor_team_points,
-            "match_weight_class": weight_class,
-            "home_adv_time": home_adv_time,
-            "visitor_adv_time": visitor_adv_time,
-            "home_inj_time": home_inj_time,
-            "visitor_inj_time": visitor_inj_time,
-        }
-    except Exception as exc:
-        return {"error": f"Wrestling parse error: {exc}"}
-
-
-def parse_baseball_data(packet):
-    try:
-        vs_runs = f"{(' ' if packet[33] == 0x3A else chr(packet[33]))}{chr(packet[34])}"
-        vs_hits = f"{(' ' if packet[35] == 0x3A else chr(packet[35]))}{chr(packet[36])}"
-        vs_errors = f" {chr(packet[37])}"
-
-        hm_runs = f"{(' ' if packet[38] == 0x3A else chr(packet[38]))}{chr(packet[39])}"
-        hm_hits = f"{(' ' if packet[40] == 0x3A else chr(packet[40]))}{chr(packet[41])}"
-        hm_errors = f" {chr(packet[42])}"
-
-        vs_innings = [
-            chr(packet[2]),
-            chr(packet[3]),
-            chr(packet[4]),
-            chr(packet[17]),
-            chr(packet[18]),
-            chr(packet[19]),
-            chr(packet[20]),
-            chr(packet[21]),
-            chr(packet[22]),
-            chr(packet[23]),
-        ]
-        hm_innings = [
-            chr(packet[5]),
-            chr(packet[6]),
-            chr(packet[7]),
-            chr(packet[24]),
-            chr(packet[25]),
-            chr(packet[26]),
-            chr(packet[27]),
-            chr(packet[28]),
-            chr(packet[29]),
-            chr(packet[30]),
-        ]
-
-        batter_num = f"{(' ' if packet[8] == 0x3A else chr(packet[8]))}{(' ' if packet[9] == 0x3A else chr(packet[9]))}"
-        balls = chr(packet[10])
-        strikes = chr(packet[31])
-        outs = chr(packet[43])
-
-        pitch_h = 0x30 if packet[46] == 0x3A else packet[46]
-        pitch_t = 0x30 if packet[47] == 0x3A else packet[47]
-        pitch_o = 0x30 if packet[48] == 0x3A else packet[48]
-        pitch_speed = f"{chr(pitch_h)}{chr(pitch_t)}{chr(pitch_o)}"
-
-        vs_innings = [(" " if b == ":" else b) for b in vs_innings]
-        hm_innings = [(" " if b == ":" else b) for b in hm_innings]
-
-        return {
-            "away_innings": vs_innings,
-            "home_innings": hm_innings,
-            "balls": balls,
-            "strikes": strikes,
-            "outs": outs,
-            "batter_num": batter_num,
-            "pitch_speed": pitch_speed,
-            "away_runs": vs_runs,
-            "away_hits": vs_hits,
-            "away_errors": vs_errors,
-            "home_runs": hm_runs,
-            "home_hits": hm_hits,
-            "home_errors": hm_errors,
-        }
-    except Exception as exc:
-        return {"error": f"Baseball parse error: {exc}"}
-
-
-def parse_softball_data(packet):
-    try:
-        team_at_bat = chr(packet[2])
-        batting_team = "TOP" if team_at_bat == "1" else "BOT"
-        inning_tens = " " if packet[3] == 0x3A else chr(packet[3])
-        inning_ones = " " if packet[4] == 0x3A else chr(packet[4])
-        inning = f"{inning_tens}{inning_ones}"
-
-        batter_num = f"{(' ' if packet[5] == 0x3A else chr(packet[5]))}{('0' if packet[6] == 0x3A else chr(packet[6]))}"
-        batter_avg = f"{('0' if packet[7] == 0x3A else chr(packet[7]))}{('0' if packet[8] == 0x3A else chr(packet[8]))}{('0' if packet[9] == 0x3A else chr(packet[9]))}"
-
-        pitcher_num = f"{(' ' if packet[10] == 0x3A else chr(packet[10]))}{('0' if packet[11] == 0x3A else chr(packet[11]))}"
-        pitcher_count = f"{(' ' if packet[71] == 0x3A else chr(packet[71]))}{(' ' if packet[12] == 0x3A else chr(packet[12]))}{('0' if packet[13] == 0x3A else chr(packet[13]))}"
-
-        pitch_h = 0x30 if packet[22] == 0x3A else packet[22]
-        pitch_t = 0x30 if packet[23] == 0x3A else packet[23]
-        pitch_o = 0x30 if packet[24] == 0x3A else packet[24]
-        pitch_speed = f"{chr(pitch_h)}{chr(pitch_t)}{chr(pitch_o)}"
-
-        balls = chr(packet[25])
-        strikes = chr(packet[26])
-        outs = chr(packet[27])
-
-        last_play_type = packet[28]
-        last_play_pos = packet[29]
-        if last_play_type == 0x3A:
-            last_play = "N/A"
-        elif last_play_type == 0x49:
-            last_play = "  H"
-        else:
-            last_play = "  E" if last_play_pos == 0x3A else f" E{chr(last_play_pos)}"
-
-        vs_runs = f"{(' ' if packet[30] == 0x3A else chr(packet[30]))}{chr(packet[31])}"
-        vs_hits = f"{(' ' if packet[32] == 0x3A else chr(packet[32]))}{chr(packet[33])}"
-        vs_errors = f" {chr(packet[34])}"
-
-        hm_runs = f"{(' ' if packet[35] == 0x3A else chr(packet[35]))}{chr(packet[36])}"
-        hm_hits = f"{(' ' if packet[37] == 0x3A else chr(packet[37]))}{chr(packet[38])}"
-        hm_errors = f" {chr(packet[39])}"
-
-        vs_innings = [chr(packet[i]) for i in range(40, 50)]
-        hm_innings = [chr(packet[i]) for i in range(50, 60)]
-        vs_innings = [(" " if b == ":" else b) for b in vs_innings]
-        hm_innings = [(" " if b == ":" else b) for b in hm_innings]
-
-        return {
-            "inning": inning,
-            "batting_team": batting_team,
-            "batter_num": batter_num,
-            "batter_avg": batter_avg,
-            "pitcher_num": pitcher_num,
-            "pitcher_count": pitcher_count,
-            "pitch_speed": pitch_speed,
-            "balls": balls,
-            "strikes": strikes,
-            "outs": outs,
-            "last_play": last_play,
-            "away_runs": vs_runs,
-            "away_hits": vs_hits,
-            "away_errors": vs_errors,
-            "home_runs": hm_runs,
-            "home_hits": hm_hits,
-            "home_errors": hm_errors,
-            "away_innings": vs_innings,
-            "home_innings": hm_innings,
-        }
-    except Exception as exc:
-        return {"error": f"Softball parse error: {exc}"}
+parse_basketball_data = _compile_layout("Basketball", BASKETBALL_LAYOUT)
+parse_football_data = _compile_layout("Football", FOOTBALL_LAYOUT)
+parse_volleyball_data = _compile_layout("Volleyball", VOLLEYBALL_LAYOUT)
+parse_soccer_data = _compile_layout("Soccer", SOCCER_LAYOUT)
+parse_lacrosse_data = _compile_layout("Lacrosse", LACROSSE_LAYOUT)
+parse_hockey_data = _compile_layout("Hockey", HOCKEY_LAYOUT)
+parse_wrestling_data = _compile_layout("Wrestling", WRESTLING_LAYOUT)
+parse_baseball_data = _compile_layout("Baseball", BASEBALL_LAYOUT)
+parse_softball_data = _compile_layout("Softball", SOFTBALL_LAYOUT)
 
 
 # --- Dispatch ---
 
+# (packet type, packet length) for types shared by several sports.
+_DECODERS_BY_SHAPE = {
+    (TP_BBALL_BASE_SOFT, BBALL_LEN): ("Basketball", parse_basketball_data),
+    (TP_BBALL_BASE_SOFT, BASE_LEN): ("Baseball", parse_baseball_data),
+    (TP_BBALL_BASE_SOFT, SOFT_LEN): ("Softball", parse_softball_data),
+    (TP_LACROSSE_FH, LAX_LEN): ("Lacrosse", parse_lacrosse_data),
+    (TP_LACROSSE_FH, FH_LEN): ("Hockey", parse_hockey_data),
+}
+
+# Packet types that identify a sport at any length.
+_DECODERS_BY_TYPE = {
+    TP_FOOTBALL: ("Football", parse_football_data),
+    TP_VOLLEYBALL: ("Volleyball", parse_volleyball_data),
+    TP_WRESTLING: ("Wrestling", parse_wrestling_data),
+    TP_SOCCER: ("Soccer", parse_soccer_data),
+}
+
+
 def identify_and_parse(packet):
     """Identify sport from packet type+length and parse it.
 
@@ -645,26 +547,11 @@ def identify_and_parse(packet):
         return None, None
 
     packet_type = packet[1]
+    entry = _DECODERS_BY_TYPE.get(packet_type) or _DECODERS_BY_SHAPE.get(
+        (packet_type, len(packet))
+    )
+    if entry is None:
+        return None, None
 
-    if packet_type == TP_BBALL_BASE_SOFT:
-        if len(packet) == BBALL_LEN:
-            return "Basketball", parse_basketball_data(packet)
-        elif len(packet) == BASE_LEN:
-            return "Baseball", parse_baseball_data(packet)
-        elif len(packet) == SOFT_LEN:
-            return "Softball", parse_softball_data(packet)
-    elif packet_type == TP_FOOTBALL:
-        return "Football", parse_football_data(packet)
-    elif packet_type == TP_VOLLEYBALL:
-        return "Volleyball", parse_volleyball_data(packet)
-    elif packet_type == TP_LACROSSE_FH:
-        if len(packet) == LAX_LEN:
-            return "Lacrosse", parse_lacrosse_data(packet)
-        elif len(packet) == FH_LEN:
-            return "Hockey", parse_hockey_data(packet)
-    elif packet_type == TP_WRESTLING:
-        return "Wrestling", parse_wrestling_data(packet)
-    elif packet_type == TP_SOCCER:
-        return "Soccer", parse_soccer_data(packet)
-
-    return None, None
+    sport, decode = entry
+    return sport, decode(packet)
@@ -0,0 +1,90 @@
+"""Path-level deltas for cloud relay protocol version 2.
+
+A delta frame carries only the parts of a value that changed.  Each part
+is addressed by a *path*: the list of dict keys and list indexes leading
+to it from the top of the value.  ``set`` holds ``[path, new_value]``
+pairs and ``unset`` the paths of dict keys that are gone.  Lists that
+changed length are replaced whole at their own path, and no path in a
+delta lies inside another, so the parts can be applied in any order.
+
+``make_delta`` works against the last value the edge acknowledged (the
+*base*) and also covers every value sent since, so the result is correct
+whichever of those the edge currently holds.  ``apply_delta`` is the
+reference for the edge side.
+"""
+import copy
+
+_MISSING = object()
+
+
+def changed_paths(old, new, prefix=()):
+    """Yield the shallowest paths at which *old* and *new* differ."""
+    if isinstance(old, dict) and isinstance(new, dict):
+        for key, value in new.items():
+            before = old.get(key, _MISSING)
+            if before is not value and before != value:
+                yield from changed_paths(before, value, prefix + (key,))
+        for key in old.keys() - new.keys():
+            yield prefix + (key,)
+    elif isinstance(old, list) and isinstance(new, list) and len(old) == len(new):
+        for index, (before, value) in enumerate(zip(old, new)):
+            if before is not value and before != value:
+                yield from changed_paths(before, value, prefix + (index,))
+    else:
+        yield prefix
+
+
+def make_delta(base, inflight, value):
+    """Return ``(set_ops, unset_ops)`` that turn *base*, or any value in
+    *inflight*, into *value*.
+
+    Returns ``None`` when the whole value changed shape and only a full
+    frame will do.  Both lists are empty when nothing changed.
+    """
+    paths = set(changed_paths(base, value))
+    for sent in inflight:
+        if sent is not value:
+            paths.update(changed_paths(base, sent))
+    if () in paths:
+        return None
+
+    kept = set()
+    for path in sorted(paths, key=len):
+        if not any(path[:n] in kept for n in range(1, len(path))):
+            kept.add(path)
+
+    set_ops, unset_ops = [], []
+    for path in kept:
+        node = value
+        for key in path[:-1]:
+            node = node[key]
+        last = path[-1]
+        if isinstance(node, dict) and last not in node:
+            unset_ops.append(list(path))
+        else:
+            set_ops.append([list(path), node[last]])
+    return set_ops, unset_ops
+
+
+def apply_delta(state, set_ops=(), unset_ops=()):
+    """Return a copy of *state* with a delta's ``set`` and ``unset`` applied.
+
+    Dict keys arrive as JSON strings, so path steps into a dict are looked
+    up as ``str``.
+    """
+    state = copy.deepcopy(state)
+    for path, value in set_ops:
+        parent, key = _walk(state, path)
+        parent[key] = copy.deepcopy(value)
+    for path in unset_ops:
+        parent, key = _walk(state, path)
+        parent.pop(key, None)
+    return state
+
+
+def _walk(state, path):
+    node = state
+    for step in path[:-1]:
+        node = node[str(step) if isinstance(node, dict) else step]
+    last = path[-1]
+    return node, (str(last) if isinstance(node, dict) else last)
@@ -0,0 +1,53 @@
+"""Read-only snapshots published by the data stores.
+
+Each store (ingestion, statcrew, trackman, virtius) replaces a sport's data
+wholesale and never edits it afterwards, so its getters can hand out the
+stored object itself instead of a defensive copy.  ``Snapshot`` makes that
+contract explicit: it is a ``dict`` (so ``json.dumps``, ``jsonify`` and
+``==`` work unchanged) that refuses in-place changes and carries the
+version it was published under, so a consumer can tell whether a sport
+changed by comparing versions instead of whole dicts.
+"""
+
+
+class Snapshot(dict):
+    """A read-only ``dict`` stamped with the *version* it was published as.
+
+    Mutating methods raise ``TypeError``; ``dict(snapshot)`` (or
+    ``snapshot.copy()``) gives a mutable copy.  A store assigns each
+    published snapshot a larger version than the one it replaces.
+    """
+
+    __slots__ = ("version",)
+
+    def __init__(self, data=(), version=0):
+        dict.__init__(self, data)
+        self.version = version
+
+    def _read_only(self, *args, **kwargs):
+        raise TypeError("Snapshot is read-only")
+
+    __setitem__ = __delitem__ = __ior__ = _read_only
+    clear = pop = popitem = setdefault = update = _read_only
+
+    def copy(self):
+        return dict(self)
+
+    def __reduce__(self):
+        return (Snapshot, (dict(self), self.version))
+
+
+EMPTY = Snapshot()
+
+
+def freeze(data):
+    """Return *data* as a ``Snapshot``, without copying if it already is one.
+
+    Stores publish ``Snapshot`` objects; this covers the empty placeholders
+    they start with (and plain dicts put there by hand), which get version 0.
+    """
+    if isinstance(data, Snapshot):
+        return data
+    if not data:
+        return EMPTY
+    return Snapshot(data)
@@ -6,6 +6,10 @@ import threading
 import time
 import xml.etree.ElementTree as ET
 
+from .change_feed import store_changes
+from .json_cache import JsonCache
+from .snapshot import Snapshot, freeze
+
 # --- Shared state ---
 
 _ALL_SPORTS = {
@@ -30,6 +34,8 @@ statcrew_lock = threading.Lock()
 statcrew_threads = {}
 statcrew_stop_events = {}
 statcrew_mtimes = {}
+statcrew_versions = {}  # sport -> counter bumped whenever statcrew_data[sport] is replaced
+_json_cache = JsonCache()
 
 
 def _init_config():
@@ -206,7 +212,22 @@ def _save_statcrew_config():
 def get_data(sport):
     """Get parsed StatCrew data for a sport."""
     with statcrew_lock:
-        return dict(statcrew_data.get(sport, {}))
+        return freeze(statcrew_data.get(sport))
+
+
+def get_data_version(sport):
+    """Get the update counter of the StatCrew data for a sport."""
+    with statcrew_lock:
+        return statcrew_versions.get(sport, 0)
+
+
+def get_data_json(sport):
+    """Get parsed StatCrew data for a sport as JSON bytes, encoded once per
+    update."""
+    with statcrew_lock:
+        version = statcrew_versions.get(sport, 0)
+        data = statcrew_data.get(sport, {})
+    return _json_cache.get(sport, version, data)
 
 
 def get_config(sport):
@@ -983,7 +1004,10 @@ def statcrew_watcher(sport, file_path, poll_interval, stop_event):
                                 "parsed_at": time.time(),
                             }
                             with statcrew_lock:
-                                statcrew_data[sport] = parsed
+                                version = statcrew_versions.get(sport, 0) + 1
+                                statcrew_data[sport] = Snapshot(parsed, version)
+                                statcrew_versions[sport] = version
+                            store_changes.publish("statcrew", sport)
                             statcrew_mtimes[sport] = mtime
                             print(f"StatCrew data updated for {sport}")
                     except Exception as exc:
@@ -3,6 +3,11 @@ import socket
 import threading
 import time
 
+from .change_feed import store_changes
+from .json_cache import JsonCache
+from .snapshot import Snapshot, freeze
+from .udp_batch import DatagramReceiver
+
 # --- Shared state ---
 
 _SUPPORTED_SPORTS = {"Baseball", "Softball"}
@@ -12,6 +17,9 @@ trackman_data = {
     "Softball": {},
 }
 
+trackman_versions = {}  # sport -> counter bumped whenever trackman_data[sport] is replaced
+_json_cache = JsonCache()
+
 trackman_debug = {
     "Baseball": {"raw": "", "error": ""},
     "Softball": {"raw": "", "error": ""},
@@ -33,7 +41,19 @@ trackman_ports = {}
 
 def get_data(sport):
     with trackman_lock:
-        return dict(trackman_data.get(sport, {}))
+        return freeze(trackman_data.get(sport))
+
+
+def get_data_version(sport):
+    with trackman_lock:
+        return trackman_versions.get(sport, 0)
+
+
+def get_data_json(sport):
+    with trackman_lock:
+        version = trackman_versions.get(sport, 0)
+        data = trackman_data.get(sport, {})
+    return _json_cache.get(sport, version, data)
 
 
 def get_debug(sport):
@@ -41,7 +61,7 @@ def get_debug(sport):
         return {
             "raw": trackman_debug.get(sport, {}).get("raw"),
             "error": trackman_debug.get(sport, {}).get("error"),
-            "parsed": dict(trackman_data.get(sport, {})),
+            "parsed": freeze(trackman_data.get(sport)),
         }
 
 
@@ -222,73 +242,96 @@ def _parse_trackman_json(raw_text):
 # --- Listener ---
 
 
+def _decode_datagram(raw):
+    """Return ``(raw_text, parsed_packet, error)`` for one TrackMan datagram."""
+    raw_text = str(raw, "utf-8", errors="ignore")
+    payloads = _parse_trackman_json(raw_text)
+    if not payloads:
+        return raw_text, None, "unable to parse json"
+
+    parsed_packet = None
+    for payload in payloads:
+        parsed = _parse_trackman_payload(payload)
+        if parsed:
+            parsed_packet = parsed
+    if not parsed_packet:
+        return raw_text, None, "no supported fields"
+    return raw_text, parsed_packet, ""
+
+
+def _ingest_batch(sport, port, datagrams):
+    """Apply a batch of datagrams (oldest first) to the sport's store.
+
+    Only the newest datagram that yields supported fields can end up in
+    ``trackman_data``, so the batch is decoded newest-first and stops
+    there; the debug view reflects the newest datagram, as it would after
+    handling them one at a time.
+    """
+    debug = None
+    parsed_packet = None
+    for raw in reversed(datagrams):
+        if not raw:
+            continue
+        raw_text, parsed, error = _decode_datagram(raw)
+        if debug is None:
+            debug = {"raw": raw_text, "error": error}
+        if parsed:
+            parsed_packet = parsed
+            break
+
+    if debug is None:
+        return
+
+    with trackman_lock:
+        trackman_debug[sport]["raw"] = debug["raw"]
+        trackman_debug[sport]["error"] = debug["error"]
+        if parsed_packet:
+            version = trackman_versions.get(sport, 0) + 1
+            trackman_data[sport] = Snapshot(
+                {
+                    **parsed_packet,
+                    "_meta": {
+                        "source": f"udp:{port}",
+                        "received_at": time.time(),
+                    },
+                },
+                version,
+            )
+            trackman_versions[sport] = version
+    if parsed_packet:
+        store_changes.publish("trackman", sport)
+
+
 def trackman_listener(sport, port, stop_event):
     sock = None
     try:
         sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
         sock.bind(("0.0.0.0", port))
-        sock.settimeout(1.0)
+        receiver = DatagramReceiver(sock, slot_size=8192, max_batch=32)
         trackman_sockets[sport] = sock
         print(f"Trackman listener bound to 0.0.0.0:{port} for {sport}")
     except Exception as exc:
         print(f"Failed to start Trackman listener on {port} for {sport}: {exc}")
+        if sock is not None:
+            sock.close()
         return
 
     try:
         while not stop_event.is_set():
             try:
-                raw, _addr = sock.recvfrom(8192)
-            except socket.timeout:
-                continue
+                batch = receiver.receive(1.0)
             except Exception as exc:
                 print(f"Trackman receive error ({sport}): {exc}")
                 break
 
-            if not raw:
-                continue
-
-            try:
-                raw_text = raw.decode("utf-8", errors="ignore")
-            except Exception:
-                raw_text = ""
-
-            with trackman_lock:
-                trackman_debug[sport]["raw"] = raw_text or ""
-                trackman_debug[sport]["error"] = ""
-
-            payloads = _parse_trackman_json(raw_text or "")
-            if not payloads:
-                with trackman_lock:
-                    trackman_debug[sport]["error"] = "unable to parse json"
-                continue
-
-            parsed_packet = None
-            for payload in payloads:
-                parsed = _parse_trackman_payload(payload)
-                if parsed:
-                    parsed_packet = parsed
-
-            if not parsed_packet:
-                with trackman_lock:
-                    trackman_debug[sport]["error"] = "no supported fields"
-                continue
-
-            parsed_with_meta = {
-                **parsed_packet,
-                "_meta": {
-                    "source": f"udp:{port}",
-                    "received_at": time.time(),
-                },
-            }
-
-            with trackman_lock:
-                trackman_data[sport] = parsed_with_meta
+            if batch:
+                _ingest_batch(sport, port, [data for data, _addr in batch])
     finally:
-        if sock is not None:
-            try:
-                sock.close()
-            except Exception:
-                pass
+        receiver.close()
+        try:
+            sock.close()
+        except Exception:
+            pass
 
 
 def stop_trackman_listener(sport):
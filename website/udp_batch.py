@@ -0,0 +1,67 @@
+"""Batched datagram receive for the UDP listeners.
+
+A listener used to wake per datagram (``recvfrom`` with a 1 s timeout) and
+allocate a fresh ``bytes`` object each time.  ``DatagramReceiver`` instead
+waits once for the socket to become readable, then drains everything that
+is queued with non-blocking ``recvfrom_into`` calls into slots of one
+preallocated buffer and hands the whole batch back.  The stdlib has no
+``recvmmsg`` binding, so this is the closest portable equivalent: one
+wakeup and no payload allocations per batch.
+"""
+
+import selectors
+import socket
+
+
+class DatagramReceiver:
+    """Drains a UDP socket in batches of up to *max_batch* datagrams.
+
+    Each datagram is received into its own *slot_size* slot (longer
+    datagrams are truncated, as with ``recvfrom(slot_size)``).  The
+    returned ``memoryview`` slices are only valid until the next
+    ``receive`` call.  The socket's receive buffer is raised to *rcvbuf*
+    bytes (the kernel may cap it) so bursts queue up instead of dropping
+    while a batch is being processed.
+    """
+
+    def __init__(self, sock, slot_size=4096, max_batch=64, rcvbuf=1 << 20):
+        sock.setblocking(False)
+        try:
+            if sock.getsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF) < rcvbuf:
+                sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, rcvbuf)
+        except OSError:
+            pass
+        self._sock = sock
+        buffer = memoryview(bytearray(slot_size * max_batch))
+        self._slots = [
+            buffer[offset:offset + slot_size]
+            for offset in range(0, slot_size * max_batch, slot_size)
+        ]
+        self._selector = selectors.DefaultSelector()
+        self._selector.register(sock, selectors.EVENT_READ)
+        self.batches = 0
+        self.datagrams = 0
+
+    def receive(self, timeout):
+        """Wait up to *timeout* seconds, then return ``[(view, addr), ...]``.
+
+        Returns an empty list on timeout.  Socket errors other than "would
+        block" propagate to the caller.
+        """
+        if not self._selector.select(timeout):
+            return []
+        recv_into = self._sock.recvfrom_into
+        batch = []
+        for slot in self._slots:
+            try:
+                nbytes, addr = recv_into(slot)
+            except (BlockingIOError, InterruptedError):
+                break
+            batch.append((slot[:nbytes], addr))
+        if batch:
+            self.batches += 1
+            self.datagrams += len(batch)
+        return batch
+
+    def close(self):
+        self._selector.close()
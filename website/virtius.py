@@ -5,6 +5,10 @@ import time
 import urllib.parse
 import urllib.request
 
+from .change_feed import store_changes
+from .json_cache import JsonCache
+from .snapshot import Snapshot, freeze
+
 
 _SUPPORTED_SPORTS = {"Gymnastics"}
 _CONFIG_FILE = "virtius_sources.json"
@@ -14,6 +18,8 @@ _LEADER_LIMIT = 6
 
 virtius_config = {}
 virtius_data = {}
+virtius_versions = {}  # sport -> counter bumped whenever virtius_data[sport] is replaced
+_json_cache = JsonCache()
 virtius_lock = threading.Lock()
 virtius_threads = {}
 virtius_stop_events = {}
@@ -125,7 +131,19 @@ def _save_config():
 
 def get_data(sport):
     with virtius_lock:
-        return dict(virtius_data.get(sport, {}))
+        return freeze(virtius_data.get(sport))
+
+
+def get_data_version(sport):
+    with virtius_lock:
+        return virtius_versions.get(sport, 0)
+
+
+def get_data_json(sport):
+    with virtius_lock:
+        version = virtius_versions.get(sport, 0)
+        data = virtius_data.get(sport, {})
+    return _json_cache.get(sport, version, data)
 
 
 def get_config(sport):
@@ -583,7 +601,10 @@ def virtius_watcher(sport, session_key, poll_interval, stop_event):
                     "fetched_at": time.time(),
                 }
                 with virtius_lock:
-                    virtius_data[sport] = parsed
+                    version = virtius_versions.get(sport, 0) + 1
+                    virtius_data[sport] = Snapshot(parsed, version)
+                    virtius_versions[sport] = version
+                store_changes.publish("virtius", sport)
 
                 # Check if the meet is over
                 meet = raw.get("meet", {}) if isinstance(raw, dict) else {}
@@ -605,7 +626,10 @@ def virtius_watcher(sport, session_key, poll_interval, stop_event):
                 meta["error"] = str(exc)
                 meta["error_at"] = time.time()
                 current["_meta"] = meta
-                virtius_data[sport] = current
+                version = virtius_versions.get(sport, 0) + 1
+                virtius_data[sport] = Snapshot(current, version)
+                virtius_versions[sport] = version
+            store_changes.publish("virtius", sport)
             # Don't count errors toward completion
             complete_count = 0
 